@@ -0,0 +1,154 @@
+"""
+S2 JSON Decoding Micro-benchmark
+
+Times decoding of citation pages (the largest S2 responses) with every
+installed decoder from paper2saas.tools.s2_json, alone and followed by
+normalization into tool-output dicts. Pages come from the synthetic graph by
+default, or from recorded fixtures with --fixtures.
+
+    python -m benchmarks.bench_json --page-size 1000 --pages 20
+    python -m benchmarks.bench_json --fixtures fixtures/s2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+from paper2saas.tools import S2Config
+from paper2saas.tools.paper_record import PaperRecord
+from paper2saas.tools.s2_json import Decoder, available_decoders
+from paper2saas.tools.s2_synthetic import SyntheticS2Backend
+
+logger = logging.getLogger(__name__)
+
+
+def synthetic_pages(num_papers: int, pages: int, page_size: int, seed: int = 0) -> list[bytes]:
+    """Citation pages of page_size edges, as the synthetic backend serializes them."""
+    backend = SyntheticS2Backend(num_papers=num_papers, seed=seed)
+    query = [("fields", S2Config().citation_fields), ("limit", str(page_size))]
+    ranked = sorted(backend.papers, key=lambda p: -backend.papers[p]["citationCount"])
+
+    async def collect() -> list[dict]:
+        edges: list[dict] = []
+        for paper_id in ranked:
+            if len(edges) >= pages * page_size:
+                break
+            _, _, content = await backend.handle(
+                "GET", f"/graph/v1/paper/{paper_id}/citations", query, b""
+            )
+            edges.extend(json.loads(content)["data"])
+        return edges
+
+    edges = asyncio.run(collect())
+    return [
+        json.dumps({"offset": 0, "data": edges[i : i + page_size]}).encode()
+        for i in range(0, len(edges) - page_size + 1, page_size)
+    ]
+
+
+def fixture_pages(fixtures_dir: str) -> list[bytes]:
+    """Recorded citation/reference pages (fixtures whose body has a "data" edge list)."""
+    pages = []
+    for name in sorted(os.listdir(fixtures_dir)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(fixtures_dir, name)) as f:
+            body = json.load(f)["response"]["body"]
+        if isinstance(body, dict) and body.get("data") and "offset" in body:
+            pages.append(json.dumps(body).encode())
+    return pages
+
+
+def normalize_page(page: dict) -> list[dict]:
+    """Tool-output dicts for every edge of a citation page."""
+    return [
+        PaperRecord(edge.get("citingPaper") or edge.get("citedPaper") or {}, edge).to_dict()
+        for edge in page.get("data") or []
+    ]
+
+
+def time_decoder(decode: Decoder, pages: list[bytes], repeat: int, normalize: bool) -> float:
+    """Best-of-repeat seconds to decode (and optionally normalize) every page."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for content in pages:
+            page = decode(content)
+            if normalize:
+                normalize_page(page)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(pages: list[bytes], repeat: int) -> list[dict]:
+    """Timings for every installed decoder, relative to the standard library."""
+    results = []
+    baseline: dict[bool, float] = {}
+    edges = sum(len(json.loads(p).get("data") or []) for p in pages)
+
+    for name, decode in sorted(available_decoders().items(), key=lambda item: item[0] != "json"):
+        for normalize in (False, True):
+            seconds = time_decoder(decode, pages, repeat, normalize)
+            baseline.setdefault(normalize, seconds)
+            results.append(
+                {
+                    "decoder": name,
+                    "normalize": normalize,
+                    "pages": len(pages),
+                    "edges": edges,
+                    "ms_per_page": round(seconds * 1000 / max(len(pages), 1), 3),
+                    "speedup": round(baseline[normalize] / seconds, 2) if seconds else 0.0,
+                }
+            )
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark S2 response JSON decoding")
+    parser.add_argument("--fixtures", help="Use recorded citation pages instead of synthetic ones")
+    parser.add_argument("--papers", type=int, default=5000, help="Synthetic graph size")
+    parser.add_argument("--pages", type=int, default=20, help="Synthetic pages to decode")
+    parser.add_argument("--page-size", type=int, default=1000, help="Edges per synthetic page")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Optional JSON results path")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_args(argv)
+    if args.fixtures:
+        pages = fixture_pages(args.fixtures)
+    else:
+        pages = synthetic_pages(args.papers, args.pages, args.page_size, args.seed)
+    if not pages:
+        logger.error("No citation pages to decode")
+        return 1
+
+    results = run(pages, args.repeat)
+    for r in results:
+        logger.info(
+            "%-8s %-16s %8.3f ms/page  x%.2f",
+            r["decoder"],
+            "decode+normalize" if r["normalize"] else "decode",
+            r["ms_per_page"],
+            r["speedup"],
+        )
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"results": results}, f, indent=2)
+        logger.info("Wrote %s", args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""
+Semantic Scholar Toolkit Benchmarks
+
+Runs SemanticScholarTools against an offline S2 backend (the synthetic graph
+by default, or recorded fixtures with --fixtures) and measures, for each
+scenario and concurrency level:
+
+- requests issued (client calls and backend hits)
+- cache hit rate
+- time spent waiting on the rate limiter
+- wall time and p50 / p95 / p99 operation latency
+
+Results are written as JSON. Pass --baseline to compare against an earlier
+run; the exit code is 1 when any metric regresses past --tolerance.
+
+    python -m benchmarks.bench_s2 --concurrency 1 4 16 --output benchmarks/results/latest.json
+    python -m benchmarks.bench_s2 --baseline benchmarks/results/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+from paper2saas.tools import S2AsyncClient, S2Config, SemanticScholarTools
+from paper2saas.tools.s2_replay import ReplayBackend, ReplayTransport
+from paper2saas.tools.s2_synthetic import SyntheticS2Backend
+
+logger = logging.getLogger(__name__)
+
+Operation = Callable[[SemanticScholarTools, int], Awaitable[object]]
+
+# Metrics compared against a baseline, and whether higher is better
+REGRESSION_METRICS = {
+    "backend_requests": False,
+    "latency_p95_ms": False,
+    "wall_time_s": False,
+    "cache_hit_rate": True,
+}
+
+
+def scenarios(seeds: list[str]) -> dict[str, Operation]:
+    """Benchmark operations, each called with the toolkit and an operation index."""
+    batch = seeds[: min(len(seeds), 50)]
+
+    return {
+        "build_research_lineage": lambda tools, i: tools.build_research_lineage(
+            seeds[i % len(seeds)]
+        ),
+        "find_cross_domain_papers": lambda tools, i: tools.find_cross_domain_papers(
+            seeds[i % len(seeds)], seeds[(i + 1) % len(seeds)]
+        ),
+        "batch_get_papers": lambda tools, i: tools.batch_get_papers(
+            batch[i % 5 :] + batch[: i % 5]
+        ),
+        "analyze_author_network": lambda tools, i: tools.analyze_author_network(
+            seeds[i % len(seeds)]
+        ),
+        "search_papers": lambda tools, i: tools.search_papers(
+            ["transformer", "retrieval", "diffusion model", "protein folding"][i % 4], limit=10
+        ),
+    }
+
+
+def percentile(values: list[float], pct: int) -> float:
+    """Inclusive percentile (pct in 1..99) of a list of samples."""
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def make_config(args: argparse.Namespace) -> S2Config:
+    """Client configuration for a benchmark run (isolated, in-memory, no key)."""
+    return S2Config(
+        api_key=None,
+        base_url="http://s2-bench/graph/v1",
+        recommendations_url="http://s2-bench/recommendations/v1",
+        requests_per_second=args.client_rate,
+        search_rate_limit=args.client_rate,
+        max_requests_per_second=args.client_rate,
+        max_search_rate_limit=args.client_rate,
+        cache_backend="memory",
+        rate_limit_backend="local",
+        share_client=False,
+    )
+
+
+async def run_scenario(
+    name: str,
+    operation: Operation,
+    backend,
+    args: argparse.Namespace,
+    concurrency: int,
+) -> dict:
+    """Run one scenario at one concurrency level on a fresh (cold) client."""
+    config = make_config(args)
+    client = S2AsyncClient(config, transport=ReplayTransport(backend))
+    tools = SemanticScholarTools(config=config, client=client)
+    backend_before = backend.stats["requests"]
+
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await operation(tools, index)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed(i) for i in range(args.operations)))
+    wall_time = time.perf_counter() - started
+
+    stats = client.get_stats()
+    await client.close()
+
+    lookups = stats["requests"]
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "operations": args.operations,
+        "wall_time_s": round(wall_time, 4),
+        "throughput_ops_s": round(args.operations / wall_time, 2) if wall_time else 0.0,
+        "latency_p50_ms": round(percentile(latencies, 50), 2),
+        "latency_p95_ms": round(percentile(latencies, 95), 2),
+        "latency_p99_ms": round(percentile(latencies, 99), 2),
+        "client_requests": lookups,
+        "network_requests": stats["network_requests"],
+        "backend_requests": backend.stats["requests"] - backend_before,
+        "cache_hit_rate": round(stats["cache_hits"] / lookups, 3) if lookups else 0.0,
+        "coalesced": stats["coalesced"],
+        "loader_cache_hits": tools.paper_loader.stats["cache_hits"],
+        "limiter_wait_s": round(
+            stats["rate_limiter"]["wait_seconds"] + stats["search_limiter"]["wait_seconds"], 4
+        ),
+    }
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    """Describe every metric that regressed by more than tolerance (a fraction)."""
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline.get("results", [])}
+    regressions = []
+
+    for result in results:
+        before = previous.get((result["scenario"], result["concurrency"]))
+        if before is None:
+            continue
+        for metric, higher_is_better in REGRESSION_METRICS.items():
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(
+                    f"{result['scenario']} @ {result['concurrency']}: "
+                    f"{metric} {old} -> {new} ({change:+.1%})"
+                )
+    return regressions
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Run every selected scenario at every concurrency level."""
+    if args.fixtures:
+        backend = ReplayBackend(args.fixtures, latency=args.latency, jitter=args.jitter)
+        seeds = args.seeds or []
+        if not seeds:
+            raise SystemExit("--seeds is required with --fixtures")
+    else:
+        backend = SyntheticS2Backend(
+            num_papers=args.papers,
+            latency=args.latency,
+            jitter=args.jitter,
+            rate_limit=args.server_rate,
+            seed=args.seed,
+        )
+        # Well-cited papers make lineage and bridge lookups non-trivial
+        ranked = sorted(backend.papers.values(), key=lambda p: -p["citationCount"])
+        seeds = args.seeds or [p["paperId"] for p in ranked[:50]]
+
+    selected = scenarios(seeds)
+    if args.scenarios:
+        selected = {name: selected[name] for name in args.scenarios}
+
+    results = []
+    for name, operation in selected.items():
+        for concurrency in args.concurrency:
+            result = await run_scenario(name, operation, backend, args, concurrency)
+            logger.info(
+                "%s @ %d: p95 %.1f ms, %d backend requests, hit rate %.2f",
+                name,
+                concurrency,
+                result["latency_p95_ms"],
+                result["backend_requests"],
+                result["cache_hit_rate"],
+            )
+            results.append(result)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "backend": "fixtures" if args.fixtures else "synthetic",
+            "papers": None if args.fixtures else args.papers,
+            "latency_s": args.latency,
+            "jitter_s": args.jitter,
+            "server_rate": args.server_rate,
+            "client_rate": args.client_rate,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the Semantic Scholar toolkit offline")
+    parser.add_argument("--scenarios", nargs="*", help="Subset of scenarios to run")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 16])
+    parser.add_argument("--operations", type=int, default=40, help="Operations per run")
+    parser.add_argument("--papers", type=int, default=2000, help="Synthetic graph size")
+    parser.add_argument(
+        "--fixtures", help="Replay recorded fixtures instead of the synthetic graph"
+    )
+    parser.add_argument("--seeds", nargs="*", help="Seed paper IDs (required with --fixtures)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Backend delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Extra random backend delay")
+    parser.add_argument("--server-rate", type=float, default=None, help="Backend 429 threshold")
+    parser.add_argument("--client-rate", type=float, default=200.0, help="Client limiter rate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON results path")
+    parser.add_argument("--baseline", default=None, help="Earlier results JSON to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression fraction")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    for noisy in ("httpx", "paper2saas"):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"s2_bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info("Wrote %s", output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report["results"], json.load(f), args.tolerance)
+        for line in regressions:
+            logger.warning("REGRESSION %s", line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
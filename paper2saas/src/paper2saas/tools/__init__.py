@@ -4,11 +4,34 @@ Modules:
 - semantic_scholar: Paper discovery and citation analysis
 - s2_config: Semantic Scholar API configuration
 - http_client: Reusable async HTTP client with rate limiting
+- rate_limit: Fixed, adaptive and cross-process shared rate limiters
+- s2_cache: Response cache backends (memory, persistent SQLite)
+- client_registry: Process-wide shared S2 clients with reference counting
+- background_loop: Persistent event loop thread for sync wrappers and client I/O
+- paper_store: Per-paperId entity cache merged from every S2 response
+- paper_record: Compact slotted paper records with lazy tool-output dicts
+- s2_json: Optional fast (orjson / msgspec) decoding of S2 responses
+- batch_loader: Auto-batching of single-paper lookups into paper/batch requests
+- bulk_search: Resumable checkpoints for token-paginated bulk search sweeps
+- scheduler: Priority and per-session fair scheduling of rate-limit tokens
+- circuit_breaker: Fail-fast circuit breaker for S2 outages
+- s2_replay: Recording transport and replay backend/server for offline benchmarks
 """
 
 from .semantic_scholar import SemanticScholarTools, SemanticScholarToolsSync
 from .s2_config import S2Config
-from .http_client import S2AsyncClient, RateLimiter
+from .http_client import S2AsyncClient
+from .rate_limit import RateLimiter, AdaptiveRateLimiter, SharedRateLimiter
+from .batch_loader import PaperBatchLoader
+from .bulk_search import BulkSearchCheckpoint
+from .scheduler import PriorityScheduler, RequestPriority, s2_priority
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .s2_replay import RecordingTransport, ReplayBackend, ReplayTransport, create_replay_app
+from .paper_store import PaperEntityCache
+from .paper_record import PaperRecord
+from .background_loop import BackgroundLoop, get_background_loop
+from .client_registry import S2ClientRegistry, get_client_registry
+from .s2_cache import CacheBackend, MemoryCache, SQLiteCache, create_cache_backend
 
 __all__ = [
     # Core toolkit
@@ -19,4 +42,28 @@ __all__ = [
     # HTTP infrastructure
     "S2AsyncClient",
     "RateLimiter",
+    "AdaptiveRateLimiter",
+    "SharedRateLimiter",
+    "PaperBatchLoader",
+    "BulkSearchCheckpoint",
+    "PriorityScheduler",
+    "RequestPriority",
+    "s2_priority",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "RecordingTransport",
+    "ReplayBackend",
+    "ReplayTransport",
+    "create_replay_app",
+    "PaperEntityCache",
+    "PaperRecord",
+    "BackgroundLoop",
+    "get_background_loop",
+    "S2ClientRegistry",
+    "get_client_registry",
+    # Caching
+    "CacheBackend",
+    "MemoryCache",
+    "SQLiteCache",
+    "create_cache_backend",
 ]
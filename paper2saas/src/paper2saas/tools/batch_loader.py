@@ -0,0 +1,130 @@
+"""
+Auto-Batching Paper Loader
+
+DataLoader-style batching for single-paper lookups: `load()` calls made
+within a short window (or until the batch size cap is reached) are sent as
+one `paper/batch` POST, and each result is handed back to its caller and
+primed into the per-paper GET cache. Papers already known to the client's
+entity cache are served without any request.
+
+Futures and the flush timer belong to an event loop, so loads are queued
+per running loop: the sync wrappers' background loop and a caller's own
+loop each batch their own requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import weakref
+
+from .http_client import S2AsyncClient
+from .s2_config import S2Config
+
+logger = logging.getLogger(__name__)
+
+
+class PaperBatchLoader:
+    """Coalesces scattered paper lookups into paper/batch requests"""
+
+    def __init__(self, client: S2AsyncClient, config: S2Config, fields: str | None = None):
+        """
+        Initialize loader.
+
+        Args:
+            client: HTTP client used for batch requests and cache priming
+            config: S2 configuration (batch_size, batch_window)
+            fields: Paper fields to request (defaults to config.paper_fields)
+        """
+        self.client = client
+        self.config = config
+        self.fields = fields or config.paper_fields
+
+        # Per event loop: queued futures by paper id, and the pending flush timer
+        self._pending: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, list[asyncio.Future]]
+        ] = weakref.WeakKeyDictionary()
+        self._flush_handles: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.TimerHandle
+        ] = weakref.WeakKeyDictionary()
+        self.stats: dict[str, int] = {"loads": 0, "cache_hits": 0, "batches": 0}
+
+    async def load(self, paper_id: str) -> dict | None:
+        """
+        Load one paper, batched with other concurrent loads.
+
+        Returns:
+            Raw S2 paper dict, or None if S2 does not know the ID
+        """
+        self.stats["loads"] += 1
+
+        cached = await self.client.peek(f"paper/{paper_id}", fields=self.fields)
+        if cached is None:
+            # Seen in any other response (search, citations, batch, ...) with enough fields
+            cached = self.client.papers.lookup(paper_id, self.fields)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            self.client.record_cache_hit()
+            return cached
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(loop, {})
+        pending.setdefault(paper_id, []).append(future)
+
+        if len(pending) >= self.config.batch_size:
+            self._flush(loop)
+        elif loop not in self._flush_handles:
+            self._flush_handles[loop] = loop.call_later(self.config.batch_window, self._flush, loop)
+
+        return await future
+
+    async def load_many(self, paper_ids: list[str]) -> list[dict | None]:
+        """Load several papers; results are aligned with paper_ids."""
+        return await asyncio.gather(*(self.load(paper_id) for paper_id in paper_ids))
+
+    def _flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Dispatch everything queued on loop so far as one batch."""
+        handle = self._flush_handles.pop(loop, None)
+        if handle is not None:
+            handle.cancel()
+
+        batch = self._pending.pop(loop, None)
+        if not batch:
+            return
+        loop.create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch: dict[str, list[asyncio.Future]]) -> None:
+        """Send one paper/batch request and resolve the waiting callers."""
+        paper_ids = list(batch)
+        self.stats["batches"] += 1
+        logger.debug("Dispatching paper batch of %d ids", len(paper_ids))
+
+        try:
+            result = await self.client.post(
+                "paper/batch", data={"ids": paper_ids}, fields=self.fields
+            )
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        papers = result if isinstance(result, list) else []
+
+        # S2 returns results aligned with the requested ids (null for unknown ids)
+        found = []
+        for index, paper_id in enumerate(paper_ids):
+            paper = papers[index] if index < len(papers) else None
+            if paper:
+                found.append((paper_id, paper))
+                self.client.papers.add_alias(paper_id, paper.get("paperId", paper_id))
+
+            for future in batch[paper_id]:
+                if not future.done():
+                    future.set_result(paper)
+
+        # Callers are already resolved; cache writes may go to disk
+        for paper_id, paper in found:
+            await self.client.prime(f"paper/{paper_id}", paper, fields=self.fields)
@@ -0,0 +1,89 @@
+"""
+Bulk Search Checkpoints
+
+`paper/search/bulk` pages through every match of a query with a
+continuation token (up to 1000 papers per page) instead of the relevance
+endpoint's 100-result cap. A BulkSearchCheckpoint records how far a sweep
+got, so an interrupted sweep resumes where it stopped:
+
+- token: continuation token of the page being consumed (None: first page)
+- skip: papers of that page already yielded
+- yielded: papers yielded by the sweep so far
+- state: the consumer's own progress (e.g. a running top-k), saved with
+  the position so it resumes in step with it
+
+The checkpoint is written after every page and when the consumer stops
+early. A crash mid-page resumes at the start of that page, so papers are
+delivered at least once. A completed sweep is started over.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BulkSearchCheckpoint:
+    """Resumable position of one bulk search sweep"""
+
+    path: str | None
+    # Query and filters the checkpoint belongs to
+    params: dict = field(default_factory=dict)
+    token: str | None = None
+    skip: int = 0
+    yielded: int = 0
+    done: bool = False
+    state: dict = field(default_factory=dict)
+    updated_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def load(cls, path: str | None, params: dict) -> BulkSearchCheckpoint:
+        """
+        Read the checkpoint at path, or start a new sweep.
+
+        A checkpoint written for a different query or filters, or for a
+        sweep that already finished, is ignored.
+        """
+        if path is None or not os.path.exists(path):
+            return cls(path=path, params=params)
+
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("params") != params:
+            logger.warning("Bulk search checkpoint %s is for another query; restarting", path)
+            return cls(path=path, params=params)
+        if data.get("done"):
+            logger.warning("Bulk search checkpoint %s is complete; restarting", path)
+            return cls(path=path, params=params)
+
+        data.pop("path", None)
+        return cls(path=path, **data)
+
+    def save(
+        self,
+        token: str | None,
+        skip: int,
+        yielded: int,
+        done: bool = False,
+        state: dict | None = None,
+    ) -> None:
+        """Record the sweep position and consumer state (atomically, when a path is set)."""
+        self.token, self.skip, self.yielded, self.done = token, skip, yielded, done
+        if state is not None:
+            self.state = state
+        self.updated_at = time.time()
+        if self.path is None:
+            return
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {k: v for k, v in asdict(self).items() if k != "path"}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
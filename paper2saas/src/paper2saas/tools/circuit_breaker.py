@@ -0,0 +1,155 @@
+"""
+Circuit Breaker for the Semantic Scholar Client
+
+Stops sending requests while S2 is failing, instead of letting every tool
+call wait out timeouts and retries:
+
+- closed: requests flow; outcomes are tracked over a rolling time window
+- open: the error rate crossed the threshold; requests fail fast (or are
+  served from stale cache entries) until the cooldown ends
+- half_open: one probe request at a time is let through; success closes
+  the circuit, failure opens it again
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+
+from ..exceptions import ToolNotAvailableError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ToolNotAvailableError):
+    """Raised when a request is rejected because the S2 circuit is open."""
+
+    def __init__(self, retry_after: float) -> None:
+        self.retry_after = retry_after
+        super().__init__(
+            f"Semantic Scholar is unavailable (circuit open, retry in {retry_after:.0f}s)"
+        )
+
+
+class CircuitBreaker:
+    """Rolling error-rate circuit breaker"""
+
+    def __init__(
+        self,
+        error_threshold: float = 0.5,
+        min_requests: int = 5,
+        window: float = 60.0,
+        open_duration: float = 30.0,
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            error_threshold: Failure fraction within the window that opens the circuit
+            min_requests: Outcomes needed in the window before the rate is trusted
+            window: Rolling window length in seconds
+            open_duration: Seconds the circuit stays open before a half-open probe
+        """
+        self.error_threshold = error_threshold
+        self.min_requests = min_requests
+        self.window = window
+        self.open_duration = open_duration
+
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_started: float | None = None
+        self.stats: dict[str, int] = {"opened": 0, "rejected": 0, "probes": 0}
+
+    @property
+    def state(self) -> str:
+        """Current state; an open circuit turns half-open once its cooldown ends."""
+        if self._state == OPEN and time.time() >= self._opened_at + self.open_duration:
+            self._state = HALF_OPEN
+            self._probe_started = None
+            logger.info("S2 circuit half-open; probing")
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """Whether requests are currently being rejected outright."""
+        return self.state == OPEN
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the next half-open probe is allowed."""
+        if self.state != OPEN:
+            return 0.0
+        return max(self._opened_at + self.open_duration - time.time(), 0.0)
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (claims the probe slot when half-open)."""
+        state = self.state
+        if state == CLOSED:
+            return True
+
+        now = time.time()
+        # A probe that never reported back (e.g. cancelled) frees its slot after a cooldown
+        if state == HALF_OPEN and (
+            self._probe_started is None or now - self._probe_started >= self.open_duration
+        ):
+            self._probe_started = now
+            self.stats["probes"] += 1
+            return True
+
+        self.stats["rejected"] += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record a request that reached a healthy server."""
+        if self._state == HALF_OPEN:
+            logger.info("S2 circuit closed after successful probe")
+            self._state = CLOSED
+            self._probe_started = None
+            self._outcomes.clear()
+        self._record(True)
+
+    def record_failure(self) -> None:
+        """Record a server error or network failure."""
+        if self._state == HALF_OPEN:
+            self._open()
+            return
+        self._record(False)
+
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        if (
+            self._state == CLOSED
+            and len(self._outcomes) >= self.min_requests
+            and failures / len(self._outcomes) >= self.error_threshold
+        ):
+            self._open()
+
+    def _record(self, ok: bool) -> None:
+        now = time.time()
+        self._outcomes.append((now, ok))
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = time.time()
+        self._probe_started = None
+        self._outcomes.clear()
+        self.stats["opened"] += 1
+        logger.warning("S2 circuit opened; failing fast for %.0fs", self.open_duration)
+
+    def snapshot(self) -> dict:
+        """State and counters for metrics."""
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return {
+            "state": self.state,
+            "error_rate": round(failures / len(self._outcomes), 3) if self._outcomes else 0.0,
+            "window_requests": len(self._outcomes),
+            "retry_after": round(self.retry_after, 1),
+            **self.stats,
+        }
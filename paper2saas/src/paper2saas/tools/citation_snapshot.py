@@ -0,0 +1,154 @@
+"""
+Citation Snapshots
+
+A CitationSnapshot holds every citation edge fetched for a paper in one pass.
+Lineage views (derivatives, applications, frontier, influential citations)
+are computed from the snapshot in memory instead of each issuing its own
+differently-sized `paper/{id}/citations` request.
+
+Snapshots are kept per paper in a CitationSnapshotStore (in memory, or in
+SQLite across runs). S2 lists citations newest first, so a stale snapshot is
+refreshed by paging only until its newest known citing paper appears and
+merging the new edges in front. If a different known paper shows up first the
+ordering cannot be trusted and the snapshot is fetched again in full.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .s2_cache import CacheBackend, MemoryCache, SQLiteCache
+
+if TYPE_CHECKING:
+    from .s2_config import S2Config
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CitationSnapshot:
+    """All citation edges known for one paper at a point in time"""
+
+    paper_id: str
+    # Raw S2 citation edges: {"citingPaper": {...}, "isInfluential": ..., "contexts": [...], ...}
+    edges: list[dict] = field(default_factory=list)
+    fetched_at: float = field(default_factory=time.time)
+    # False when pagination stopped at S2Config.citation_snapshot_limit
+    complete: bool = True
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+    def citing_papers(self) -> list[tuple[dict, dict]]:
+        """(citingPaper, edge) pairs for edges that carry a paper ID."""
+        pairs = []
+        for edge in self.edges:
+            citing_paper = edge.get("citingPaper") or {}
+            if citing_paper.get("paperId"):
+                pairs.append((citing_paper, edge))
+        return pairs
+
+    def citing_ids(self) -> set[str]:
+        """IDs of every citing paper in the snapshot."""
+        return {paper["paperId"] for paper, _ in self.citing_papers()}
+
+    def newest_id(self) -> str | None:
+        """ID of the first (newest) citing paper, or None for an empty snapshot."""
+        pairs = self.citing_papers()
+        return pairs[0][0]["paperId"] if pairs else None
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was fetched or last refreshed."""
+        return time.time() - self.fetched_at
+
+    def merged(self, new_edges: list[dict], limit: int | None = None) -> CitationSnapshot:
+        """
+        A refreshed snapshot: new_edges (newest first) ahead of the known ones.
+
+        Args:
+            new_edges: Edges fetched since this snapshot, newest first
+            limit: Max edges kept; the oldest are dropped beyond it
+        """
+        edges, seen = [], set()
+        for edge in new_edges + self.edges:
+            paper_id = (edge.get("citingPaper") or {}).get("paperId")
+            if paper_id in seen:
+                continue
+            seen.add(paper_id)
+            edges.append(edge)
+
+        complete = self.complete
+        if limit is not None and len(edges) > limit:
+            edges, complete = edges[:limit], False
+        return CitationSnapshot(paper_id=self.paper_id, edges=edges, complete=complete)
+
+    def to_dict(self) -> dict:
+        return {
+            "paper_id": self.paper_id,
+            "edges": self.edges,
+            "fetched_at": self.fetched_at,
+            "complete": self.complete,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CitationSnapshot:
+        return cls(**data)
+
+
+class CitationSnapshotStore:
+    """Per-paper citation snapshots, kept across runs with the SQLite backend"""
+
+    def __init__(self, backend: CacheBackend):
+        """
+        Initialize snapshot store.
+
+        Args:
+            backend: Cache backend holding serialized snapshots
+        """
+        self.backend = backend
+        self.stats: dict[str, int] = {
+            "fresh": 0,
+            "refreshed": 0,
+            "fetched": 0,
+            "new_edges": 0,
+            "pages": 0,
+        }
+
+    async def _call(self, func: Callable[..., Any], *args) -> Any:
+        """Run a backend call, in a worker thread when the backend does disk I/O."""
+        if self.backend.blocking:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    async def get(self, paper_id: str) -> CitationSnapshot | None:
+        """Stored snapshot for a paper, or None."""
+        data = await self._call(self.backend.get, f"snapshot:{paper_id}")
+        return CitationSnapshot.from_dict(data) if data is not None else None
+
+    async def put(self, snapshot: CitationSnapshot) -> None:
+        """Store (or replace) a paper's snapshot."""
+        await self._call(self.backend.set, f"snapshot:{snapshot.paper_id}", snapshot.to_dict())
+
+
+def create_snapshot_store(config: S2Config) -> CitationSnapshotStore:
+    """Build the snapshot store selected by config.snapshot_backend."""
+    if config.snapshot_backend == "memory":
+        backend: CacheBackend = MemoryCache(
+            maxsize=config.snapshot_maxsize, ttl=config.snapshot_max_age
+        )
+    elif config.snapshot_backend == "sqlite":
+        backend = SQLiteCache(
+            path=config.snapshot_path,
+            ttl=config.snapshot_max_age,
+            max_bytes=config.cache_max_bytes,
+        )
+    else:
+        raise ValueError(f"Unknown S2 snapshot backend: {config.snapshot_backend!r}")
+    return CitationSnapshotStore(backend)
@@ -0,0 +1,135 @@
+"""
+Shared S2 Client Registry
+
+Hands out one S2AsyncClient per (base_url, api_key) for the whole process,
+so every agent, toolkit and workflow run reuses the same connection pool,
+response cache and rate-limit budget.
+
+Clients are reference counted. When the last user releases a client its
+HTTP connections are closed, but the client (with its warm cache and
+limiter state) stays registered for the next user.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .http_client import S2AsyncClient
+from .s2_config import S2Config
+
+logger = logging.getLogger(__name__)
+
+ClientHook = Callable[[S2AsyncClient], None]
+
+
+@dataclass
+class _RegistryEntry:
+    client: S2AsyncClient
+    refs: int = 0
+
+
+class S2ClientRegistry:
+    """Process-wide pool of shared S2AsyncClients"""
+
+    EVENTS = ("create", "acquire", "idle", "close")
+
+    def __init__(self):
+        self._entries: dict[tuple[str, str | None], _RegistryEntry] = {}
+        self._lock = threading.Lock()
+        self._hooks: dict[str, list[ClientHook]] = {event: [] for event in self.EVENTS}
+
+    @staticmethod
+    def _key(config: S2Config) -> tuple[str, str | None]:
+        return (config.base_url, config.api_key)
+
+    def add_hook(self, event: str, hook: ClientHook) -> None:
+        """
+        Register a lifecycle callback.
+
+        Args:
+            event: "create" (new client), "acquire" (reference taken),
+                   "idle" (last reference released) or "close" (client discarded)
+            hook: Callable receiving the client
+        """
+        if event not in self._hooks:
+            raise ValueError(f"Unknown registry event: {event!r}")
+        self._hooks[event].append(hook)
+
+    def _fire(self, event: str, client: S2AsyncClient) -> None:
+        for hook in self._hooks[event]:
+            try:
+                hook(client)
+            except Exception as e:
+                logger.warning("S2 registry %s hook failed: %s", event, e)
+
+    def acquire(self, config: S2Config) -> S2AsyncClient:
+        """
+        Get the shared client for config's (base_url, api_key), creating it if needed.
+
+        The first caller's config decides cache, limiter and timeout settings
+        for the shared client.
+        """
+        key = self._key(config)
+        with self._lock:
+            entry = self._entries.get(key)
+            created = entry is None
+            if created:
+                entry = _RegistryEntry(client=S2AsyncClient(config))
+                self._entries[key] = entry
+            entry.refs += 1
+
+        if created:
+            logger.debug("Created shared S2 client for %s", config.base_url)
+            self._fire("create", entry.client)
+        self._fire("acquire", entry.client)
+        return entry.client
+
+    async def release(self, client: S2AsyncClient) -> None:
+        """Drop one reference; close the connection pool when none remain."""
+        # The pool is detached under the lock, so a concurrent acquire()
+        # gets a fresh pool instead of the one being closed
+        with self._lock:
+            entry = self._entries.get(self._key(client.config))
+            if entry is None or entry.client is not client:
+                return
+            entry.refs = max(entry.refs - 1, 0)
+            idle = entry.refs == 0
+            connections = client.detach_connections() if idle else None
+
+        if idle:
+            await client.close_connections(connections)
+            self._fire("idle", client)
+
+    async def shutdown(self) -> None:
+        """Close and forget every registered client."""
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), {}
+
+        for entry in entries:
+            await entry.client.close()
+            self._fire("close", entry.client)
+
+    def clear(self) -> None:
+        """Forget every registered client without closing connections."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> list[dict]:
+        """Reference counts and request statistics for each shared client."""
+        with self._lock:
+            entries = list(self._entries.items())
+        return [
+            {"base_url": base_url, "refs": entry.refs, **entry.client.get_stats()}
+            for (base_url, _), entry in entries
+        ]
+
+
+_registry = S2ClientRegistry()
+
+
+def get_client_registry() -> S2ClientRegistry:
+    """Get the process-wide S2 client registry."""
+    return _registry
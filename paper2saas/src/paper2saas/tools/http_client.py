@@ -2,74 +2,145 @@
 Async HTTP Client with Rate Limiting and Caching
 
 Reusable infrastructure for API integrations with:
-- Token bucket rate limiting
-- LRU caching with TTL
-- Exponential backoff on failures
-- Connection pooling
+- Token bucket rate limiting (adaptive to 429 / Retry-After feedback)
+- Priority scheduling of limiter tokens (interactive > workflow > background)
+- Pluggable response caching with TTL (in-memory or persistent SQLite)
+- Content-addressed caching of idempotent POST bodies (batch, recommendations)
+- Stale-while-revalidate: expired entries are served while refreshed in the background
+- Single-flight coalescing of identical concurrent requests
+- Exponential backoff with jitter on retryable failures (429, 5xx, network)
+- Short-lived negative cache for 400 / 404 responses
+- Circuit breaker that fails fast, or serves stale entries, during S2 outages
+- Connection pooling, pinned to one background event loop
+- Fast C JSON decoding of responses when orjson or msgspec is installed
 """
 
 from __future__ import annotations
 
 import asyncio
 import hashlib
-import time
+import json
 import logging
+from collections.abc import Callable
+from typing import Any
 
 import httpx
 import backoff
-from cachetools import TTLCache
 
 from .s2_config import S2Config
+from .background_loop import get_background_loop
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .rate_limit import AdaptiveRateLimiter, RateLimiter, SharedRateLimiter
+from .s2_cache import CacheBackend, MemoryCache, create_cache_backend
+from .paper_store import PaperEntityCache, parse_fields
+from .citation_snapshot import create_snapshot_store
+from .scheduler import PriorityScheduler, RequestPriority, current_priority
+from .s2_json import get_decoder
 
 
 logger = logging.getLogger(__name__)
 
 
-class RateLimiter:
-    """Token bucket rate limiter for API calls"""
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed request is worth retrying (429, 5xx and network errors)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
 
-    def __init__(self, rate: float = 100.0, per: float = 1.0):
+
+class S2AsyncClient:
+    """Async HTTP client with connection pooling, rate limiting and request coalescing"""
+
+    def __init__(self, config: S2Config, transport: httpx.AsyncBaseTransport | None = None):
         """
-        Initialize rate limiter.
+        Initialize client.
 
         Args:
-            rate: Number of tokens (requests) allowed
-            per: Time period in seconds
+            config: S2 configuration
+            transport: Optional httpx transport (e.g. a recording or replay
+                       transport from s2_replay) used instead of the network
         """
-        self.rate = rate
-        self.per = per
-        self.tokens = rate
-        self.last_update = time.time()
-        self._lock = asyncio.Lock()
-
-    async def acquire(self) -> None:
-        """Wait until a request token is available."""
-        async with self._lock:
-            now = time.time()
-            time_passed = now - self.last_update
-            self.tokens = min(self.rate, self.tokens + time_passed * (self.rate / self.per))
-            self.last_update = now
-
-            if self.tokens < 1:
-                wait_time = (1 - self.tokens) * (self.per / self.rate)
-                await asyncio.sleep(wait_time)
-                self.tokens = 1
-
-            self.tokens -= 1
-
+        self.config = config
+        self._transport = transport
+        self.rate_limiter = self._make_limiter(
+            "default", config.requests_per_second, config.max_requests_per_second
+        )
+        self.search_limiter = self._make_limiter(
+            "search", config.search_rate_limit, config.max_search_rate_limit
+        )
+        # Hand out limiter tokens by traffic class and session
+        self.rate_scheduler = PriorityScheduler(self.rate_limiter)
+        self.search_scheduler = PriorityScheduler(self.search_limiter)
+
+        # Paper metadata cache (backend selected by config.cache_backend)
+        self._cache: CacheBackend = create_cache_backend(config)
+
+        # Per-paperId records harvested from every response
+        self.papers = PaperEntityCache(maxsize=config.entity_cache_maxsize, ttl=config.cache_ttl)
+        # Author profiles from author/batch, keyed by authorId
+        self.authors = MemoryCache(maxsize=config.entity_cache_maxsize, ttl=config.cache_ttl)
+        # Per-paper citation snapshots (backend selected by config.snapshot_backend)
+        self.snapshots = create_snapshot_store(config)
+
+        # Recent 4xx failures, keyed by request identity, re-raised without I/O
+        self._negative = MemoryCache(maxsize=config.cache_maxsize, ttl=config.negative_cache_ttl)
 
-class S2AsyncClient:
-    """Async HTTP client with connection pooling and rate limiting"""
+        self._client: httpx.AsyncClient | None = None
+        # Response body decoder (config.json_decoder)
+        self.json_decoder, self._decode = get_decoder(config.json_decoder)
+
+        self.breaker: CircuitBreaker | None = None
+        if config.circuit_breaker:
+            self.breaker = CircuitBreaker(
+                error_threshold=config.circuit_error_threshold,
+                min_requests=config.circuit_min_requests,
+                window=config.circuit_window,
+                open_duration=config.circuit_open_duration,
+            )
 
-    def __init__(self, config: S2Config):
-        self.config = config
-        self.rate_limiter = RateLimiter(rate=config.requests_per_second)
-        self.search_limiter = RateLimiter(rate=config.search_rate_limit)
+        # Requests currently on the wire, keyed by normalized request identity
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Background stale-while-revalidate refreshes, bounded by stale_refresh_budget
+        self._refreshing: set[asyncio.Future] = set()
+        self.stats: dict[str, int] = {
+            "requests": 0,
+            "cache_hits": 0,
+            "stale_hits": 0,
+            "degraded_hits": 0,
+            "refreshes": 0,
+            "refreshes_skipped": 0,
+            "negative_hits": 0,
+            "coalesced": 0,
+            "network_requests": 0,
+        }
+        # Hit/miss counts for cached POST endpoints
+        self.post_cache_stats: dict[str, dict[str, int]] = {}
+
+    def _make_limiter(self, name: str, rate: float, max_rate: float) -> RateLimiter:
+        """Build a fixed, adaptive or cross-process shared limiter according to config."""
+        tuning = {
+            "min_rate": min(self.config.min_requests_per_second, rate),
+            "max_rate": max_rate if self.config.adaptive_rate_limit else rate,
+            "decrease_factor": self.config.rate_decrease_factor,
+        }
+
+        if self.config.rate_limit_backend == "sqlite":
+            # One bucket per API key, so every process using that key shares its quota
+            key_hash = hashlib.md5((self.config.api_key or "anonymous").encode()).hexdigest()
+            return SharedRateLimiter(
+                path=self.config.rate_limit_path,
+                name=f"{name}:{key_hash[:12]}",
+                rate=rate,
+                **tuning,
+            )
 
-        # Paper metadata cache
-        self._cache: TTLCache = TTLCache(maxsize=config.cache_maxsize, ttl=config.cache_ttl)
+        if self.config.rate_limit_backend != "local":
+            raise ValueError(f"Unknown S2 rate limit backend: {self.config.rate_limit_backend!r}")
 
-        self._client: httpx.AsyncClient | None = None
+        if not self.config.adaptive_rate_limit:
+            return RateLimiter(rate=rate)
+        return AdaptiveRateLimiter(rate=rate, **tuning)
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create the async HTTP client."""
@@ -80,6 +151,7 @@ class S2AsyncClient:
 
             self._client = httpx.AsyncClient(
                 headers=headers,
+                transport=self._transport,
                 timeout=httpx.Timeout(
                     connect=self.config.connect_timeout,
                     read=self.config.read_timeout,
@@ -92,65 +164,463 @@ class S2AsyncClient:
             )
         return self._client
 
+    def detach_connections(self) -> httpx.AsyncClient | None:
+        """
+        Detach the HTTP client without closing it.
+
+        The next request opens a fresh connection pool; the caller closes
+        the returned one with close_connections().
+        """
+        client, self._client = self._client, None
+        return client
+
+    async def close_connections(self, client: httpx.AsyncClient | None) -> None:
+        """Close an HTTP client returned by detach_connections()."""
+        if client is not None:
+            await self._on_io_loop(client.aclose())
+
     async def close(self) -> None:
         """Close the HTTP client."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        await self.close_connections(self.detach_connections())
 
     def _cache_key(self, endpoint: str, **kwargs) -> str:
         """Generate cache key from endpoint and params."""
         key_str = f"{endpoint}:{sorted(kwargs.items())}"
         return hashlib.md5(key_str.encode()).hexdigest()
 
+    def _projection_key(self, url: str, params: dict) -> tuple[str, frozenset[str]]:
+        """
+        Cache key without the `fields` projection, plus the requested field set.
+
+        Responses are cached once per endpoint/params and tagged with the
+        fields they contain, so a request for a subset of those fields is
+        answered from the cached superset.
+        """
+        base = {k: v for k, v in params.items() if k != "fields"}
+        return self._cache_key(url, **base), parse_fields(params.get("fields"))
+
+    def _read_entry(
+        self, cache_key: str, allow_stale: bool = False
+    ) -> tuple[frozenset[str], Any, bool] | None:
+        """Return (fields, data, stale) for a cached response, if any."""
+        if allow_stale:
+            item = self._cache.get_stale(cache_key)
+            if item is None:
+                return None
+            entry, stale = item
+        else:
+            entry, stale = self._cache.get(cache_key), False
+
+        if not isinstance(entry, dict) or "data" not in entry or "fields" not in entry:
+            return None
+        return frozenset(entry["fields"]), entry["data"], stale
+
+    def _write_entry(
+        self, cache_key: str, fields: frozenset[str], data: Any, ttl: float | None = None
+    ) -> None:
+        self._cache.set(cache_key, {"fields": sorted(fields), "data": data}, ttl=ttl)
+
+    async def _cache_call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a cache read/write, in a worker thread when the backend does disk I/O."""
+        if self._cache.blocking:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        return func(*args, **kwargs)
+
+    async def peek(self, endpoint: str, **params) -> dict | None:
+        """Return the cached GET response for endpoint/params without any network I/O."""
+        url = f"{self.config.base_url}/{endpoint}"
+        cache_key, fields = self._projection_key(url, params)
+        entry = await self._cache_call(self._read_entry, cache_key)
+        if entry is None or not fields <= entry[0]:
+            return None
+        return entry[1]
+
+    async def prime(self, endpoint: str, data: dict, **params) -> None:
+        """Store data as the cached GET response for endpoint/params."""
+        url = f"{self.config.base_url}/{endpoint}"
+        cache_key, fields = self._projection_key(url, params)
+        await self._cache_call(self._write_entry, cache_key, fields, data)
+
+    def record_cache_hit(self) -> None:
+        """Count a lookup answered by a cache layered on this client (e.g. the batch loader)."""
+        self.stats["requests"] += 1
+        self.stats["cache_hits"] += 1
+
+    @staticmethod
+    def _canonical_body(data: dict) -> tuple[dict, list[str] | None]:
+        """
+        Normalize a POST body so equivalent requests share one cache entry.
+
+        Lists of ids are order-insensitive for S2, so they are deduplicated
+        and sorted. Returns the body plus the caller's original `ids` order,
+        used to realign batch results (which follow the request order).
+        """
+        body = {
+            key: sorted(set(value))
+            if isinstance(value, list) and all(isinstance(v, str) for v in value)
+            else value
+            for key, value in data.items()
+        }
+        ids = data.get("ids")
+        return body, list(ids) if isinstance(ids, list) and body.get("ids") != ids else None
+
+    @staticmethod
+    def _realign(result: Any, canonical_ids: list[str], ids: list[str]) -> Any:
+        """
+        Reorder a batch result from canonical id order back to the requested order.
+
+        A result with a different number of items than ids raises ValueError
+        rather than being handed back misaligned.
+        """
+        if not isinstance(result, list):
+            return result
+        by_id = dict(zip(canonical_ids, result, strict=True))
+        return [by_id[paper_id] for paper_id in ids]
+
+    def _flight_key(self, method: str, url: str, **kwargs) -> str:
+        """Normalized identity of a request, used to coalesce concurrent duplicates."""
+        key_str = json.dumps(
+            [method, url, kwargs.get("params"), kwargs.get("json")], sort_keys=True, default=str
+        )
+        return hashlib.md5(key_str.encode()).hexdigest()
+
+    def get_stats(self) -> dict:
+        """Request, cache and coalescing statistics for this client."""
+        stats = dict(self.stats)
+        stats["inflight"] = len(self._inflight)
+        stats["refreshing"] = len(self._refreshing)
+        stats["json_decoder"] = self.json_decoder
+        stats["dedup_ratio"] = (
+            round(stats["coalesced"] / stats["requests"], 3) if stats["requests"] else 0.0
+        )
+        if self.breaker is not None:
+            stats["circuit"] = self.breaker.snapshot()
+        stats["entity_cache"] = {"size": len(self.papers), **self.papers.stats}
+        stats["snapshots"] = dict(self.snapshots.stats)
+        stats["author_cache"] = {"size": len(self.authors)}
+        stats["post_cache"] = {
+            endpoint: {
+                **counts,
+                "hit_ratio": round(counts["hits"] / (counts["hits"] + counts["misses"]), 3),
+            }
+            for endpoint, counts in self.post_cache_stats.items()
+        }
+        limiters = {
+            "rate_limiter": (self.rate_limiter, self.rate_scheduler),
+            "search_limiter": (self.search_limiter, self.search_scheduler),
+        }
+        for name, (limiter, scheduler) in limiters.items():
+            stats[name] = {
+                "current_rate": round(limiter.current_rate, 3),
+                "queue_depth": scheduler.queue_depth + limiter.queue_depth,
+                "queued": {p.value: scheduler.depth(p) for p in RequestPriority},
+                "admitted": dict(scheduler.stats),
+                "wait_seconds": round(scheduler.wait_time, 3),
+            }
+        return stats
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        use_search_limiter: bool = False,
+        use_cache: bool = True,
+        cache_ttl: float | None = None,
+        metric: str | None = None,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        session: str | None = None,
+        **kwargs,
+    ) -> dict:
+        """Make rate-limited HTTP request with caching and single-flight coalescing."""
+        self.stats["requests"] += 1
+        cache_key = None
+        fields: frozenset[str] = frozenset()
+        counts = None
+        if metric is not None:
+            counts = self.post_cache_stats.setdefault(metric, {"hits": 0, "misses": 0})
+
+        # Check cache first (a cached superset of the requested fields is a hit)
+        if use_cache:
+            params = kwargs.get("params") or {}
+            key_params = dict(params)
+            if kwargs.get("json") is not None:
+                # POST bodies are part of the request identity
+                key_params["body"] = json.dumps(kwargs["json"], sort_keys=True)
+            cache_key, fields = self._projection_key(url, key_params)
+            entry = await self._cache_call(self._read_entry, cache_key, allow_stale=True)
+            if entry is not None:
+                cached_fields, cached, stale = entry
+                # Expired entries are served while revalidating, or as a
+                # degraded response while the circuit is open
+                degraded = stale and self.breaker is not None and self.breaker.is_open
+                servable = not stale or self.config.stale_while_revalidate or degraded
+                # Requests without `fields` get S2's defaults; only reuse exact matches
+                if servable and fields <= cached_fields and (fields or not cached_fields):
+                    logger.debug("Cache hit%s: %s", " (stale)" if stale else "", url)
+                    self.stats["cache_hits"] += 1
+                    if counts is not None:
+                        counts["hits"] += 1
+                    if degraded:
+                        self.stats["degraded_hits"] += 1
+                    elif stale:
+                        self.stats["stale_hits"] += 1
+                        # Refresh the cached projection, not just the requested subset
+                        if cached_fields:
+                            kwargs["params"] = {**params, "fields": ",".join(sorted(cached_fields))}
+                        self._revalidate(
+                            method,
+                            url,
+                            use_search_limiter,
+                            cache_key,
+                            cached_fields,
+                            cache_ttl,
+                            session=session,
+                            **kwargs,
+                        )
+                    return cached
+
+                # Widen the request so the new entry supersedes the cached one
+                # instead of the two projections evicting each other
+                if fields and cached_fields:
+                    fields = fields | cached_fields
+                    kwargs["params"] = {**params, "fields": ",".join(sorted(fields))}
+
+        if counts is not None:
+            counts["misses"] += 1
+
+        flight_key = self._flight_key(method, url, **kwargs)
+
+        # Known-bad request: fail fast without spending a rate-limit token
+        error = self._negative.get(flight_key)
+        if error is not None:
+            logger.debug("Negative cache hit: %s", url)
+            self.stats["negative_hits"] += 1
+            raise httpx.HTTPStatusError(str(error), request=error.request, response=error.response)
+
+        # Join an identical request that is already on the wire
+        task = self._inflight.get(flight_key)
+        if task is not None:
+            logger.debug("Coalesced in-flight request: %s", url)
+            self.stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(
+                self._fetch(
+                    method,
+                    url,
+                    use_search_limiter,
+                    cache_key,
+                    fields,
+                    cache_ttl=cache_ttl,
+                    priority=priority,
+                    session=session,
+                    **kwargs,
+                )
+            )
+            self._inflight[flight_key] = task
+            task.add_done_callback(lambda t: self._finish_flight(flight_key, t))
+
+        # Shield so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(task)
+
+    def _revalidate(
+        self,
+        method: str,
+        url: str,
+        use_search_limiter: bool,
+        cache_key: str,
+        fields: frozenset[str],
+        cache_ttl: float | None,
+        session: str | None = None,
+        **kwargs,
+    ) -> None:
+        """
+        Refresh a stale cache entry in the background.
+
+        Refreshes wait for limiter tokens at BACKGROUND priority, and are
+        skipped when stale_refresh_budget refreshes are already running. The
+        entry stays servable until max_stale, so a later hit retries the refresh.
+        """
+        flight_key = self._flight_key(method, url, **kwargs)
+        if flight_key in self._inflight:
+            return
+
+        if len(self._refreshing) >= self.config.stale_refresh_budget:
+            self.stats["refreshes_skipped"] += 1
+            return
+
+        self.stats["refreshes"] += 1
+        task = asyncio.ensure_future(
+            self._fetch(
+                method,
+                url,
+                use_search_limiter,
+                cache_key,
+                fields,
+                cache_ttl=cache_ttl,
+                priority=RequestPriority.BACKGROUND,
+                session=session,
+                **kwargs,
+            )
+        )
+        # Registered as in flight so foreground misses for the same request join it
+        self._inflight[flight_key] = task
+        self._refreshing.add(task)
+        task.add_done_callback(lambda t: self._finish_flight(flight_key, t))
+        task.add_done_callback(self._refreshing.discard)
+
+    def _finish_flight(self, flight_key: str, task: asyncio.Future) -> None:
+        """Forget a completed in-flight request, remembering permanent failures."""
+        if self._inflight.get(flight_key) is task:
+            del self._inflight[flight_key]
+        # Retrieving the exception also marks it handled if every caller was cancelled
+        error = None if task.cancelled() else task.exception()
+        if error is None:
+            return
+
+        if (
+            isinstance(error, httpx.HTTPStatusError)
+            and error.response.status_code in self.config.negative_cache_statuses
+        ):
+            self._negative.set(flight_key, error)
+        if task in self._refreshing:
+            logger.debug("Background refresh failed: %s", error)
+
+    async def _fetch(
+        self,
+        method: str,
+        url: str,
+        use_search_limiter: bool,
+        cache_key: str | None,
+        fields: frozenset[str],
+        cache_ttl: float | None = None,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        session: str | None = None,
+        **kwargs,
+    ) -> dict:
+        """Perform the network request and populate the cache."""
+        data = await self._send(method, url, use_search_limiter, priority, session, **kwargs)
+        self.papers.ingest(data)
+
+        # Cache successful GETs and cacheable POSTs
+        if cache_key is not None:
+            await self._cache_call(self._write_entry, cache_key, fields, data, ttl=cache_ttl)
+
+        return data
+
     @backoff.on_exception(
         backoff.expo,
-        (httpx.HTTPStatusError, httpx.ConnectTimeout, httpx.ReadTimeout),
+        (httpx.HTTPStatusError, httpx.TransportError),
         max_tries=3,
+        jitter=backoff.full_jitter,
+        giveup=lambda e: not is_retryable(e),
         on_backoff=lambda details: logger.warning(
             "Retry %d: %s", details["tries"], details["exception"]
         ),
     )
-    async def _request(
+    async def _send(
         self,
         method: str,
         url: str,
-        use_search_limiter: bool = False,
-        use_cache: bool = True,
+        use_search_limiter: bool,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        session: str | None = None,
         **kwargs,
     ) -> dict:
-        """Make rate-limited HTTP request with caching."""
-
-        # Check cache first
-        if use_cache and method == "GET":
-            cache_key = self._cache_key(url, **kwargs.get("params", {}))
-            if cache_key in self._cache:
-                logger.debug("Cache hit: %s", url)
-                return self._cache[cache_key]
+        """Send one rate-limited HTTP request (retryable failures back off and retry)."""
+        # Fail fast while S2 is down (CircuitOpenError is never retried)
+        if self.breaker is not None and not self.breaker.allow():
+            raise CircuitOpenError(self.breaker.retry_after)
 
-        # Apply rate limiting
+        # Apply rate limiting, in priority order
         limiter = self.search_limiter if use_search_limiter else self.rate_limiter
-        await limiter.acquire()
+        scheduler = self.search_scheduler if use_search_limiter else self.rate_scheduler
+        await scheduler.acquire(priority, session)
 
         client = await self._get_client()
 
-        response = await client.request(method, url, **kwargs)
+        self.stats["network_requests"] += 1
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            self._record_outcome(False)
+            raise
+        await limiter.observe_async(response)
+        # 4xx (including 429) means the server is up; only 5xx count against it
+        self._record_outcome(response.status_code < 500)
         response.raise_for_status()
 
-        data = response.json()
-
-        # Cache successful GET requests
-        if use_cache and method == "GET":
-            self._cache[cache_key] = data
-
-        return data
-
-    async def get(self, endpoint: str, use_search_limiter: bool = False, **params) -> dict:
-        """GET request to Semantic Scholar API."""
+        return self._decode(response.content)
+
+    def _record_outcome(self, ok: bool) -> None:
+        """Feed a request outcome to the circuit breaker."""
+        if self.breaker is None:
+            return
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    async def _on_io_loop(self, coro):
+        """Await coro on the pinned background I/O loop (or inline if unpinned)."""
+        if not self.config.pin_event_loop:
+            return await coro
+        return await get_background_loop().run_async(coro)
+
+    async def get(
+        self, endpoint: str, use_search_limiter: bool = False, use_cache: bool = True, **params
+    ) -> dict:
+        """GET request to Semantic Scholar API (use_cache=False always hits the network)."""
         url = f"{self.config.base_url}/{endpoint}"
-        return await self._request("GET", url, use_search_limiter=use_search_limiter, params=params)
+        # Read in the caller's context; the I/O loop does not inherit it
+        priority, session = current_priority()
+        return await self._on_io_loop(
+            self._request(
+                "GET",
+                url,
+                use_search_limiter=use_search_limiter,
+                use_cache=use_cache,
+                priority=priority,
+                session=session,
+                params=params,
+            )
+        )
+
+    async def post(self, endpoint: str, data: dict, base_url: str | None = None, **params) -> dict:
+        """
+        POST request to Semantic Scholar API.
 
-    async def post(self, endpoint: str, data: dict, base_url: str | None = None) -> dict:
-        """POST request to Semantic Scholar API."""
+        Endpoints listed in config.post_cache_ttls are treated as idempotent
+        and cached by their canonical body; other POSTs always hit the network.
+        """
         url = f"{base_url or self.config.base_url}/{endpoint}"
-        return await self._request("POST", url, use_cache=False, json=data)
+        priority, session = current_priority()
+        ttl = self.config.post_cache_ttls.get(endpoint)
+        if ttl is None:
+            return await self._on_io_loop(
+                self._request(
+                    "POST",
+                    url,
+                    use_cache=False,
+                    priority=priority,
+                    session=session,
+                    json=data,
+                    params=params or None,
+                )
+            )
+
+        body, ids = self._canonical_body(data)
+        result = await self._on_io_loop(
+            self._request(
+                "POST",
+                url,
+                cache_ttl=ttl,
+                metric=endpoint,
+                priority=priority,
+                session=session,
+                json=body,
+                params=params or None,
+            )
+        )
+        if ids is not None:
+            result = self._realign(result, body["ids"], ids)
+        return result
@@ -0,0 +1,117 @@
+"""
+Compact Paper Records
+
+PaperRecord is a slotted view over a raw S2 paper (and optionally the
+citation edge it arrived on). Nothing is copied when a record is built:
+fields are read from the raw response on access, author names are interned
+so repeated authors share one string, and the paper URL is only formatted
+when asked for.
+
+Lineage views filter and rank hundreds of records and call `to_dict()` only
+on the few they return, which produces the same 17-key tool output dict
+`SemanticScholarTools` has always returned.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any
+
+PAPER_URL = "https://www.semanticscholar.org/paper/{}"
+
+
+def intern_authors(authors: list | None) -> list[str]:
+    """Author names from an S2 authors list (dicts or strings), interned."""
+    if not authors:
+        return []
+    if isinstance(authors[0], dict):
+        return [sys.intern(a.get("name") or "") for a in authors]
+    return [sys.intern(a) if isinstance(a, str) else a for a in authors]
+
+
+class PaperRecord:
+    """Lazy, slotted view of one S2 paper and its citation edge"""
+
+    __slots__ = ("_paper", "_edge", "extras")
+
+    def __init__(self, paper: dict, edge: dict | None = None, **extras: Any):
+        """
+        Initialize paper record.
+
+        Args:
+            paper: Raw S2 paper object (paperId, title, citationCount, ...)
+            edge: Raw citation/reference edge carrying isInfluential, contexts, intents
+            **extras: View-specific values appended to to_dict() (scores, matches)
+        """
+        self._paper = paper
+        self._edge = edge
+        self.extras = extras or None
+
+    def __repr__(self) -> str:
+        return f"PaperRecord({self.paper_id!r}, {self.title!r})"
+
+    @property
+    def paper_id(self) -> str:
+        return self._paper.get("paperId", "")
+
+    @property
+    def title(self) -> str:
+        return self._paper.get("title", "")
+
+    @property
+    def year(self) -> int | None:
+        return self._paper.get("year")
+
+    @property
+    def citation_count(self) -> int:
+        return self._paper.get("citationCount", 0)
+
+    @property
+    def authors(self) -> list[str]:
+        return intern_authors(self._paper.get("authors"))
+
+    @property
+    def url(self) -> str:
+        return PAPER_URL.format(self._paper.get("paperId", ""))
+
+    @property
+    def is_influential(self) -> bool:
+        return bool(self._edge and self._edge.get("isInfluential", False))
+
+    @property
+    def intents(self) -> list[str]:
+        return (self._edge.get("intents") if self._edge else None) or []
+
+    def to_dict(self) -> dict:
+        """The normalized tool-output dict for this paper."""
+        paper = self._paper
+        if not paper:
+            return {}
+
+        external_ids = paper.get("externalIds", {}) or {}
+        result = {
+            "id": paper.get("paperId", ""),
+            "title": paper.get("title", ""),
+            "year": paper.get("year"),
+            "authors": intern_authors(paper.get("authors", [])),
+            "abstract": paper.get("abstract", ""),
+            "citation_count": paper.get("citationCount", 0),
+            "reference_count": paper.get("referenceCount", 0),
+            "influential_citation_count": paper.get("influentialCitationCount", 0),
+            "is_open_access": paper.get("isOpenAccess", False),
+            "venue": paper.get("venue", ""),
+            "fields_of_study": paper.get("fieldsOfStudy", []),
+            "publication_date": paper.get("publicationDate"),
+            "publication_types": paper.get("publicationTypes", []),
+            "arxiv_id": external_ids.get("ArXiv"),
+            "doi": external_ids.get("DOI"),
+            "url": PAPER_URL.format(paper.get("paperId", "")),
+        }
+
+        if self._edge is not None:
+            result["is_influential"] = self._edge.get("isInfluential", False)
+            result["contexts"] = self._edge.get("contexts", [])
+            result["intents"] = self._edge.get("intents", [])
+        if self.extras:
+            result.update(self.extras)
+        return result
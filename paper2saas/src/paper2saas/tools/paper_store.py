@@ -0,0 +1,182 @@
+"""
+Paper Entity Cache
+
+Normalized per-paperId cache fed by every S2 response (paper lookups,
+search, batch, citations, references, recommendations). Field sets from
+different endpoints are merged, so a paper first seen as a citation can
+later satisfy a metadata lookup without another request.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any
+
+from .s2_cache import MemoryCache
+
+logger = logging.getLogger(__name__)
+
+# External ID types S2 accepts as "<PREFIX>:<id>" paper identifiers
+_EXTERNAL_ID_PREFIXES = {
+    "ArXiv": "arxiv",
+    "DOI": "doi",
+    "CorpusId": "corpusid",
+    "PubMed": "pmid",
+    "ACL": "acl",
+    "MAG": "mag",
+}
+
+
+# Prefix spellings used in the S2 API documentation
+_CANONICAL_PREFIXES = {
+    "arxiv": "ARXIV",
+    "doi": "DOI",
+    "corpusid": "CorpusId",
+    "pmid": "PMID",
+    "pmcid": "PMCID",
+    "mag": "MAG",
+    "acl": "ACL",
+    "url": "URL",
+}
+
+_ARXIV_URL = re.compile(
+    r"^(?:https?://)?(?:www\.)?arxiv\.org/(?:abs|pdf)/(?P<id>[^?#]+?)(?:\.pdf)?/?$", re.I
+)
+_DOI_URL = re.compile(r"^(?:https?://)?(?:dx\.)?doi\.org/(?P<id>[^?#]+)$", re.I)
+
+
+def normalize_paper_id(paper_id: str) -> str:
+    """
+    Canonicalize a paper identifier before it is sent to S2.
+
+    Trims whitespace, fixes prefix spelling ('arxiv: 1706.03762' ->
+    'ARXIV:1706.03762') and turns arxiv.org / doi.org URLs into prefixed IDs.
+    Unrecognized identifiers are returned trimmed but otherwise unchanged.
+    """
+    paper_id = paper_id.strip()
+
+    match = _ARXIV_URL.match(paper_id)
+    if match:
+        return f"ARXIV:{match['id']}"
+    match = _DOI_URL.match(paper_id)
+    if match:
+        return f"DOI:{match['id']}"
+
+    prefix, sep, value = paper_id.partition(":")
+    canonical = _CANONICAL_PREFIXES.get(prefix.strip().lower())
+    if sep and canonical:
+        return f"{canonical}:{value.strip()}"
+    return paper_id
+
+
+def parse_fields(fields: str | None) -> frozenset[str]:
+    """Split an S2 `fields` parameter into a set of top-level field names."""
+    if not fields:
+        return frozenset()
+    return frozenset(f.strip() for f in fields.split(",") if f.strip())
+
+
+def _alias_key(paper_id: str) -> str:
+    """Case-insensitive key for a prefixed external ID such as 'arXiv:1706.03762'."""
+    prefix, sep, value = paper_id.partition(":")
+    if not sep:
+        return paper_id
+    return f"{prefix.lower()}:{value.strip().lower()}"
+
+
+class PaperEntityCache:
+    """Per-paperId store of merged S2 paper records"""
+
+    def __init__(self, maxsize: int = 20000, ttl: float = 3600):
+        """
+        Initialize entity cache.
+
+        Args:
+            maxsize: Maximum number of papers kept (LRU)
+            ttl: Seconds a paper record stays valid after its last update
+        """
+        self._papers = MemoryCache(maxsize=maxsize, ttl=ttl)
+        self._aliases = MemoryCache(maxsize=maxsize, ttl=ttl)
+        self.stats: dict[str, int] = {"hits": 0, "misses": 0, "partial": 0}
+
+    def __len__(self) -> int:
+        return len(self._papers)
+
+    def put(self, paper: dict) -> None:
+        """Merge one raw S2 paper record into the cache."""
+        paper_id = paper.get("paperId")
+        if not paper_id:
+            return
+
+        existing = self._papers.get(paper_id)
+        merged = {**existing, **paper} if existing else dict(paper)
+        self._papers.set(paper_id, merged)
+
+        for id_type, value in (merged.get("externalIds") or {}).items():
+            prefix = _EXTERNAL_ID_PREFIXES.get(id_type)
+            if prefix and value:
+                self._aliases.set(_alias_key(f"{prefix}:{value}"), paper_id)
+
+    def add_alias(self, paper_id: str, s2_paper_id: str) -> None:
+        """Record that a requested identifier resolved to an S2 paperId."""
+        if paper_id != s2_paper_id:
+            self._aliases.set(_alias_key(paper_id), s2_paper_id)
+
+    def resolve(self, paper_id: str) -> str:
+        """Map an external identifier to a known S2 paperId (or return it unchanged)."""
+        return self._aliases.get(_alias_key(paper_id)) or paper_id
+
+    def lookup(self, paper_id: str, fields: str | None = None) -> dict | None:
+        """
+        Return the cached record if it holds every requested field.
+
+        Args:
+            paper_id: S2 paperId or prefixed external ID
+            fields: Comma-separated S2 fields the caller needs
+
+        Returns:
+            Merged raw paper record, or None if unknown or missing fields
+        """
+        record = self._papers.get(self.resolve(paper_id))
+        if record is None:
+            self.stats["misses"] += 1
+            return None
+
+        if not parse_fields(fields) <= record.keys():
+            self.stats["partial"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return record
+
+    def ingest(self, data: Any) -> int:
+        """
+        Harvest every paper record from an S2 response body.
+
+        Handles single papers, batch lists, paginated `data` lists (including
+        citingPaper / citedPaper edges) and `recommendedPapers`.
+
+        Returns:
+            Number of paper records merged
+        """
+        papers = []
+
+        if isinstance(data, list):
+            papers.extend(p for p in data if isinstance(p, dict))
+        elif isinstance(data, dict):
+            if data.get("paperId"):
+                papers.append(data)
+            for item in data.get("data") or []:
+                if not isinstance(item, dict):
+                    continue
+                for key in ("citingPaper", "citedPaper"):
+                    if isinstance(item.get(key), dict):
+                        papers.append(item[key])
+                if item.get("paperId"):
+                    papers.append(item)
+            papers.extend(p for p in data.get("recommendedPapers") or [] if isinstance(p, dict))
+
+        for paper in papers:
+            self.put(paper)
+        return len(papers)
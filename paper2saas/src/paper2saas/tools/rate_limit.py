@@ -0,0 +1,356 @@
+"""
+Rate Limiters for API Clients
+
+- RateLimiter: fixed-rate token bucket
+- AdaptiveRateLimiter: token bucket whose rate follows server feedback
+  (Retry-After / rate-limit headers, AIMD on 429 responses)
+- SharedRateLimiter: adaptive bucket stored in SQLite, shared by every
+  process and client on a host
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Token bucket rate limiter for API calls"""
+
+    def __init__(self, rate: float = 100.0, per: float = 1.0):
+        """
+        Initialize rate limiter.
+
+        Args:
+            rate: Number of tokens (requests) allowed
+            per: Time period in seconds
+        """
+        self.rate = rate
+        self.per = per
+        self.tokens = rate
+        self.last_update = time.time()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request token is available."""
+        async with self._lock:
+            now = time.time()
+            time_passed = now - self.last_update
+            self.tokens = min(self.rate, self.tokens + time_passed * (self.rate / self.per))
+            self.last_update = now
+
+            if self.tokens < 1:
+                wait_time = (1 - self.tokens) * (self.per / self.rate)
+                await asyncio.sleep(wait_time)
+                self.tokens = 1
+
+            self.tokens -= 1
+
+    def observe(self, response: httpx.Response) -> None:
+        """Feed a server response back to the limiter (no-op for a fixed rate)."""
+
+    async def observe_async(self, response: httpx.Response) -> None:
+        """observe() for callers on an event loop (shared limiters write off the loop)."""
+        self.observe(response)
+
+    @property
+    def current_rate(self) -> float:
+        """Current request rate in requests per second."""
+        return self.rate / self.per
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers waiting for a token (not tracked for a fixed rate)."""
+        return 0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """
+    Token bucket that adapts its rate to server feedback.
+
+    - 429 responses multiply the rate by `decrease_factor` (down to `min_rate`)
+      and pause all callers for Retry-After seconds when the server sends it
+    - Successful responses add `increase_step` req/s (up to `max_rate`)
+    - X-RateLimit-Remaining: 0 pauses callers until X-RateLimit-Reset
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        per: float = 1.0,
+        min_rate: float | None = None,
+        max_rate: float | None = None,
+        increase_step: float | None = None,
+        decrease_factor: float = 0.5,
+    ):
+        """
+        Initialize adaptive rate limiter.
+
+        Args:
+            rate: Starting number of tokens (requests) per period
+            per: Time period in seconds
+            min_rate: Floor for the rate after repeated 429s
+            max_rate: Ceiling the rate may probe up to
+            increase_step: Rate added per successful response (default: 1% of max_rate)
+            decrease_factor: Multiplier applied to the rate on each 429
+        """
+        super().__init__(rate=rate, per=per)
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.max_rate = max(max_rate if max_rate is not None else rate, rate)
+        self.increase_step = increase_step if increase_step is not None else self.max_rate / 100
+        self.decrease_factor = decrease_factor
+
+        self.blocked_until = 0.0
+        self._waiting = 0
+        self.stats: dict[str, int] = {"throttled": 0, "pauses": 0}
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiting
+
+    async def acquire(self) -> None:
+        """Wait until the server allows traffic and a request token is available."""
+        self._waiting += 1
+        try:
+            async with self._lock:
+                pause = self.blocked_until - time.time()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+
+                now = time.time()
+                time_passed = now - self.last_update
+                capacity = max(self.rate, 1.0)
+                self.tokens = min(capacity, self.tokens + time_passed * (self.rate / self.per))
+                self.last_update = now
+
+                if self.tokens < 1:
+                    wait_time = (1 - self.tokens) * (self.per / self.rate)
+                    await asyncio.sleep(wait_time)
+                    self.tokens = 1
+                    self.last_update = time.time()
+
+                self.tokens -= 1
+        finally:
+            self._waiting -= 1
+
+    def observe(self, response: httpx.Response) -> None:
+        """Adjust rate and pauses from a response's status and headers."""
+        headers = response.headers
+
+        if response.status_code == 429:
+            self.on_throttle(parse_retry_after(headers.get("Retry-After")))
+        elif response.status_code < 500:
+            self.on_success()
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset is not None:
+            try:
+                if float(remaining) <= 0:
+                    reset_value = float(reset)
+                    # Reset is either an epoch timestamp or seconds from now
+                    delay = reset_value - time.time() if reset_value > 1e9 else reset_value
+                    self._pause(delay)
+            except ValueError:
+                logger.debug("Ignoring malformed rate-limit headers: %s / %s", remaining, reset)
+
+    def on_success(self) -> None:
+        """Additive increase towards max_rate."""
+        self.rate = min(self.max_rate, self.rate + self.increase_step * self.per)
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        """Multiplicative decrease, plus a pause honouring Retry-After."""
+        self.stats["throttled"] += 1
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self.tokens = min(self.tokens, 0.0)
+        self._pause(retry_after if retry_after is not None else self.per / self.rate)
+        logger.warning("S2 throttled request; rate lowered to %.3f req/s", self.current_rate)
+
+    def _pause(self, seconds: float) -> None:
+        """Hold every caller until `seconds` from now."""
+        if seconds <= 0:
+            return
+        self.stats["pauses"] += 1
+        self.blocked_until = max(self.blocked_until, time.time() + seconds)
+
+
+class SharedRateLimiter(AdaptiveRateLimiter):
+    """
+    Adaptive token bucket whose state lives in a SQLite file.
+
+    Every limiter opened on the same file and bucket name (across toolkit
+    instances, uvicorn workers and other processes on the host) draws from
+    one budget. Each acquire atomically reserves a token inside a
+    `BEGIN IMMEDIATE` transaction, then sleeps outside the transaction until
+    its reservation comes due. Throttle feedback from any process lowers the
+    shared rate and pauses everyone.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rate_buckets (
+            name TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated REAL NOT NULL,
+            rate REAL NOT NULL,
+            blocked_until REAL NOT NULL
+        )
+    """
+
+    def __init__(self, path: str, name: str, rate: float = 1.0, per: float = 1.0, **kwargs):
+        """
+        Initialize shared rate limiter.
+
+        Args:
+            path: SQLite file holding bucket state (parent directories are created)
+            name: Bucket name; limiters with the same name share one budget
+            rate: Starting rate, used only when the bucket does not exist yet
+            per: Time period in seconds
+            **kwargs: AdaptiveRateLimiter tuning (min_rate, max_rate, ...)
+        """
+        super().__init__(rate=rate, per=per, **kwargs)
+        self.path = path
+        self.name = name
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(self._SCHEMA)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO rate_buckets (name, tokens, updated, rate, blocked_until) "
+            "VALUES (?, ?, ?, ?, 0)",
+            (name, min(rate, 1.0), time.time(), rate),
+        )
+
+    def _transact(self, update) -> float | None:
+        """
+        Run `update(tokens, rate, blocked_until, now)` atomically.
+
+        Tokens passed to the callback already include the refill since the
+        bucket was last written, so every write can advance `updated`. The
+        callback returns the new (tokens, rate, blocked_until) and a result
+        value, which is returned to the caller.
+        """
+        with self._db_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                tokens, updated, rate, blocked_until = self._conn.execute(
+                    "SELECT tokens, updated, rate, blocked_until FROM rate_buckets WHERE name = ?",
+                    (self.name,),
+                ).fetchone()
+                now = time.time()
+                # Negative balances are queued reservations, paid back by refill too
+                refill = max(now - updated, 0.0) * (rate / self.per)
+                tokens = min(max(rate, 1.0), tokens + refill)
+                (tokens, rate, blocked_until), result = update(tokens, rate, blocked_until, now)
+                self._conn.execute(
+                    "UPDATE rate_buckets SET tokens = ?, updated = ?, rate = ?, blocked_until = ? "
+                    "WHERE name = ?",
+                    (tokens, now, rate, blocked_until, self.name),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        self.rate = rate
+        self.blocked_until = blocked_until
+        return result
+
+    def _reserve(self) -> float:
+        """Reserve one token; return how long to wait before using it."""
+
+        def update(tokens, rate, blocked_until, now):
+            start = max(now, blocked_until)
+            tokens -= 1
+            # A negative balance is a queue of reservations paid back by refill
+            wait = (start - now) + (-tokens * self.per / rate if tokens < 0 else 0.0)
+            return (tokens, rate, blocked_until), wait
+
+        return self._transact(update)
+
+    async def acquire(self) -> None:
+        """Wait for a token from the shared bucket."""
+        self._waiting += 1
+        try:
+            wait = await asyncio.to_thread(self._reserve)
+            if wait > 0:
+                await asyncio.sleep(wait)
+        finally:
+            self._waiting -= 1
+
+    async def observe_async(self, response: httpx.Response) -> None:
+        """Apply response feedback in a worker thread (writes wait on the SQLite lock)."""
+        await asyncio.to_thread(self.observe, response)
+
+    def on_success(self) -> None:
+        # At max_rate the increase changes nothing; a plain read (which WAL
+        # never blocks) skips the write transaction on the common path
+        with self._db_lock:
+            (rate,) = self._conn.execute(
+                "SELECT rate FROM rate_buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+        if rate >= self.max_rate:
+            self.rate = rate
+            return
+
+        def update(tokens, rate, blocked_until, now):
+            rate = min(self.max_rate, rate + self.increase_step * self.per)
+            return (tokens, rate, blocked_until), None
+
+        self._transact(update)
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        self.stats["throttled"] += 1
+
+        def update(tokens, rate, blocked_until, now):
+            rate = max(self.min_rate, rate * self.decrease_factor)
+            pause = retry_after if retry_after is not None else self.per / rate
+            return (min(tokens, 0.0), rate, max(blocked_until, now + pause)), None
+
+        self._transact(update)
+        logger.warning("S2 throttled request; shared rate lowered to %.3f req/s", self.current_rate)
+
+    def _pause(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        self.stats["pauses"] += 1
+
+        def update(tokens, rate, blocked_until, now):
+            return (tokens, rate, max(blocked_until, now + seconds)), None
+
+        self._transact(update)
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._db_lock:
+            self._conn.close()
@@ -0,0 +1,349 @@
+"""
+Response Cache Backends for the Semantic Scholar Client
+
+Pluggable storage for S2AsyncClient responses:
+- MemoryCache: in-process LRU with per-entry TTL (default)
+- SQLiteCache: persistent, compressed, shared by every process on a host
+
+Select the backend with S2Config.cache_backend ("memory" or "sqlite").
+Both backends can keep entries for `max_stale` seconds past expiry so the
+client can serve them while revalidating in the background or while S2 is
+unreachable.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+from .s2_config import S2Config
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Interface shared by all response cache backends"""
+
+    # Backends doing disk I/O are called from a worker thread by the client
+    blocking: bool = False
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        """Return the cached value, or None if missing or expired."""
+
+    def get_stale(self, key: str) -> tuple[Any, bool] | None:
+        """
+        Return (value, expired) for an entry that is fresh or within max_stale.
+
+        Backends that do not retain expired entries only ever report fresh ones.
+        """
+        value = self.get(key)
+        return None if value is None else (value, False)
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store a value, expiring after ttl seconds (backend default if None)."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a single entry if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+        # Deliberately a no-op: in-process backends hold nothing to release
+        return None
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache with per-entry expiry"""
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 3600, max_stale: float = 0):
+        """
+        Initialize memory cache.
+
+        Args:
+            maxsize: Maximum number of entries before LRU eviction
+            ttl: Default time-to-live in seconds
+            max_stale: Seconds an expired entry is kept for get_stale()
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # Read from sync wrappers and the background I/O loop concurrently
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        item = self.get_stale(key)
+        if item is None or item[1]:
+            return None
+        return item[0]
+
+    def get_stale(self, key: str) -> tuple[Any, bool] | None:
+        now = time.time()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            expires_at, value = item
+            if expires_at + self.max_stale <= now:
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value, expires_at <= now
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Persistent cache stored in a SQLite file.
+
+    Payloads are zlib-compressed JSON. The database runs in WAL mode so any
+    number of processes (e.g. uvicorn workers) can read concurrently while one
+    writes, and warm entries survive restarts and deploys.
+
+    Reads do not write: access times for LRU are buffered and flushed with the
+    next write (or every `touch_batch` reads). Eviction runs only once this
+    connection's size estimate passes `max_bytes`, and trims down to
+    `evict_to` of the budget so it is not repeated on every insert.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS s2_cache (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            expires_at REAL NOT NULL,
+            accessed_at REAL NOT NULL,
+            size INTEGER NOT NULL
+        )
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 3600,
+        max_bytes: int = 256 * 1024 * 1024,
+        compress_level: int = 6,
+        max_stale: float = 0,
+        touch_batch: int = 256,
+        evict_to: float = 0.9,
+    ):
+        """
+        Initialize SQLite cache.
+
+        Args:
+            path: Database file path (parent directories are created)
+            ttl: Default time-to-live in seconds
+            max_bytes: Compressed payload budget before LRU eviction
+            compress_level: zlib compression level (0-9)
+            max_stale: Seconds an expired entry is kept for get_stale()
+            touch_batch: Buffered access-time updates that force a flush
+            evict_to: Fraction of max_bytes left after an eviction pass
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.touch_batch = touch_batch
+        self.evict_to = evict_to
+        # Access times not yet written, by key
+        self._touched: dict[str, float] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # One connection per client; guarded because sqlite3 connections
+        # must not be used from two threads at once.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(self._SCHEMA)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_s2_cache_accessed ON s2_cache (accessed_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_s2_cache_expires ON s2_cache (expires_at)"
+        )
+        self._conn.commit()
+        # Estimated payload bytes; other processes' writes show up at the next eviction
+        (self._size,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM s2_cache").fetchone()
+
+    def _encode(self, value: Any) -> bytes:
+        return zlib.compress(json.dumps(value).encode(), self.compress_level)
+
+    def _decode(self, blob: bytes) -> Any:
+        return json.loads(zlib.decompress(blob))
+
+    def get(self, key: str) -> Any | None:
+        item = self.get_stale(key)
+        if item is None or item[1]:
+            return None
+        return item[0]
+
+    def get_stale(self, key: str) -> tuple[Any, bool] | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM s2_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            blob, expires_at = row
+            if expires_at + self.max_stale <= now:
+                self._conn.execute("DELETE FROM s2_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._touched[key] = now
+            if len(self._touched) >= self.touch_batch:
+                self._flush_touched()
+                self._conn.commit()
+
+        try:
+            return self._decode(blob), expires_at <= now
+        except (zlib.error, ValueError) as e:
+            logger.warning("Dropping corrupt cache entry %s: %s", key, e)
+            self.delete(key)
+            return None
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        blob = self._encode(value)
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO s2_cache (key, value, expires_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, blob, expires_at, now, len(blob)),
+            )
+            self._touched.pop(key, None)
+            self._flush_touched()
+            # Replacements are counted in full, so this errs towards evicting early
+            self._size += len(blob)
+            if self._size > self.max_bytes:
+                self._evict(now)
+            self._conn.commit()
+
+    def _flush_touched(self) -> None:
+        """Write buffered access times; the caller commits."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE s2_cache SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self, now: float) -> None:
+        """Drop rows past their stale window, then LRU rows down to evict_to of the budget."""
+        self._conn.execute("DELETE FROM s2_cache WHERE expires_at <= ?", (now - self.max_stale,))
+
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM s2_cache").fetchone()
+        self._size = total
+        if total <= self.max_bytes:
+            return
+
+        excess = total - int(self.max_bytes * self.evict_to)
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM s2_cache ORDER BY accessed_at ASC"
+        ):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+
+        self._conn.executemany("DELETE FROM s2_cache WHERE key = ?", victims)
+        self._size = total - freed
+        logger.debug("Evicted %d cache entries (%d bytes)", len(victims), freed)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM s2_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM s2_cache")
+            self._conn.commit()
+            self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM s2_cache WHERE expires_at > ?", (time.time(),)
+            ).fetchone()
+        return count
+
+
+def create_cache_backend(config: S2Config) -> CacheBackend:
+    """Build the cache backend selected by config.cache_backend."""
+    # Expired entries are kept even without stale-while-revalidate, so an
+    # open circuit breaker still has something to serve
+    max_stale = config.max_stale
+
+    if config.cache_backend == "memory":
+        return MemoryCache(maxsize=config.cache_maxsize, ttl=config.cache_ttl, max_stale=max_stale)
+
+    if config.cache_backend == "sqlite":
+        return SQLiteCache(
+            path=config.cache_path,
+            ttl=config.cache_ttl,
+            max_bytes=config.cache_max_bytes,
+            max_stale=max_stale,
+        )
+
+    raise ValueError(f"Unknown S2 cache backend: {config.cache_backend!r}")
@@ -23,16 +23,119 @@ class S2Config:
     requests_per_second: float = 0.33  # Conservative for free tier
     search_rate_limit: float = 0.2  # Search endpoint is more limited
 
+    # Adaptive rate limiting: start at the rates above, back off (AIMD) on 429s
+    # and Retry-After, and probe upwards towards the ceilings while successful.
+    # Ceilings stay at the free-tier rates; SemanticScholarTools raises them
+    # when an API key is set.
+    adaptive_rate_limit: bool = True
+    max_requests_per_second: float = 0.33
+    max_search_rate_limit: float = 0.2
+    min_requests_per_second: float = 0.02  # Floor after repeated 429s
+    rate_decrease_factor: float = 0.5  # Rate multiplier applied on each 429
+
+    # "local" (per-client bucket) or "sqlite" (one budget shared by every
+    # process and client on the host that uses the same API key)
+    rate_limit_backend: str = field(
+        default_factory=lambda: os.getenv("S2_RATE_LIMIT_BACKEND", "local")
+    )
+    rate_limit_path: str = field(
+        default_factory=lambda: os.getenv("S2_RATE_LIMIT_PATH", "tmp/s2_rate_limit.db")
+    )
+
+    # Share one client (connection pool, cache, limiter) per base_url/api_key
+    # across every toolkit in the process
+    share_client: bool = True
+    # Run all network I/O on one persistent background event loop, so the
+    # shared connection pool works from sync wrappers and any caller loop
+    pin_event_loop: bool = True
+
     # Timeouts
     connect_timeout: float = 5.0
     read_timeout: float = 30.0
 
+    # Response JSON decoder: "auto" (orjson or msgspec when installed, see the
+    # "fast" extra), "orjson", "msgspec" or "json"
+    json_decoder: str = field(default_factory=lambda: os.getenv("S2_JSON_DECODER", "auto"))
+
     # Caching
     cache_ttl: int = 3600  # 1 hour cache TTL
     cache_maxsize: int = 1000  # Max cached items
+    # "memory" (per-process) or "sqlite" (persistent, shared by all workers)
+    cache_backend: str = field(default_factory=lambda: os.getenv("S2_CACHE_BACKEND", "memory"))
+    cache_path: str = field(default_factory=lambda: os.getenv("S2_CACHE_PATH", "tmp/s2_cache.db"))
+    cache_max_bytes: int = 256 * 1024 * 1024  # Compressed size budget for SQLite cache
+    entity_cache_maxsize: int = 20000  # Max papers in the per-paperId entity cache
+    # Stale-while-revalidate (opt-in): serve expired entries (up to max_stale
+    # seconds past expiry) immediately and refresh them in the background
+    stale_while_revalidate: bool = False
+    max_stale: int = 86400  # Citation counts and metadata drift slowly
+    stale_refresh_budget: int = 4  # Max concurrent background refreshes
+    # Idempotent POST endpoints whose responses are cached, with per-endpoint
+    # TTLs in seconds. Bodies are content-addressed (id lists sorted), so the
+    # same seeds in any order hit the same entry. Unlisted endpoints are not cached.
+    post_cache_ttls: dict[str, int] = field(
+        default_factory=lambda: {
+            "paper/batch": 3600,
+            "papers/": 86400,  # Recommendations drift slowly
+            "author/batch": 86400,
+        }
+    )
+
+    # Errors: 429 / 5xx / network failures are retried with jittered backoff,
+    # other 4xx are not. Responses with these statuses are remembered briefly
+    # so repeated bad or unknown IDs do not spend rate-limit tokens.
+    negative_cache_ttl: int = 300
+    negative_cache_statuses: tuple[int, ...] = (400, 404)
+    # Circuit breaker: fail fast (or serve stale entries) while S2 is down
+    circuit_breaker: bool = True
+    circuit_error_threshold: float = 0.5  # Failure rate in the window that opens the circuit
+    circuit_min_requests: int = 5  # Outcomes needed before the failure rate counts
+    circuit_window: float = 60.0  # Rolling window in seconds
+    circuit_open_duration: float = 30.0  # Seconds open before a half-open probe
+
+    # Canonicalize ID prefixes ('arxiv:' -> 'ARXIV:') and arXiv / DOI URLs
+    normalize_paper_ids: bool = True
 
     # Batch limits
     batch_size: int = 500  # Max papers per batch request
+    auto_batch: bool = True  # Merge concurrent get_paper calls into paper/batch requests
+    batch_window: float = 0.01  # Seconds to collect get_paper calls before dispatching
+    page_size: int = 1000  # Max edges per citations/references page
+
+    # Citation snapshots (one paginated fetch shared by all lineage views)
+    citation_snapshot_limit: int = 1000  # Max citation edges collected per paper
+    # Snapshots are stored per paper: "memory" or "sqlite" (kept across runs).
+    # Older than snapshot_fresh_for, a snapshot is refreshed incrementally:
+    # citations are paged newest first only until a known citing paper appears.
+    snapshot_backend: str = field(
+        default_factory=lambda: os.getenv("S2_SNAPSHOT_BACKEND", "memory")
+    )
+    snapshot_path: str = field(
+        default_factory=lambda: os.getenv("S2_SNAPSHOT_PATH", "tmp/s2_snapshots.db")
+    )
+    snapshot_maxsize: int = 500  # Papers kept by the memory backend
+    snapshot_max_age: int = 30 * 86400  # Stored snapshots are dropped after this
+    snapshot_fresh_for: int = 3600  # Younger snapshots are used without any request
+    snapshot_refresh_page_size: int = 100  # Page size while looking for known citations
+
+    # Multi-hop lineage expansion (expand_lineage). Each paper/batch item
+    # carries its neighbours' IDs, so a whole hop costs one request per batch.
+    lineage_fields: str = "paperId,title,year,citationCount,citations.paperId,references.paperId"
+    lineage_top_k: int = 50  # Papers expanded per hop (most connected first)
+    lineage_budget: int = 20  # Default max paper/batch requests per expansion
+
+    # Author profiles, resolved in bulk with author/batch and cached per author
+    author_fields: str = (
+        "authorId,name,affiliations,paperCount,citationCount,hIndex,"
+        "papers.paperId,papers.title,papers.year,papers.citationCount"
+    )
+    author_batch_size: int = 1000  # Max authors per author/batch request
+
+    # Bulk search sweeps (paper/search/bulk, token-paginated, up to 1000 per page)
+    bulk_search_fields: str = (
+        "paperId,title,year,authors,citationCount,venue,"
+        "fieldsOfStudy,isOpenAccess,publicationDate,externalIds"
+    )
 
     # Default fields to retrieve
     paper_fields: str = (
@@ -43,3 +146,12 @@ class S2Config:
     )
 
     citation_fields: str = "paperId,title,year,authors,citationCount,isInfluential,contexts,intents"
+
+    # Minimal per-method projections. Responses are cached with their field
+    # set, so any later request for a subset is served from the cache.
+    reference_fields: str = (
+        "paperId,title,year,authors,citationCount,isInfluential,contexts,intents"
+    )
+    # Cross-domain bridge detection only needs identity and ranking fields
+    neighbourhood_fields: str = "paperId,title,year,citationCount"
+    recommendation_fields: str = "paperId,title,year,authors,citationCount,externalIds"
@@ -0,0 +1,79 @@
+"""
+JSON Decoding for S2 Responses
+
+Citation and reference pages carry up to 1000 edges, each with contexts and
+intents, and parsing them with the standard library dominates client CPU.
+When installed, a C decoder is used instead:
+
+- orjson (preferred)
+- msgspec
+
+Both are optional; install them with `pip install "paper2saas[fast]"`.
+Without them responses are decoded with the standard library `json` module.
+
+Decoding stops at plain dicts and lists: PaperRecord, the entity cache and
+the response cache all read raw S2 dicts, and the copy into tool-output
+dicts is already deferred to the few records a view returns. Typed msgspec
+Structs would add a second paper representation for no saving there.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+Decoder = Callable[[bytes], Any]
+
+# Preference order for "auto"
+DECODER_NAMES = ("orjson", "msgspec", "json")
+
+
+def _load(name: str) -> Decoder | None:
+    """Import one decoder, or None when its package is not installed."""
+    if name == "json":
+        return json.loads
+    try:
+        if name == "orjson":
+            import orjson
+
+            return orjson.loads
+        if name == "msgspec":
+            import msgspec
+
+            return msgspec.json.Decoder().decode
+    except ImportError:
+        return None
+    raise ValueError(f"Unknown S2 JSON decoder: {name!r}")
+
+
+def available_decoders() -> dict[str, Decoder]:
+    """Every installed decoder by name, fastest first."""
+    decoders = {}
+    for name in DECODER_NAMES:
+        decoder = _load(name)
+        if decoder is not None:
+            decoders[name] = decoder
+    return decoders
+
+
+def get_decoder(name: str = "auto") -> tuple[str, Decoder]:
+    """
+    Resolve a decoder name to (name, decode function).
+
+    Args:
+        name: "auto" (fastest installed), "orjson", "msgspec" or "json".
+              A named decoder that is not installed falls back to "json".
+    """
+    if name == "auto":
+        name, decoder = next(iter(available_decoders().items()))
+        return name, decoder
+
+    decoder = _load(name)
+    if decoder is None:
+        logger.warning("S2 JSON decoder %r is not installed; using json", name)
+        return "json", json.loads
+    return name, decoder
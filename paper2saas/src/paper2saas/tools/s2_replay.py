@@ -0,0 +1,334 @@
+"""
+Record / Replay for Semantic Scholar Traffic
+
+Offline, deterministic S2 backends for tests and benchmarks:
+- RecordingTransport: wraps a real httpx transport and writes every response
+  to a fixture directory (one JSON file per distinct request)
+- ReplayTransport: serves those fixtures in-process
+- create_replay_app(): the same replay as an ASGI app, a local stand-in
+  server any process can point S2Config.base_url at
+
+Both replay front-ends can simulate network latency and 429 throttling
+(a server-side token bucket with Retry-After, or random rejections).
+
+Record fixtures:
+    client = S2AsyncClient(config, transport=RecordingTransport("fixtures/s2"))
+
+Serve them:
+    python -m paper2saas.tools.s2_replay fixtures/s2 --port 8765 --latency 0.2 --rate-limit 1
+    # base_url="http://127.0.0.1:8765/graph/v1"
+    # recommendations_url="http://127.0.0.1:8765/recommendations/v1"
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import time
+from typing import Any
+from urllib.parse import parse_qsl
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+Query = list[tuple[str, str]]
+
+
+def _decode_body(body: bytes) -> Any:
+    """Parse a request body as JSON (falling back to text) for keys and fixtures."""
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body.decode(errors="replace")
+
+
+def fixture_key(method: str, path: str, query: Query, body: Any) -> str:
+    """
+    Stable identity of a request, independent of host and parameter order.
+
+    Args:
+        method: HTTP method
+        path: URL path, e.g. "/graph/v1/paper/abc"
+        query: Query parameters as (name, value) pairs
+        body: Decoded JSON body (or None)
+    """
+    key_str = json.dumps([method.upper(), path, sorted(query), body], sort_keys=True)
+    return hashlib.sha1(key_str.encode()).hexdigest()[:20]
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """httpx transport that records every response it forwards as a fixture"""
+
+    # Server errors and throttling are transient; replaying them is the
+    # replay backend's job (see ReplayBackend.rate_limit)
+    SKIP_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, fixtures_dir: str, transport: httpx.AsyncBaseTransport | None = None):
+        """
+        Initialize recording transport.
+
+        Args:
+            fixtures_dir: Directory fixture files are written to (created if needed)
+            transport: Transport doing the real I/O (default: httpx.AsyncHTTPTransport)
+        """
+        self.fixtures_dir = fixtures_dir
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self.recorded = 0
+        os.makedirs(fixtures_dir, exist_ok=True)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        content = await response.aread()
+
+        if response.status_code not in self.SKIP_STATUSES:
+            self._write(request, response.status_code, content)
+
+        # The body has been consumed; hand back a fully buffered copy
+        headers = {
+            k: v
+            for k, v in response.headers.items()
+            if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        }
+        return httpx.Response(
+            response.status_code, headers=headers, content=content, request=request
+        )
+
+    def _write(self, request: httpx.Request, status_code: int, content: bytes) -> None:
+        query = list(request.url.params.multi_items())
+        body = _decode_body(request.content)
+        key = fixture_key(request.method, request.url.path, query, body)
+
+        fixture = {
+            "request": {
+                "method": request.method,
+                "path": request.url.path,
+                "query": sorted(query),
+                "body": body,
+            },
+            "response": {"status_code": status_code, "body": _decode_body(content)},
+        }
+        path = os.path.join(self.fixtures_dir, f"{key}.json")
+        with open(path, "w") as f:
+            json.dump(fixture, f, indent=2, sort_keys=True)
+        self.recorded += 1
+        logger.debug("Recorded %s %s -> %s", request.method, request.url.path, path)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ReplayBackend:
+    """Serves recorded fixtures with simulated latency and throttling"""
+
+    def __init__(
+        self,
+        fixtures_dir: str,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: float | None = None,
+        throttle_probability: float = 0.0,
+        seed: int | None = None,
+    ):
+        """
+        Initialize replay backend.
+
+        Args:
+            fixtures_dir: Directory of fixtures written by RecordingTransport
+            latency: Base response delay in seconds
+            jitter: Extra uniform random delay in seconds (0..jitter)
+            rate_limit: Requests per second allowed before answering 429 with
+                        Retry-After, like the real API (None: unlimited)
+            throttle_probability: Chance of a random 429 on any request
+            seed: Random seed for reproducible jitter and throttling
+        """
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.throttle_probability = throttle_probability
+        self._random = random.Random(seed)
+
+        self._fixtures: dict[str, dict] = {}
+        self._tokens = rate_limit or 0.0
+        self._updated = time.monotonic()
+        self.stats: dict[str, int] = {"requests": 0, "served": 0, "throttled": 0, "missing": 0}
+        self.load()
+
+    def load(self) -> None:
+        """(Re)load every fixture file from fixtures_dir."""
+        self._fixtures.clear()
+        if not os.path.isdir(self.fixtures_dir):
+            logger.warning("Replay fixtures directory not found: %s", self.fixtures_dir)
+            return
+
+        for name in sorted(os.listdir(self.fixtures_dir)):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(self.fixtures_dir, name)) as f:
+                fixture = json.load(f)
+            request = fixture["request"]
+            key = fixture_key(
+                request["method"],
+                request["path"],
+                [tuple(item) for item in request["query"]],
+                request["body"],
+            )
+            self._fixtures[key] = fixture["response"]
+        logger.debug("Loaded %d replay fixtures", len(self._fixtures))
+
+    def __len__(self) -> int:
+        return len(self._fixtures)
+
+    def _throttle(self) -> float | None:
+        """Return a Retry-After delay if this request should get a 429."""
+        if self.throttle_probability and self._random.random() < self.throttle_probability:
+            return 1.0
+
+        if self.rate_limit is None:
+            return None
+
+        now = time.monotonic()
+        capacity = max(self.rate_limit, 1.0)
+        self._tokens = min(capacity, self._tokens + (now - self._updated) * self.rate_limit)
+        self._updated = now
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate_limit
+        self._tokens -= 1
+        return None
+
+    async def handle(
+        self, method: str, path: str, query: Query, body: bytes
+    ) -> tuple[int, dict[str, str], bytes]:
+        """Answer one request: (status_code, headers, content)."""
+        self.stats["requests"] += 1
+
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        retry_after = self._throttle()
+        if retry_after is not None:
+            self.stats["throttled"] += 1
+            content = json.dumps({"message": "Too Many Requests"}).encode()
+            headers = {
+                "content-type": "application/json",
+                "retry-after": str(max(math.ceil(retry_after), 1)),
+            }
+            return 429, headers, content
+
+        response = self._fixtures.get(fixture_key(method, path, query, _decode_body(body)))
+        if response is None:
+            self.stats["missing"] += 1
+            content = json.dumps({"error": f"No replay fixture for {method} {path}"}).encode()
+            return 404, {"content-type": "application/json"}, content
+
+        self.stats["served"] += 1
+        return (
+            response["status_code"],
+            {"content-type": "application/json"},
+            json.dumps(response["body"]).encode(),
+        )
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """httpx transport answering requests from a ReplayBackend, without sockets"""
+
+    def __init__(self, backend: ReplayBackend):
+        self.backend = backend
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        status_code, headers, content = await self.backend.handle(
+            request.method,
+            request.url.path,
+            list(request.url.params.multi_items()),
+            await request.aread(),
+        )
+        return httpx.Response(status_code, headers=headers, content=content, request=request)
+
+
+def create_replay_app(backend: ReplayBackend):
+    """
+    Build an ASGI app that serves a ReplayBackend on every path.
+
+    GET /_replay/stats reports fixture count and request statistics. The app
+    runs under uvicorn or in-process through httpx.ASGITransport.
+    """
+
+    async def app(scope: dict, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        if scope["path"] == "/_replay/stats":
+            status_code = 200
+            headers = {"content-type": "application/json"}
+            content = json.dumps({"fixtures": len(backend), **backend.stats}).encode()
+        else:
+            query = parse_qsl(scope["query_string"].decode(), keep_blank_values=True)
+            status_code, headers, content = await backend.handle(
+                scope["method"], scope["path"], query, body
+            )
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status_code,
+                "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+            }
+        )
+        await send({"type": "http.response.body", "body": content})
+
+    return app
+
+
+def main() -> None:
+    """Run the replay stand-in server."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve recorded Semantic Scholar responses")
+    parser.add_argument("fixtures_dir", help="Directory written by RecordingTransport")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Base delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay in seconds")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests/sec before 429")
+    parser.add_argument("--throttle-probability", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    backend = ReplayBackend(
+        args.fixtures_dir,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        throttle_probability=args.throttle_probability,
+        seed=args.seed,
+    )
+    uvicorn.run(create_replay_app(backend), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
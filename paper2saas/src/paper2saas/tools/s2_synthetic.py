@@ -0,0 +1,337 @@
+"""
+Synthetic Semantic Scholar Backend
+
+A deterministic, generated citation graph that answers the S2 endpoints the
+toolkit uses (paper lookup, batch, search, bulk search, citations,
+references, recommendations, author batch and author papers) with field
+projection (including nested citations.paperId / references.paperId),
+offset pagination and bulk search continuation tokens.
+
+It has the same `handle()` interface as ReplayBackend, so it plugs into
+ReplayTransport or create_replay_app() and can simulate latency and 429s.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import time
+import zlib
+from typing import Any
+from urllib.parse import unquote
+
+_TOPICS = [
+    "transformer",
+    "graph neural network",
+    "reinforcement learning",
+    "diffusion model",
+    "retrieval",
+    "federated learning",
+    "speech recognition",
+    "protein folding",
+]
+_KINDS = ["framework", "system", "analysis", "benchmark", "implementation", "survey", "theory"]
+_FIELDS = ["Computer Science", "Biology", "Medicine", "Physics", "Mathematics"]
+_INTENTS = ["background", "methodology", "result"]
+
+
+class SyntheticS2Backend:
+    """Generated S2 graph served with simulated latency and throttling"""
+
+    def __init__(
+        self,
+        num_papers: int = 2000,
+        num_authors: int = 500,
+        mean_references: int = 12,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: float | None = None,
+        seed: int = 0,
+        bulk_page_size: int = 1000,
+    ):
+        """
+        Initialize synthetic backend.
+
+        Args:
+            num_papers: Papers in the generated graph
+            num_authors: Distinct authors
+            mean_references: Average references per paper (preferential attachment)
+            latency: Base response delay in seconds
+            jitter: Extra uniform random delay in seconds
+            rate_limit: Requests per second before answering 429 (None: unlimited)
+            seed: Random seed for the graph, jitter and throttling
+            bulk_page_size: Papers per paper/search/bulk page
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.bulk_page_size = bulk_page_size
+        self._random = random.Random(seed)
+        self._tokens = rate_limit or 0.0
+        self._updated = time.monotonic()
+        self.stats: dict[str, int] = {"requests": 0, "throttled": 0, "missing": 0}
+
+        self.papers: dict[str, dict] = {}
+        self.citations: dict[str, list[str]] = {}
+        self.references: dict[str, list[str]] = {}
+        self.authors: dict[str, dict] = {}
+        self._generate(num_papers, num_authors, mean_references, random.Random(seed))
+
+    @staticmethod
+    def paper_id(index: int) -> str:
+        return f"P{index:07d}"
+
+    def _generate(self, num_papers: int, num_authors: int, mean_refs: int, rng) -> None:
+        authors = [{"authorId": f"A{i:06d}", "name": f"Author {i}"} for i in range(num_authors)]
+        ids = [self.paper_id(i) for i in range(num_papers)]
+        # Endpoint list used for preferential attachment
+        attachment: list[str] = []
+
+        for index, paper_id in enumerate(ids):
+            topic = _TOPICS[index % len(_TOPICS)]
+            year = 2000 + index * 26 // max(num_papers, 1)
+            self.papers[paper_id] = {
+                "paperId": paper_id,
+                "title": f"A {rng.choice(_KINDS)} for {topic} #{index}",
+                "year": year,
+                "authors": rng.sample(authors, k=min(rng.randint(1, 5), num_authors)),
+                "abstract": f"We study {topic} and present a practical {rng.choice(_KINDS)}.",
+                "referenceCount": 0,
+                "citationCount": 0,
+                "influentialCitationCount": 0,
+                "isOpenAccess": rng.random() < 0.4,
+                "fieldsOfStudy": [_FIELDS[index % len(_FIELDS)]],
+                "s2FieldsOfStudy": [{"category": _FIELDS[index % len(_FIELDS)], "source": "s2"}],
+                "publicationTypes": ["JournalArticle"],
+                "venue": f"Venue {index % 40}",
+                "publicationDate": f"{year}-01-01",
+                "externalIds": {"ArXiv": f"{year % 100:02d}01.{index:05d}", "CorpusId": index},
+            }
+            self.citations[paper_id] = []
+            self.references[paper_id] = []
+
+            if index:
+                count = min(index, max(1, int(rng.expovariate(1 / mean_refs))))
+                cited = set()
+                while len(cited) < count:
+                    pool = attachment if attachment and rng.random() < 0.7 else ids[:index]
+                    cited.add(rng.choice(pool))
+                for cited_id in cited:
+                    self.references[paper_id].append(cited_id)
+                    self.citations[cited_id].append(paper_id)
+                    attachment.append(cited_id)
+            attachment.append(paper_id)
+
+        for paper_id, paper in self.papers.items():
+            paper["referenceCount"] = len(self.references[paper_id])
+            paper["citationCount"] = len(self.citations[paper_id])
+            paper["influentialCitationCount"] = paper["citationCount"] // 10
+
+        author_papers: dict[str, list[str]] = {}
+        for paper_id, paper in self.papers.items():
+            for author in paper["authors"]:
+                author_papers.setdefault(author["authorId"], []).append(paper_id)
+        for author in authors:
+            paper_ids = author_papers.get(author["authorId"], [])
+            citations = sorted((self.papers[p]["citationCount"] for p in paper_ids), reverse=True)
+            self.authors[author["authorId"]] = {
+                **author,
+                "affiliations": [f"Institute {int(author['authorId'][1:]) % 25}"],
+                "paperCount": len(paper_ids),
+                "citationCount": sum(citations),
+                "hIndex": sum(1 for rank, count in enumerate(citations, 1) if count >= rank),
+                "papers": paper_ids,
+            }
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def _throttle(self) -> float | None:
+        if self.rate_limit is None:
+            return None
+        now = time.monotonic()
+        capacity = max(self.rate_limit, 1.0)
+        self._tokens = min(capacity, self._tokens + (now - self._updated) * self.rate_limit)
+        self._updated = now
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate_limit
+        self._tokens -= 1
+        return None
+
+    async def handle(
+        self, method: str, path: str, query: list[tuple[str, str]], body: bytes
+    ) -> tuple[int, dict[str, str], bytes]:
+        """Answer one request: (status_code, headers, content)."""
+        self.stats["requests"] += 1
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        retry_after = self._throttle()
+        if retry_after is not None:
+            self.stats["throttled"] += 1
+            headers = {"retry-after": str(max(math.ceil(retry_after), 1))}
+            return 429, headers, b'{"message": "Too Many Requests"}'
+
+        params = dict(query)
+        payload = json.loads(body) if body else {}
+        status, data = self._route(method, unquote(path), params, payload)
+        if status == 404:
+            self.stats["missing"] += 1
+        return status, {"content-type": "application/json"}, json.dumps(data).encode()
+
+    def _route(self, method: str, path: str, params: dict, payload: dict) -> tuple[int, Any]:
+        fields = params.get("fields")
+
+        if path.rstrip("/").endswith("/recommendations/v1/papers"):
+            limit = int(params.get("limit", 100))
+            return 200, {"recommendedPapers": self._recommend(payload, fields, limit)}
+
+        _, _, route = path.partition("/graph/v1/")
+        if route == "paper/batch" and method == "POST":
+            return 200, [
+                self._project(self.papers[p], fields) if p in self.papers else None
+                for p in payload.get("ids", [])
+            ]
+        if route == "paper/search":
+            return 200, self._search(params, fields)
+        if route == "paper/search/bulk":
+            return 200, self._bulk_search(params, fields)
+        if route == "author/batch" and method == "POST":
+            return 200, [
+                self._project_author(self.authors[a], fields) if a in self.authors else None
+                for a in payload.get("ids", [])
+            ]
+        if route.startswith("author/"):
+            author_id, _, relation = route[len("author/") :].partition("/")
+            if author_id not in self.authors:
+                return 404, {"error": "Author not found"}
+            if relation == "papers":
+                ids = self.authors[author_id]["papers"]
+                page, offset, next_offset = self._page(ids, params)
+                data = [self._project(self.papers[p], fields) for p in page]
+                result = {"offset": offset, "data": data}
+                if next_offset is not None:
+                    result["next"] = next_offset
+                return 200, result
+            return 200, self._project_author(self.authors[author_id], fields)
+
+        if route.startswith("paper/"):
+            paper_id, _, relation = route[len("paper/") :].partition("/")
+            if paper_id not in self.papers:
+                return 404, {"error": "Paper not found"}
+            if not relation:
+                return 200, self._project(self.papers[paper_id], fields)
+            if relation in ("citations", "references"):
+                return 200, self._edges(paper_id, relation, params, fields)
+
+        return 404, {"error": f"Unsupported synthetic route {method} {path}"}
+
+    def _project(self, paper: dict, fields: str | None) -> dict:
+        if not fields:
+            return {"paperId": paper["paperId"], "title": paper["title"]}
+        names = {f.strip() for f in fields.split(",")}
+        projected = {k: v for k, v in paper.items() if k in names or k == "paperId"}
+        # Nested neighbour IDs, e.g. "citations.paperId" on paper/batch
+        for relation, graph in (("citations", self.citations), ("references", self.references)):
+            if f"{relation}.paperId" in names:
+                projected[relation] = [{"paperId": p} for p in graph[paper["paperId"]]]
+        return projected
+
+    def _project_author(self, author: dict, fields: str | None) -> dict:
+        names = {f.strip() for f in (fields or "name").split(",")}
+        projected = {k: v for k, v in author.items() if k in names and k != "papers"}
+        projected["authorId"] = author["authorId"]
+        # Nested paper fields, e.g. "papers.title"
+        paper_fields = ",".join(f.split(".", 1)[1] for f in names if f.startswith("papers."))
+        if paper_fields or "papers" in names:
+            projected["papers"] = [
+                self._project(self.papers[p], paper_fields or None) for p in author["papers"]
+            ]
+        return projected
+
+    def _page(self, items: list, params: dict) -> tuple[list, int, int | None]:
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", 100))
+        page = items[offset : offset + limit]
+        next_offset = offset + limit if offset + limit < len(items) else None
+        return page, offset, next_offset
+
+    def _edges(self, paper_id: str, relation: str, params: dict, fields: str | None) -> dict:
+        ids = self.citations[paper_id] if relation == "citations" else self.references[paper_id]
+        key = "citingPaper" if relation == "citations" else "citedPaper"
+        page, offset, next_offset = self._page(ids, params)
+        requested = {f.strip() for f in (fields or "").split(",")}
+
+        data = []
+        for other in page:
+            # Edge attributes are derived from the pair so every run agrees
+            digest = zlib.crc32(f"{paper_id}:{other}".encode())
+            edge = {key: self._project(self.papers[other], fields)}
+            if "isInfluential" in requested:
+                edge["isInfluential"] = digest % 10 == 0
+            if "contexts" in requested:
+                edge["contexts"] = [f"... as shown by {self.papers[other]['title']} ..."]
+            if "intents" in requested:
+                edge["intents"] = [_INTENTS[digest % len(_INTENTS)]]
+            data.append(edge)
+
+        result = {"offset": offset, "data": data}
+        if next_offset is not None:
+            result["next"] = next_offset
+        return result
+
+    def _search(self, params: dict, fields: str | None) -> dict:
+        query = params.get("query", "").lower()
+        matches = [
+            p
+            for p in self.papers.values()
+            if any(word in p["title"].lower() for word in query.split())
+        ]
+        matches.sort(key=lambda p: p["citationCount"], reverse=True)
+        page, offset, next_offset = self._page(matches, params)
+        result = {
+            "total": len(matches),
+            "offset": offset,
+            "data": [self._project(p, fields) for p in page],
+        }
+        if next_offset is not None:
+            result["next"] = next_offset
+        return result
+
+    def _bulk_search(self, params: dict, fields: str | None) -> dict:
+        query = params.get("query", "").lower()
+        start, _, end = params.get("year", "-").partition("-")
+        studies = set(filter(None, params.get("fieldsOfStudy", "").split(",")))
+        matches = [
+            p
+            for p in self.papers.values()
+            if any(word in p["title"].lower() for word in query.split())
+            and (not start or p["year"] >= int(start))
+            and (not end or p["year"] <= int(end))
+            and (not studies or studies & set(p["fieldsOfStudy"]))
+            and ("openAccessPdf" not in params or p["isOpenAccess"])
+        ]
+        # Opaque continuation token: the offset of the next page
+        offset = int(params.get("token", "t0")[1:])
+        page = matches[offset : offset + self.bulk_page_size]
+        result = {"total": len(matches), "data": [self._project(p, fields) for p in page]}
+        if offset + self.bulk_page_size < len(matches):
+            result["token"] = f"t{offset + self.bulk_page_size}"
+        return result
+
+    def _recommend(self, payload: dict, fields: str | None, limit: int) -> list[dict]:
+        seeds = [p for p in payload.get("positivePaperIds", []) if p in self.papers]
+        negatives = set(payload.get("negativePaperIds", []))
+        scores: dict[str, int] = {}
+        for seed in seeds:
+            # Co-citation: papers cited alongside the seed by the same citing papers
+            for citing in self.citations[seed]:
+                for other in self.references[citing]:
+                    if other != seed and other not in negatives:
+                        scores[other] = scores.get(other, 0) + 1
+        ranked = sorted(scores, key=lambda p: (-scores[p], p))[:limit]
+        return [self._project(self.papers[p], fields) for p in ranked]
@@ -0,0 +1,158 @@
+"""
+Priority Request Scheduler
+
+Orders S2 requests waiting for a rate-limit token by traffic class, so a
+large workflow fan-out or cache-warming job cannot starve a user waiting on
+an interactive tool call:
+
+- INTERACTIVE: agent tool calls a user is waiting on (default)
+- WORKFLOW: multi-step workflow fan-out
+- BACKGROUND: cache warming and stale-while-revalidate refreshes
+
+Within a class, sessions are served round-robin, so one session's burst does
+not delay another session's first request.
+
+The class and session of a request come from context variables set with
+`s2_priority()`; S2AsyncClient reads them when a request is issued.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import StrEnum
+
+from .rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPriority(StrEnum):
+    """Traffic classes, highest priority first"""
+
+    INTERACTIVE = "interactive"
+    WORKFLOW = "workflow"
+    BACKGROUND = "background"
+
+
+_priority: ContextVar[RequestPriority] = ContextVar(
+    "s2_request_priority", default=RequestPriority.INTERACTIVE
+)
+_session: ContextVar[str | None] = ContextVar("s2_request_session", default=None)
+
+
+@contextmanager
+def s2_priority(priority: RequestPriority | str, session: str | None = None) -> Iterator[None]:
+    """
+    Tag every S2 request issued inside the block with a traffic class.
+
+    Args:
+        priority: Traffic class (RequestPriority or its string value)
+        session: Fair-queuing key (e.g. a workflow run or user session);
+                 inherits the enclosing session when None
+    """
+    priority_token = _priority.set(RequestPriority(priority))
+    session_token = _session.set(session) if session is not None else None
+    try:
+        yield
+    finally:
+        _priority.reset(priority_token)
+        if session_token is not None:
+            _session.reset(session_token)
+
+
+def current_priority() -> tuple[RequestPriority, str | None]:
+    """The (priority, session) of requests issued from the current context."""
+    return _priority.get(), _session.get()
+
+
+class PriorityScheduler:
+    """
+    Admits callers to a rate limiter one at a time, by priority.
+
+    Waiters are queued per traffic class and, within a class, per session.
+    Each time a token is handed out the next waiter is taken from the
+    highest non-empty class, rotating through that class's sessions.
+    """
+
+    def __init__(self, limiter: RateLimiter):
+        """
+        Initialize scheduler.
+
+        Args:
+            limiter: Rate limiter whose tokens are handed out in priority order
+        """
+        self.limiter = limiter
+        self._queues: dict[RequestPriority, OrderedDict[str | None, deque[asyncio.Future]]] = {
+            priority: OrderedDict() for priority in RequestPriority
+        }
+        self._busy = False
+        self.stats: dict[str, int] = {priority.value: 0 for priority in RequestPriority}
+        # Total seconds callers spent queued here and in the limiter
+        self.wait_time = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers waiting for their turn."""
+        return sum(self.depth(priority) for priority in RequestPriority)
+
+    def depth(self, priority: RequestPriority) -> int:
+        """Number of callers waiting in one traffic class."""
+        return sum(
+            1
+            for waiters in self._queues[priority].values()
+            for future in waiters
+            if not future.done()
+        )
+
+    async def acquire(
+        self,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        session: str | None = None,
+    ) -> None:
+        """Wait for this caller's turn, then for a token from the limiter."""
+        priority = RequestPriority(priority)
+        started = time.monotonic()
+
+        if self._busy:
+            future = asyncio.get_running_loop().create_future()
+            self._queues[priority].setdefault(session, deque()).append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                # Cancelled after being handed the turn: pass it on
+                if future.done() and not future.cancelled():
+                    self._next()
+                raise
+        else:
+            self._busy = True
+
+        try:
+            await self.limiter.acquire()
+            self.stats[priority.value] += 1
+        finally:
+            self.wait_time += time.monotonic() - started
+            self._next()
+
+    def _next(self) -> None:
+        """Hand the turn to the next waiter, or mark the scheduler idle."""
+        for queue in self._queues.values():
+            while queue:
+                session, waiters = next(iter(queue.items()))
+                future = waiters.popleft()
+                if waiters:
+                    queue.move_to_end(session)
+                else:
+                    del queue[session]
+
+                # Skip callers that were cancelled while queued
+                if not future.done():
+                    future.set_result(None)
+                    return
+
+        self._busy = False
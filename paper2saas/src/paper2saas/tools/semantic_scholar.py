@@ -11,34 +11,82 @@ Features:
 - Native ML-based recommendations
 - Citation intent analysis
 - Research frontier detection
+- Lazy, prefetching pagination over citations and references
 """
 
 import asyncio
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from datetime import datetime
 from typing import Any
 import logging
 
+import numpy as np
 from agno.tools import Toolkit
 
 # Import from extracted modules (SRP compliance)
 from .s2_config import S2Config
 from .http_client import S2AsyncClient
+from .citation_snapshot import CitationSnapshot
+from .bulk_search import BulkSearchCheckpoint
+from .batch_loader import PaperBatchLoader
+from .client_registry import get_client_registry
+from .background_loop import get_background_loop
+from .paper_store import normalize_paper_id
+from .paper_record import PaperRecord
 
 
 logger = logging.getLogger(__name__)
 
 
+# Paper lists returned by build_research_lineage
+_LINEAGE_VIEWS = (
+    "similar",
+    "foundations",
+    "derivatives",
+    "applications",
+    "frontier",
+    "highly_influential",
+)
+
+
+def _linked_ids(papers: list[dict] | None) -> set[str]:
+    """paperIds from a nested `citations` / `references` list of a batch item."""
+    return {p["paperId"] for p in papers or [] if p and p.get("paperId")}
+
+
 # =============================================================================
 # SEMANTIC SCHOLAR TOOLS
 # =============================================================================
 
 
+def _apply_api_key_rate_limits(config: S2Config) -> None:
+    """
+    Raise config's rate limits when an API key is set.
+
+    Keys start at S2's introductory 1 req/sec and the adaptive limiter
+    probes upwards until the server pushes back.
+    """
+    if not config.api_key:
+        return
+    if not config.adaptive_rate_limit:
+        config.requests_per_second = 100.0
+        config.search_rate_limit = 1.0
+        logger.info("S2_API_KEY detected - using higher rate limits (100 req/sec)")
+    else:
+        config.requests_per_second = max(config.requests_per_second, 1.0)
+        config.max_requests_per_second = max(config.max_requests_per_second, 100.0)
+        config.search_rate_limit = max(config.search_rate_limit, 1.0)
+        config.max_search_rate_limit = max(config.max_search_rate_limit, 10.0)
+        logger.info("S2_API_KEY detected - using adaptive rate limits (up to 100 req/sec)")
+
+
 class SemanticScholarTools(Toolkit):
     """
     Agno toolkit for Semantic Scholar API
 
     Ultra-fast, async alternative to ConnectedPapersTools with:
-    - Async HTTP with connection pooling
+    - Async HTTP with connection pooling (one shared client per API key)
     - Smart caching (1hr TTL)
     - Batch operations (up to 500 papers/request)
     - Native ML-based recommendations
@@ -46,9 +94,30 @@ class SemanticScholarTools(Toolkit):
     - Highly influential citations
     """
 
-    def __init__(self, config: S2Config | None = None):
-        self.config = config or S2Config()
-        self.client = S2AsyncClient(self.config)
+    def __init__(self, config: S2Config | None = None, client: S2AsyncClient | None = None):
+        """
+        Initialize toolkit.
+
+        Args:
+            config: S2 configuration (defaults to the client's, then S2Config())
+            client: Pre-built client (e.g. on a replay transport); the caller
+                    owns it and is responsible for closing it
+        """
+        self.config = config or (client.config if client is not None else S2Config())
+
+        _apply_api_key_rate_limits(self.config)
+
+        # Shared per (base_url, api_key) so agents and workflows reuse one
+        # connection pool, cache and rate-limit budget
+        if client is not None:
+            self.client = client
+        elif self.config.share_client:
+            self.client = get_client_registry().acquire(self.config)
+        else:
+            self.client = S2AsyncClient(self.config)
+        # An injected client is never closed or released by this toolkit
+        self._client_released = client is not None
+        self.paper_loader = PaperBatchLoader(self.client, self.config)
 
         self.application_keywords = [
             "application",
@@ -67,12 +136,6 @@ class SemanticScholarTools(Toolkit):
             "benchmark",
         ]
 
-        # Use higher rate limits if API key is available
-        if self.config.api_key:
-            self.config.requests_per_second = 100.0
-            self.config.search_rate_limit = 1.0
-            logger.info("S2_API_KEY detected - using higher rate limits (100 req/sec)")
-
         # Register tools with Agno
         # Sync tools for agent.run() / agent.print_response()
         tools = [
@@ -96,20 +159,8 @@ class SemanticScholarTools(Toolkit):
     # =========================================================================
 
     def _run_async(self, coro):
-        """Run an async coroutine in a sync context, works in thread pools too."""
-        try:
-            # Try to get existing event loop (works in main thread)
-            loop = asyncio.get_running_loop()
-            # If we're already in an async context, we can't use run_until_complete
-            # This shouldn't happen with Agno's sync execution, but just in case
-            import concurrent.futures
-
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, coro)
-                return future.result()
-        except RuntimeError:
-            # No running loop - safe to use asyncio.run()
-            return asyncio.run(coro)
+        """Run an async coroutine from sync code on the shared background event loop."""
+        return get_background_loop().run(coro)
 
     def get_paper_sync(self, paper_id: str) -> dict:
         """
@@ -151,8 +202,14 @@ class SemanticScholarTools(Toolkit):
         return self._run_async(self.find_application_papers(paper_id, limit=limit))
 
     async def close(self) -> None:
-        """Clean up resources"""
-        await self.client.close()
+        """Clean up resources (releases this toolkit's reference to a shared client)"""
+        if self._client_released:
+            return
+        self._client_released = True
+        if self.config.share_client:
+            await get_client_registry().release(self.client)
+        else:
+            await self.client.close()
 
     # =========================================================================
     # CORE METHODS (matching ConnectedPapers API)
@@ -169,8 +226,14 @@ class SemanticScholarTools(Toolkit):
         Returns:
             Paper metadata dictionary
         """
+        paper_id = self._paper_id(paper_id)
         try:
-            result = await self.client.get(f"paper/{paper_id}", fields=self.config.paper_fields)
+            if self.config.auto_batch:
+                result = await self.paper_loader.load(paper_id)
+            else:
+                result = self.client.papers.lookup(
+                    paper_id, self.config.paper_fields
+                ) or await self.client.get(f"paper/{paper_id}", fields=self.config.paper_fields)
             return self._normalize_paper(result)
         except Exception as e:
             logger.error("Error fetching paper %s: %s", paper_id, e)
@@ -192,11 +255,14 @@ class SemanticScholarTools(Toolkit):
         Returns:
             List of similar papers with relevance metadata
         """
+        paper_id = self._paper_id(paper_id)
         try:
             result = await self.client.post(
                 "papers/",
                 data={"positivePaperIds": [paper_id], "negativePaperIds": []},
                 base_url=self.config.recommendations_url,
+                fields=self.config.recommendation_fields,
+                limit=limit,
             )
 
             papers = result.get("recommendedPapers", [])[:limit]
@@ -218,30 +284,27 @@ class SemanticScholarTools(Toolkit):
         Returns:
             List of referenced papers, sorted by citation count
         """
+        paper_id = self._paper_id(paper_id)
         try:
             result = await self.client.get(
                 f"paper/{paper_id}/references",
-                fields=self.config.citation_fields,
+                fields=self.config.reference_fields,
                 limit=limit * 2,  # Fetch more to allow filtering
             )
 
             references = result.get("data", [])
-            papers = []
+            records = []
 
             for ref in references:
                 cited_paper = ref.get("citedPaper", {})
                 if cited_paper and cited_paper.get("paperId"):
-                    paper = self._normalize_paper(cited_paper)
-                    paper["is_influential"] = ref.get("isInfluential", False)
-                    paper["contexts"] = ref.get("contexts", [])
-                    paper["intents"] = ref.get("intents", [])
-                    papers.append(paper)
+                    records.append(PaperRecord(cited_paper, ref))
 
             # Sort by citation count (most impactful foundations first)
-            papers.sort(key=lambda x: x.get("citation_count", 0), reverse=True)
+            records.sort(key=lambda r: r.citation_count, reverse=True)
 
-            logger.info("Found %d prior works for %s", len(papers), paper_id)
-            return papers[:limit]
+            logger.info("Found %d prior works for %s", len(records), paper_id)
+            return [r.to_dict() for r in records[:limit]]
 
         except Exception as e:
             logger.error("Error finding prior works for %s: %s", paper_id, e)
@@ -267,45 +330,11 @@ class SemanticScholarTools(Toolkit):
             List of citing papers, sorted by year (newest first)
         """
         try:
-            result = await self.client.get(
-                f"paper/{paper_id}/citations",
-                fields=self.config.citation_fields,
-                limit=min(limit * 3, 1000),  # Fetch more for filtering
-            )
-
-            citations = result.get("data", [])
-            current_year = datetime.now().year
-            papers = []
-
-            for cit in citations:
-                citing_paper = cit.get("citingPaper", {})
-                if not citing_paper or not citing_paper.get("paperId"):
-                    continue
-
-                is_influential = cit.get("isInfluential", False)
-
-                # Apply influential filter
-                if influential_only and not is_influential:
-                    continue
-
-                paper = self._normalize_paper(citing_paper)
-                paper["is_influential"] = is_influential
-                paper["contexts"] = cit.get("contexts", [])
-                paper["intents"] = cit.get("intents", [])
-
-                # Apply recency filter
-                if recent_only:
-                    paper_year = paper.get("year", 0)
-                    if paper_year < current_year - 2:
-                        continue
-
-                papers.append(paper)
-
-            # Sort by year (newest first)
-            papers.sort(key=lambda x: x.get("year", 0), reverse=True)
+            snapshot = await self.get_citation_snapshot(paper_id)
+            papers = self._derivatives_from(snapshot, limit, recent_only, influential_only)
 
             logger.info("Found %d derivative works for %s", len(papers), paper_id)
-            return papers[:limit]
+            return papers
 
         except Exception as e:
             logger.error("Error finding derivative works for %s: %s", paper_id, e)
@@ -326,47 +355,11 @@ class SemanticScholarTools(Toolkit):
             List of application-oriented papers
         """
         try:
-            # Get all citing papers with intent information
-            result = await self.client.get(
-                f"paper/{paper_id}/citations", fields=self.config.citation_fields, limit=500
-            )
-
-            citations = result.get("data", [])
-            applications = []
-
-            for cit in citations:
-                citing_paper = cit.get("citingPaper", {})
-                if not citing_paper or not citing_paper.get("paperId"):
-                    continue
-
-                title = citing_paper.get("title", "").lower()
-                intents = cit.get("intents", [])
-
-                # Score based on keywords and intents
-                keyword_matches = [kw for kw in self.application_keywords if kw in title]
-
-                # "methodology" and "result" intents indicate practical usage
-                has_practical_intent = any(i in intents for i in ["methodology", "result"])
-
-                if keyword_matches or has_practical_intent:
-                    paper = self._normalize_paper(citing_paper)
-                    paper["matched_keywords"] = keyword_matches
-                    paper["intents"] = intents
-                    paper["is_influential"] = cit.get("isInfluential", False)
-
-                    # Calculate application score
-                    paper["application_score"] = (
-                        len(keyword_matches) * 2
-                        + (3 if has_practical_intent else 0)
-                        + (2 if cit.get("isInfluential") else 0)
-                    )
-                    applications.append(paper)
-
-            # Sort by application score
-            applications.sort(key=lambda x: x.get("application_score", 0), reverse=True)
+            snapshot = await self.get_citation_snapshot(paper_id)
+            applications = self._applications_from(snapshot, limit)
 
             logger.info("Found %d application papers for %s", len(applications), paper_id)
-            return applications[:limit]
+            return applications
 
         except Exception as e:
             logger.error("Error finding application papers for %s: %s", paper_id, e)
@@ -389,30 +382,27 @@ class SemanticScholarTools(Toolkit):
             Dictionary with complete lineage
         """
         try:
-            # Parallel fetching for speed
-            target_task = asyncio.create_task(self.get_paper(paper_id))
-            similar_task = asyncio.create_task(self.get_similar_papers(paper_id, limit=10))
-            prior_task = asyncio.create_task(self.get_prior_works(paper_id, limit=10))
-            derivative_task = asyncio.create_task(self.get_derivative_works(paper_id, limit=10))
-            applications_task = asyncio.create_task(
-                self.find_application_papers(paper_id, limit=10)
-            )
-            frontier_task = asyncio.create_task(self.find_research_frontier(paper_id, years_back=2))
-            influential_task = asyncio.create_task(
-                self.get_highly_influential_citations(paper_id, limit=5)
-            )
-
+            # Parallel fetching for speed: citation-based views share one snapshot
             results = await asyncio.gather(
-                target_task,
-                similar_task,
-                prior_task,
-                derivative_task,
-                applications_task,
-                frontier_task,
-                influential_task,
+                self.get_paper(paper_id),
+                self.get_similar_papers(paper_id, limit=10),
+                self.get_prior_works(paper_id, limit=10),
+                self.get_citation_snapshot(paper_id),
                 return_exceptions=True,
             )
 
+            snapshot = results[3]
+            if isinstance(snapshot, Exception):
+                logger.error("Error fetching citations for %s: %s", paper_id, snapshot)
+                snapshot = CitationSnapshot(paper_id=paper_id, complete=False)
+
+            results[3:] = [
+                self._derivatives_from(snapshot, limit=10),
+                self._applications_from(snapshot, limit=10),
+                self._frontier_from(snapshot, years_back=2),
+                self._derivatives_from(snapshot, limit=5, influential_only=True),
+            ]
+
             lineage = {
                 "target_paper": results[0] if not isinstance(results[0], Exception) else {},
                 "similar": results[1] if not isinstance(results[1], Exception) else [],
@@ -444,6 +434,102 @@ class SemanticScholarTools(Toolkit):
                 "highly_influential": [],
             }
 
+    async def expand_lineage(
+        self,
+        seed_ids: list[str],
+        depth: int = 2,
+        budget: int | None = None,
+        top_k: int | None = None,
+    ) -> dict:
+        """
+        Breadth-first crawl of the citation graph around one or more seeds.
+
+        Each hop's frontier is fetched with paper/batch requests whose items
+        carry their citing and referenced paper IDs, so a hop costs one
+        request per batch_size papers. Papers already seen (in this crawl, or
+        in the entity cache from an earlier one) are not fetched again, and
+        only the top_k most connected new papers are expanded per hop.
+
+        Args:
+            seed_ids: Papers to start from (any supported identifier)
+            depth: Hops out from the seeds (depth=2 reaches neighbours of neighbours)
+            budget: Max paper/batch requests (default: config.lineage_budget)
+            top_k: Max papers expanded per hop (default: config.lineage_top_k)
+
+        Returns:
+            Dictionary with nodes (each with depth and degree), citation edges
+            between them ("citing" -> "cited") and crawl stats
+        """
+        budget = self.config.lineage_budget if budget is None else budget
+        top_k = self.config.lineage_top_k if top_k is None else top_k
+        frontier = list(dict.fromkeys(self._paper_id(p) for p in seed_ids))
+        seen = set(frontier)
+
+        nodes: dict[str, PaperRecord] = {}
+        # Crawled paper -> IDs of the papers it cites / that cite it
+        cites: dict[str, set[str]] = {}
+        cited_by: dict[str, set[str]] = {}
+        stats = {"requests": 0, "cached": 0, "pruned": 0, "hops": 0, "truncated": False}
+
+        try:
+            for hop in range(depth + 1):
+                if not frontier:
+                    break
+                papers, truncated = await self._fetch_lineage_nodes(
+                    frontier, budget - stats["requests"], stats
+                )
+                stats["hops"] = hop
+                stats["truncated"] = truncated
+
+                for paper in papers:
+                    paper_id = paper["paperId"]
+                    seen.add(paper_id)
+                    nodes[paper_id] = PaperRecord(paper, depth=hop)
+                    cites[paper_id] = _linked_ids(paper.get("references"))
+                    cited_by[paper_id] = _linked_ids(paper.get("citations"))
+
+                if hop == depth or truncated:
+                    break
+
+                # Rank unseen neighbours by how many crawled papers link to them
+                links: dict[str, int] = {}
+                for paper in papers:
+                    paper_id = paper["paperId"]
+                    for other in cites[paper_id] | cited_by[paper_id]:
+                        if other not in seen:
+                            links[other] = links.get(other, 0) + 1
+                ranked = sorted(links, key=lambda p: (-links[p], p))
+                stats["pruned"] += max(len(ranked) - top_k, 0)
+                frontier = ranked[:top_k]
+                seen.update(frontier)
+
+        except Exception as e:
+            logger.error("Error expanding lineage for %s: %s", seed_ids, e)
+            stats["error"] = str(e)
+
+        # Keep only edges between crawled papers, oriented citing -> cited
+        pairs = set()
+        for paper_id in nodes:
+            pairs.update((paper_id, other) for other in cites[paper_id] if other in nodes)
+            pairs.update((other, paper_id) for other in cited_by[paper_id] if other in nodes)
+
+        for paper_id, record in nodes.items():
+            record.extras["degree"] = len((cites[paper_id] | cited_by[paper_id]) & nodes.keys())
+        ordered = sorted(nodes.values(), key=lambda r: (r.extras["depth"], -r.extras["degree"]))
+
+        logger.info(
+            "Expanded lineage: %d papers, %d edges in %d requests",
+            len(nodes),
+            len(pairs),
+            stats["requests"],
+        )
+        return {
+            "seeds": [r.paper_id for r in ordered if r.extras["depth"] == 0],
+            "nodes": [r.to_dict() for r in ordered],
+            "edges": [{"citing": citing, "cited": cited} for citing, cited in sorted(pairs)],
+            "stats": stats,
+        }
+
     async def find_research_frontier(
         self, paper_id: str, years_back: int = 2, limit: int = 10
     ) -> list[dict]:
@@ -462,41 +548,11 @@ class SemanticScholarTools(Toolkit):
             List of frontier papers with citation velocity metrics
         """
         try:
-            current_year = datetime.now().year
-            cutoff_year = current_year - years_back
-
-            # Get recent citing papers
-            result = await self.client.get(
-                f"paper/{paper_id}/citations", fields=self.config.citation_fields, limit=500
-            )
-
-            citations = result.get("data", [])
-            frontier = []
-
-            for cit in citations:
-                citing_paper = cit.get("citingPaper", {})
-                if not citing_paper or not citing_paper.get("paperId"):
-                    continue
-
-                paper_year = citing_paper.get("year", 0)
-                if paper_year < cutoff_year:
-                    continue
-
-                citation_count = citing_paper.get("citationCount", 0)
-                years_since = max(current_year - paper_year, 0.5)  # Avoid division by zero
-                citation_velocity = citation_count / years_since
-
-                paper = self._normalize_paper(citing_paper)
-                paper["citation_velocity"] = round(citation_velocity, 2)
-                paper["is_influential"] = cit.get("isInfluential", False)
-
-                frontier.append(paper)
-
-            # Sort by citation velocity (hot papers first)
-            frontier.sort(key=lambda x: x.get("citation_velocity", 0), reverse=True)
+            snapshot = await self.get_citation_snapshot(paper_id)
+            frontier = self._frontier_from(snapshot, years_back, limit)
 
             logger.info("Found %d frontier papers for %s", len(frontier), paper_id)
-            return frontier[:limit]
+            return frontier
 
         except Exception as e:
             logger.error("Error finding research frontier for %s: %s", paper_id, e)
@@ -519,58 +575,84 @@ class SemanticScholarTools(Toolkit):
         Returns:
             List of bridge papers connecting the two domains
         """
-        try:
-            # Get citations for both papers in parallel
-            cit1_task = self.client.get(
-                f"paper/{paper_id1}/citations", fields="paperId,title,year,citationCount", limit=500
-            )
-            cit2_task = self.client.get(
-                f"paper/{paper_id2}/citations", fields="paperId,title,year,citationCount", limit=500
-            )
-            ref1_task = self.client.get(
-                f"paper/{paper_id1}/references",
-                fields="paperId,title,year,citationCount",
-                limit=500,
-            )
-            ref2_task = self.client.get(
-                f"paper/{paper_id2}/references",
-                fields="paperId,title,year,citationCount",
-                limit=500,
-            )
+        return await self.find_bridge_papers([paper_id1, paper_id2], limit=limit)
 
-            cit1, cit2, ref1, ref2 = await asyncio.gather(
-                cit1_task, cit2_task, ref1_task, ref2_task
-            )
+    async def find_bridge_papers(
+        self, paper_ids: list[str], limit: int = 10, min_domains: int = 2
+    ) -> list[dict]:
+        """
+        Find papers that bridge several research areas, one per seed paper.
 
-            # Extract paper IDs from all connections
-            def extract_ids(data: dict, key: str) -> set[str]:
-                papers = data.get("data", [])
-                return {
-                    p.get(key, {}).get("paperId") for p in papers if p.get(key, {}).get("paperId")
-                }
+        Each seed's neighbourhood (citing and referenced papers) is fetched
+        once and reused from the response cache on later calls. Neighbour IDs
+        are integer-encoded and counted with numpy, so a bridge's rank is the
+        number of seed neighbourhoods it appears in (ties broken by citation
+        count). Full metadata is fetched only for the top `limit` bridges.
 
-            cit1_ids = extract_ids(cit1, "citingPaper")
-            cit2_ids = extract_ids(cit2, "citingPaper")
-            ref1_ids = extract_ids(ref1, "citedPaper")
-            ref2_ids = extract_ids(ref2, "citedPaper")
+        Args:
+            paper_ids: Seed papers, one per research area
+            limit: Maximum bridge papers to return
+            min_domains: Seed neighbourhoods a paper must appear in
 
-            # Find intersection (papers connected to both)
-            all_ids1 = cit1_ids | ref1_ids
-            all_ids2 = cit2_ids | ref2_ids
-            bridge_ids = all_ids1 & all_ids2
+        Returns:
+            Bridge papers, best connected first, with domains_connected and
+            connected_seeds
+        """
+        seeds = list(dict.fromkeys(self._paper_id(p) for p in paper_ids))
+        try:
+            neighbourhoods = await asyncio.gather(*(self._neighbourhood(p) for p in seeds))
+
+            # Integer-encode every neighbour ID (index = first appearance)
+            index: dict[str, int] = {}
+            citations: list[int] = []
+            encoded = []
+            for neighbours in neighbourhoods:
+                codes = []
+                for paper in neighbours:
+                    code = index.setdefault(paper["paperId"], len(index))
+                    if code == len(citations):
+                        citations.append(paper.get("citationCount") or 0)
+                    codes.append(code)
+                encoded.append(np.unique(np.asarray(codes, dtype=np.int64)))
+
+            if not index:
+                logger.info("No neighbours found for %s", seeds)
+                return []
 
-            if not bridge_ids:
-                logger.info("No bridge papers found between %s and %s", paper_id1, paper_id2)
+            # Number of seed neighbourhoods each paper appears in. Seeds given
+            # as ARXIV:/DOI: IDs are excluded by their S2 paperId.
+            domains = np.bincount(np.concatenate(encoded), minlength=len(index))
+            for seed in await self._resolve_paper_ids(seeds):
+                if seed in index:
+                    domains[index[seed]] = 0
+
+            candidates = np.flatnonzero(domains >= min_domains)
+            if not candidates.size:
+                logger.info("No bridge papers found between %s", seeds)
                 return []
 
-            # Fetch full details for bridge papers
-            bridge_papers = await self.batch_get_papers(list(bridge_ids)[:limit])
+            counts = np.asarray(citations, dtype=np.int64)[candidates]
+            order = np.lexsort((-counts, -domains[candidates]))
+            top = candidates[order[:limit]]
 
-            # Sort by citation count
-            bridge_papers.sort(key=lambda x: x.get("citation_count", 0), reverse=True)
+            ids = list(index)
+            bridge_ids = [ids[code] for code in top]
+            members = [set(codes.tolist()) for codes in encoded]
+
+            papers = {p["id"]: p for p in await self.batch_get_papers(bridge_ids)}
+            bridges = []
+            for paper_id, code in zip(bridge_ids, top.tolist(), strict=True):
+                paper = papers.get(paper_id)
+                if not paper:
+                    continue
+                paper["domains_connected"] = int(domains[code])
+                paper["connected_seeds"] = [
+                    seed for seed, codes in zip(seeds, members, strict=True) if code in codes
+                ]
+                bridges.append(paper)
 
-            logger.info("Found %d bridge papers", len(bridge_papers))
-            return bridge_papers
+            logger.info("Found %d bridge papers", len(bridges))
+            return bridges
 
         except Exception as e:
             logger.error("Error finding cross-domain papers: %s", e)
@@ -604,10 +686,12 @@ class SemanticScholarTools(Toolkit):
             result = await self.client.post(
                 "papers/",
                 data={
-                    "positivePaperIds": positive_paper_ids,
-                    "negativePaperIds": negative_paper_ids or [],
+                    "positivePaperIds": [self._paper_id(p) for p in positive_paper_ids],
+                    "negativePaperIds": [self._paper_id(p) for p in negative_paper_ids or []],
                 },
                 base_url=self.config.recommendations_url,
+                fields=self.config.recommendation_fields,
+                limit=limit,
             )
 
             papers = result.get("recommendedPapers", [])[:limit]
@@ -659,6 +743,101 @@ class SemanticScholarTools(Toolkit):
             logger.error("Error searching papers for '%s': %s", query, e)
             return []
 
+    async def iter_bulk_search(
+        self,
+        query: str,
+        year_range: tuple | None = None,
+        fields_of_study: list[str] | None = None,
+        open_access_only: bool = False,
+        max_results: int | None = None,
+        checkpoint_path: str | None = None,
+        checkpoint_state: dict | None = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream every paper matching a query from the bulk search endpoint.
+
+        Pages (up to 1000 papers) follow S2's continuation token. At most one
+        page is requested ahead of the caller, so a slow consumer holds back
+        the sweep and memory stays bounded. With checkpoint_path the position
+        is saved after each page and when the caller stops early, and a later
+        call with the same query and filters resumes from it (a finished
+        sweep starts over). Wrap in contextlib.aclosing() when breaking out
+        early.
+
+        Args:
+            query: Search query (bulk search supports boolean syntax)
+            year_range: Optional (start_year, end_year) tuple
+            fields_of_study: Filter by fields (e.g., ["Computer Science", "Medicine"])
+            open_access_only: Only return open access papers
+            max_results: Optional cap on papers yielded (across resumed runs)
+            checkpoint_path: JSON file recording the sweep position
+            checkpoint_state: The caller's JSON-serializable progress, updated
+                in place as papers are consumed. It is saved with every
+                checkpoint and refilled from the checkpoint on resume.
+
+        Yields:
+            Matching papers in normalized format
+        """
+        params = {"query": query, "fields": self.config.bulk_search_fields}
+        if year_range:
+            params["year"] = f"{year_range[0]}-{year_range[1]}"
+        if fields_of_study:
+            params["fieldsOfStudy"] = ",".join(fields_of_study)
+        if open_access_only:
+            params["openAccessPdf"] = ""
+
+        checkpoint = BulkSearchCheckpoint.load(checkpoint_path, params)
+        if checkpoint_state is not None:
+            checkpoint_state.clear()
+            checkpoint_state.update(checkpoint.state)
+        token, skip, yielded = checkpoint.token, checkpoint.skip, checkpoint.yielded
+
+        def fetch(page_token: str | None) -> asyncio.Future:
+            page_params = dict(params, token=page_token) if page_token else params
+            return asyncio.ensure_future(
+                self.client.get(
+                    "paper/search/bulk", use_search_limiter=True, use_cache=False, **page_params
+                )
+            )
+
+        def wanted(count: int) -> bool:
+            return max_results is None or count < max_results
+
+        pending = fetch(token) if wanted(yielded) else None
+        consumed = skip
+        try:
+            while pending is not None:
+                page = await pending
+                pending = None
+                papers = page.get("data") or []
+                next_token = page.get("token")
+                # Request at most one page ahead of the caller
+                if next_token and wanted(yielded + len(papers) - skip):
+                    pending = fetch(next_token)
+
+                for paper in papers[skip:]:
+                    if not wanted(yielded):
+                        break
+                    consumed += 1
+                    yielded += 1
+                    yield self._normalize_paper(paper)
+
+                if consumed < len(papers):
+                    break
+                token, skip, consumed = next_token, 0, 0
+                # Checkpoint writes are file I/O; keep them off the event loop
+                await asyncio.to_thread(
+                    checkpoint.save, token, 0, yielded, next_token is None, checkpoint_state
+                )
+        finally:
+            if pending is not None:
+                pending.cancel()
+            # Stopped early (caller, max_results or error): remember exactly where
+            if not checkpoint.done:
+                await asyncio.to_thread(
+                    checkpoint.save, token, consumed, yielded, state=checkpoint_state
+                )
+
     async def batch_get_papers(self, paper_ids: list[str]) -> list[dict]:
         """
         Get details for multiple papers in a single batch request.
@@ -672,7 +851,13 @@ class SemanticScholarTools(Toolkit):
         Returns:
             List of paper details
         """
+        paper_ids = [self._paper_id(p) for p in paper_ids]
         try:
+            if self.config.auto_batch:
+                # Loader splits into batch_size chunks and primes the per-paper cache
+                papers = await self.paper_loader.load_many(paper_ids)
+                return [self._normalize_paper(p) for p in papers if p]
+
             all_papers = []
 
             # Process in batches of 500
@@ -682,6 +867,7 @@ class SemanticScholarTools(Toolkit):
                 result = await self.client.post(
                     "paper/batch",
                     data={"ids": batch},
+                    fields=self.config.paper_fields,
                 )
 
                 papers = result if isinstance(result, list) else []
@@ -721,6 +907,111 @@ class SemanticScholarTools(Toolkit):
             logger.error("Error getting author papers for %s: %s", author_id, e)
             return []
 
+    async def get_authors(self, author_ids: list[str], paper_limit: int = 5) -> list[dict]:
+        """
+        Get profiles and top papers for many authors in bulk.
+
+        Authors already resolved are served from the client's author cache;
+        the rest are fetched with author/batch (up to 1000 per request).
+
+        Args:
+            author_ids: Semantic Scholar author IDs
+            paper_limit: Top papers (by citation count) kept per author
+
+        Returns:
+            Author profiles in the order requested (unknown IDs are skipped)
+        """
+        author_ids = list(dict.fromkeys(a for a in author_ids if a))
+        try:
+            found: dict[str, dict] = {}
+            missing = []
+            for author_id in author_ids:
+                cached = self.client.authors.get(author_id)
+                if cached is not None:
+                    found[author_id] = cached
+                else:
+                    missing.append(author_id)
+
+            size = self.config.author_batch_size
+            results = await asyncio.gather(
+                *(
+                    self.client.post(
+                        "author/batch",
+                        data={"ids": missing[i : i + size]},
+                        fields=self.config.author_fields,
+                    )
+                    for i in range(0, len(missing), size)
+                )
+            )
+            for result in results:
+                for author in result if isinstance(result, list) else []:
+                    if author and author.get("authorId"):
+                        self.client.authors.set(author["authorId"], author)
+                        found[author["authorId"]] = author
+
+            return [
+                self._normalize_author(found[author_id], paper_limit)
+                for author_id in author_ids
+                if author_id in found
+            ]
+
+        except Exception as e:
+            logger.error("Error in batch author lookup: %s", e)
+            return []
+
+    def collect_author_ids(self, papers: list[dict]) -> dict[str, int]:
+        """
+        Author IDs behind normalized papers (e.g. lineage results).
+
+        Tool output only carries author names, so IDs are read from the raw
+        records the entity cache kept when the papers were fetched.
+
+        Returns:
+            Author ID -> number of the given papers they wrote
+        """
+        counts: dict[str, int] = {}
+        for paper in papers:
+            raw = self.client.papers.lookup(paper.get("id") or "", "authors") or {}
+            for author in raw.get("authors") or []:
+                if isinstance(author, dict) and author.get("authorId"):
+                    counts[author["authorId"]] = counts.get(author["authorId"], 0) + 1
+        return counts
+
+    async def analyze_author_network(
+        self, paper_id: str, limit: int = 20, paper_limit: int = 5
+    ) -> dict:
+        """
+        Profile the authors behind a paper's research lineage.
+
+        Builds the lineage, collects the author IDs of every paper in it and
+        resolves the most frequent authors with one author/batch request.
+
+        Args:
+            paper_id: Target paper identifier
+            limit: Maximum authors to profile (most lineage papers first)
+            paper_limit: Top papers kept per author
+
+        Returns:
+            Dictionary with author profiles (each with lineage_papers) and counts
+        """
+        lineage = await self.build_research_lineage(paper_id)
+        views = [lineage["target_paper"], *(p for key in _LINEAGE_VIEWS for p in lineage[key])]
+        papers = {p["id"]: p for p in views if p.get("id")}
+
+        counts = self.collect_author_ids(list(papers.values()))
+        top = sorted(counts, key=lambda a: (-counts[a], a))[:limit]
+        authors = await self.get_authors(top, paper_limit=paper_limit)
+        for author in authors:
+            author["lineage_papers"] = counts[author["id"]]
+
+        logger.info("Profiled %d of %d lineage authors for %s", len(authors), len(counts), paper_id)
+        return {
+            "paper_id": paper_id,
+            "authors": authors,
+            "papers_scanned": len(papers),
+            "authors_found": len(counts),
+        }
+
     async def get_highly_influential_citations(self, paper_id: str, limit: int = 10) -> list[dict]:
         """
         Get only the highly influential citations for a paper.
@@ -737,44 +1028,416 @@ class SemanticScholarTools(Toolkit):
         """
         return await self.get_derivative_works(paper_id, limit=limit, influential_only=True)
 
+    async def iter_citations(
+        self, paper_id: str, max_results: int | None = None
+    ) -> AsyncIterator[dict]:
+        """
+        Lazily iterate over every paper citing the target paper.
+
+        Pages are fetched on demand (the next one is prefetched in the
+        background), so callers can stop as soon as they have enough results
+        and memory stays bounded regardless of citation count. Wrap in
+        contextlib.aclosing() when breaking out early.
+
+        Args:
+            paper_id: Target paper identifier
+            max_results: Optional cap on the number of citation edges scanned
+
+        Yields:
+            Citing papers with is_influential, contexts and intents
+        """
+        pages = self._iter_pages(
+            paper_id, "citations", fields=self.config.citation_fields, max_items=max_results
+        )
+        async with aclosing(pages):
+            async for page in pages:
+                for cit in page.get("data") or []:
+                    citing_paper = cit.get("citingPaper") or {}
+                    if citing_paper.get("paperId"):
+                        yield self._with_edge(citing_paper, cit)
+
+    async def iter_references(
+        self, paper_id: str, max_results: int | None = None
+    ) -> AsyncIterator[dict]:
+        """
+        Lazily iterate over every paper referenced by the target paper.
+
+        Args:
+            paper_id: Target paper identifier
+            max_results: Optional cap on the number of reference edges scanned
+
+        Yields:
+            Referenced papers with is_influential, contexts and intents
+        """
+        pages = self._iter_pages(
+            paper_id, "references", fields=self.config.reference_fields, max_items=max_results
+        )
+        async with aclosing(pages):
+            async for page in pages:
+                for ref in page.get("data") or []:
+                    cited_paper = ref.get("citedPaper") or {}
+                    if cited_paper.get("paperId"):
+                        yield self._with_edge(cited_paper, ref)
+
     # =========================================================================
     # HELPER METHODS
     # =========================================================================
 
-    def _normalize_paper(self, paper: dict) -> dict:
-        """Normalize paper data to consistent format"""
-        if not paper:
-            return {}
+    async def get_citation_snapshot(self, paper_id: str, refresh: bool = False) -> CitationSnapshot:
+        """
+        Citation edges for a paper, from its stored snapshot where possible.
+
+        A stored snapshot younger than config.snapshot_fresh_for is returned
+        as-is. An older one (or any, with refresh=True) is refreshed
+        incrementally: citations are paged newest first only until the stored
+        snapshot's newest citing paper appears, and the new edges are merged in
+        front. Without a stored snapshot, or when S2's ordering does not match
+        the stored one, every edge is fetched, up to config.citation_snapshot_limit;
+        the snapshot's `complete` flag records whether the list was truncated.
+
+        Args:
+            paper_id: Target paper identifier
+            refresh: Check for new citations even if the stored snapshot is fresh
+        """
+        paper_id = self._paper_id(paper_id)
+        store = self.client.snapshots
+        stored = await store.get(paper_id)
 
-        # Handle authors list
-        authors = paper.get("authors", [])
-        if authors and isinstance(authors[0], dict):
-            author_names = [a.get("name", "") for a in authors]
+        if stored is not None and not refresh and stored.age < self.config.snapshot_fresh_for:
+            store.stats["fresh"] += 1
+            return stored
+
+        if stored is not None and stored.edges:
+            snapshot = await self._refresh_snapshot(stored)
         else:
-            author_names = authors
+            snapshot = await self._fetch_snapshot(paper_id)
+        await store.put(snapshot)
+        return snapshot
+
+    async def _fetch_snapshot(self, paper_id: str, use_cache: bool = True) -> CitationSnapshot:
+        """Fetch every citation edge for a paper, paginating as needed."""
+        snapshot = CitationSnapshot(paper_id=paper_id)
+        pages = self._iter_pages(
+            paper_id,
+            "citations",
+            fields=self.config.citation_fields,
+            max_items=self.config.citation_snapshot_limit,
+            use_cache=use_cache,
+        )
+
+        async with aclosing(pages):
+            async for page in pages:
+                self.client.snapshots.stats["pages"] += 1
+                snapshot.edges.extend(page.get("data") or [])
+                snapshot.complete = page.get("next") is None
+
+        self.client.snapshots.stats["fetched"] += 1
+        return snapshot
+
+    async def _refresh_snapshot(self, stored: CitationSnapshot) -> CitationSnapshot:
+        """Page the newest citations until a known one appears, then merge the delta."""
+        known = stored.citing_ids()
+        newest = stored.newest_id()
+        new_edges: list[dict] = []
+        overlap: str | None = None
+        pages = self._iter_pages(
+            stored.paper_id,
+            "citations",
+            fields=self.config.citation_fields,
+            max_items=self.config.citation_snapshot_limit,
+            page_size=self.config.snapshot_refresh_page_size,
+            use_cache=False,
+            prefetch=False,
+        )
+
+        async with aclosing(pages):
+            async for page in pages:
+                self.client.snapshots.stats["pages"] += 1
+                for edge in page.get("data") or []:
+                    citing_id = (edge.get("citingPaper") or {}).get("paperId")
+                    if citing_id in known:
+                        overlap = citing_id
+                        break
+                    new_edges.append(edge)
+                if overlap is not None:
+                    break
+
+        if overlap is not None and overlap != newest:
+            # Known papers are not where a newest-first listing would put them,
+            # so edges past the boundary may be missing from the delta
+            logger.warning(
+                "Citation order for %s changed since its snapshot; refetching",
+                stored.paper_id,
+            )
+            return await self._fetch_snapshot(stored.paper_id, use_cache=False)
+
+        stats = self.client.snapshots.stats
+        stats["new_edges"] += len(new_edges)
+        if overlap is None:
+            # Nothing known was reached within the limit: the pages are a full refetch
+            stats["fetched"] += 1
+            return CitationSnapshot(
+                paper_id=stored.paper_id,
+                edges=new_edges,
+                complete=len(new_edges) < self.config.citation_snapshot_limit,
+            )
+
+        stats["refreshed"] += 1
+        logger.info("Refreshed citations for %s: %d new", stored.paper_id, len(new_edges))
+        return stored.merged(new_edges, limit=self.config.citation_snapshot_limit)
+
+    async def _iter_pages(
+        self,
+        paper_id: str,
+        relation: str,
+        fields: str,
+        max_items: int | None = None,
+        page_size: int | None = None,
+        use_cache: bool = True,
+        prefetch: bool = True,
+    ) -> AsyncIterator[dict]:
+        """
+        Yield raw pages of `paper/{id}/{relation}`, following S2 offset/next.
+
+        With prefetch, the next page is requested in the background while the
+        caller consumes the current one; without it, only once the caller asks
+        for it. No page beyond max_items is ever requested.
+        """
+        page_size = page_size or self.config.page_size
+        endpoint = f"paper/{self._paper_id(paper_id)}/{relation}"
+
+        def fetch(offset: int) -> asyncio.Future:
+            limit = page_size if max_items is None else min(page_size, max_items - offset)
+            return asyncio.ensure_future(
+                self.client.get(
+                    endpoint, use_cache=use_cache, fields=fields, offset=offset, limit=limit
+                )
+            )
+
+        pending = fetch(0)
+        try:
+            while pending is not None:
+                page = await pending
+                pending = None
+
+                next_offset = page.get("next")
+                has_next = (
+                    page.get("data")
+                    and next_offset is not None
+                    and (max_items is None or next_offset < max_items)
+                )
+                if has_next and prefetch:
+                    pending = fetch(next_offset)
 
-        # Extract external IDs
-        external_ids = paper.get("externalIds", {}) or {}
+                yield page
 
+                if has_next and not prefetch:
+                    pending = fetch(next_offset)
+        finally:
+            # Caller stopped early: drop the prefetched page
+            if pending is not None:
+                pending.cancel()
+
+    async def _resolve_paper_ids(self, paper_ids: list[str]) -> list[str]:
+        """
+        S2 paperIds for caller-supplied IDs.
+
+        External IDs (ARXIV:, DOI:, ...) come from the entity cache's aliases;
+        unknown ones are looked up through the batch loader, which records them.
+        """
+        external = [p for p in paper_ids if ":" in self.client.papers.resolve(p)]
+        if external:
+            await self.paper_loader.load_many(external)
+        return [self.client.papers.resolve(p) for p in paper_ids]
+
+    async def _neighbourhood(self, paper_id: str) -> list[dict]:
+        """Papers citing or cited by a paper (up to 500 each, neighbourhood_fields)."""
+        citations, references = await asyncio.gather(
+            self.client.get(
+                f"paper/{paper_id}/citations", fields=self.config.neighbourhood_fields, limit=500
+            ),
+            self.client.get(
+                f"paper/{paper_id}/references", fields=self.config.neighbourhood_fields, limit=500
+            ),
+        )
+        neighbours = []
+        for data, key in ((citations, "citingPaper"), (references, "citedPaper")):
+            for edge in data.get("data") or []:
+                paper = edge.get(key) or {}
+                if paper.get("paperId"):
+                    neighbours.append(paper)
+        return neighbours
+
+    async def _fetch_lineage_nodes(
+        self, paper_ids: list[str], budget: int, stats: dict
+    ) -> tuple[list[dict], bool]:
+        """
+        Fetch papers with their neighbour IDs, from the entity cache where possible.
+
+        Returns:
+            (papers, truncated) where truncated means the request budget ran
+            out before every uncached paper could be fetched
+        """
+        lookup_fields = ",".join(
+            sorted({f.split(".", 1)[0] for f in self.config.lineage_fields.split(",")})
+        )
+        papers, missing = [], []
+        for paper_id in paper_ids:
+            cached = self.client.papers.lookup(paper_id, lookup_fields)
+            if cached is not None:
+                papers.append(cached)
+            else:
+                missing.append(paper_id)
+        stats["cached"] += len(papers)
+
+        chunks = [
+            missing[i : i + self.config.batch_size]
+            for i in range(0, len(missing), self.config.batch_size)
+        ]
+        allowed = chunks[: max(budget, 0)]
+        stats["requests"] += len(allowed)
+
+        results = await asyncio.gather(
+            *(
+                self.client.post(
+                    "paper/batch", data={"ids": chunk}, fields=self.config.lineage_fields
+                )
+                for chunk in allowed
+            )
+        )
+        for result in results:
+            papers.extend(p for p in result if p and p.get("paperId"))
+        return papers, len(allowed) < len(chunks)
+
+    def _derivatives_from(
+        self,
+        snapshot: CitationSnapshot,
+        limit: int = 10,
+        recent_only: bool = False,
+        influential_only: bool = False,
+    ) -> list[dict]:
+        """Citing papers sorted by year (newest first)."""
+        current_year = datetime.now().year
+        records = []
+
+        for citing_paper, cit in snapshot.citing_papers():
+            is_influential = cit.get("isInfluential", False)
+
+            # Apply influential filter
+            if influential_only and not is_influential:
+                continue
+
+            # Apply recency filter
+            if recent_only and (citing_paper.get("year") or 0) < current_year - 2:
+                continue
+
+            records.append(PaperRecord(citing_paper, cit))
+
+        # Sort by year (newest first); only the returned papers are materialized
+        records.sort(key=lambda r: r.year or 0, reverse=True)
+        return [r.to_dict() for r in records[:limit]]
+
+    def _applications_from(self, snapshot: CitationSnapshot, limit: int = 10) -> list[dict]:
+        """Citing papers scored by application keywords and practical intents."""
+        applications = []
+
+        for citing_paper, cit in snapshot.citing_papers():
+            title = (citing_paper.get("title") or "").lower()
+            intents = cit.get("intents") or []
+
+            # Score based on keywords and intents
+            keyword_matches = [kw for kw in self.application_keywords if kw in title]
+
+            # "methodology" and "result" intents indicate practical usage
+            has_practical_intent = any(i in intents for i in ["methodology", "result"])
+
+            if keyword_matches or has_practical_intent:
+                applications.append(
+                    PaperRecord(
+                        citing_paper,
+                        matched_keywords=keyword_matches,
+                        intents=intents,
+                        is_influential=cit.get("isInfluential", False),
+                        # Calculate application score
+                        application_score=(
+                            len(keyword_matches) * 2
+                            + (3 if has_practical_intent else 0)
+                            + (2 if cit.get("isInfluential") else 0)
+                        ),
+                    )
+                )
+
+        # Sort by application score
+        applications.sort(key=lambda r: r.extras["application_score"], reverse=True)
+        return [r.to_dict() for r in applications[:limit]]
+
+    def _frontier_from(
+        self, snapshot: CitationSnapshot, years_back: int = 2, limit: int = 10
+    ) -> list[dict]:
+        """Recent citing papers sorted by citation velocity (citations per year)."""
+        current_year = datetime.now().year
+        cutoff_year = current_year - years_back
+        frontier = []
+
+        for citing_paper, cit in snapshot.citing_papers():
+            paper_year = citing_paper.get("year") or 0
+            if paper_year < cutoff_year:
+                continue
+
+            citation_count = citing_paper.get("citationCount") or 0
+            years_since = max(current_year - paper_year, 0.5)  # Avoid division by zero
+            citation_velocity = citation_count / years_since
+
+            frontier.append(
+                PaperRecord(
+                    citing_paper,
+                    citation_velocity=round(citation_velocity, 2),
+                    is_influential=cit.get("isInfluential", False),
+                )
+            )
+
+        # Sort by citation velocity (hot papers first)
+        frontier.sort(key=lambda r: r.extras["citation_velocity"], reverse=True)
+        return [r.to_dict() for r in frontier[:limit]]
+
+    def _normalize_author(self, author: dict, paper_limit: int = 5) -> dict:
+        """Normalize an author/batch record, keeping the most cited papers"""
+        papers = sorted(
+            author.get("papers") or [], key=lambda p: p.get("citationCount") or 0, reverse=True
+        )
         return {
-            "id": paper.get("paperId", ""),
-            "title": paper.get("title", ""),
-            "year": paper.get("year"),
-            "authors": author_names,
-            "abstract": paper.get("abstract", ""),
-            "citation_count": paper.get("citationCount", 0),
-            "reference_count": paper.get("referenceCount", 0),
-            "influential_citation_count": paper.get("influentialCitationCount", 0),
-            "is_open_access": paper.get("isOpenAccess", False),
-            "venue": paper.get("venue", ""),
-            "fields_of_study": paper.get("fieldsOfStudy", []),
-            "publication_date": paper.get("publicationDate"),
-            "publication_types": paper.get("publicationTypes", []),
-            "arxiv_id": external_ids.get("ArXiv"),
-            "doi": external_ids.get("DOI"),
-            "url": f"https://www.semanticscholar.org/paper/{paper.get('paperId', '')}",
+            "id": author.get("authorId", ""),
+            "name": author.get("name", ""),
+            "affiliations": author.get("affiliations") or [],
+            "paper_count": author.get("paperCount", 0),
+            "citation_count": author.get("citationCount", 0),
+            "h_index": author.get("hIndex", 0),
+            "url": f"https://www.semanticscholar.org/author/{author.get('authorId', '')}",
+            "top_papers": [
+                {
+                    "id": p.get("paperId", ""),
+                    "title": p.get("title", ""),
+                    "year": p.get("year"),
+                    "citation_count": p.get("citationCount", 0),
+                }
+                for p in papers[:paper_limit]
+            ],
         }
 
+    def _paper_id(self, paper_id: str) -> str:
+        """Canonicalize a caller-supplied paper ID when config.normalize_paper_ids is set."""
+        return normalize_paper_id(paper_id) if self.config.normalize_paper_ids else paper_id
+
+    def _with_edge(self, paper: dict, edge: dict) -> dict:
+        """Normalize a citing/cited paper and attach its citation edge metadata."""
+        return PaperRecord(paper, edge).to_dict()
+
+    def _normalize_paper(self, paper: dict) -> dict:
+        """Normalize paper data to consistent format"""
+        if not paper:
+            return {}
+        return PaperRecord(paper).to_dict()
+
 
 # =============================================================================
 # SYNC WRAPPER (for non-async contexts)
@@ -785,17 +1448,22 @@ class SemanticScholarToolsSync:
     """Synchronous wrapper for SemanticScholarTools"""
 
     def __init__(self, config: S2Config | None = None):
-        self._async_tools = SemanticScholarTools(config)
+        self.config = config or S2Config()
+        self._async_tools = SemanticScholarTools(self.config)
 
     def _run(self, coro):
-        """Run async coroutine synchronously"""
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        """Run async coroutine synchronously on the shared background event loop"""
+        return get_background_loop().run(coro)
 
-        return loop.run_until_complete(coro)
+    def close(self) -> None:
+        """Release the wrapped toolkit's client"""
+        self._run(self._async_tools.close())
+
+    def __enter__(self) -> "SemanticScholarToolsSync":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def get_paper(self, paper_id: str) -> dict:
         return self._run(self._async_tools.get_paper(paper_id))
@@ -817,12 +1485,29 @@ class SemanticScholarToolsSync:
     def build_research_lineage(self, paper_id: str) -> dict:
         return self._run(self._async_tools.build_research_lineage(paper_id))
 
+    def expand_lineage(
+        self, seed_ids: list[str], depth: int = 2, budget: int | None = None
+    ) -> dict:
+        return self._run(self._async_tools.expand_lineage(seed_ids, depth, budget))
+
+    def get_citation_snapshot(self, paper_id: str, refresh: bool = False) -> CitationSnapshot:
+        return self._run(self._async_tools.get_citation_snapshot(paper_id, refresh))
+
     def find_research_frontier(self, paper_id: str, years_back: int = 2) -> list[dict]:
         return self._run(self._async_tools.find_research_frontier(paper_id, years_back))
 
     def find_cross_domain_papers(self, paper_id1: str, paper_id2: str) -> list[dict]:
         return self._run(self._async_tools.find_cross_domain_papers(paper_id1, paper_id2))
 
+    def find_bridge_papers(self, paper_ids: list[str], limit: int = 10) -> list[dict]:
+        return self._run(self._async_tools.find_bridge_papers(paper_ids, limit))
+
+    def get_authors(self, author_ids: list[str], paper_limit: int = 5) -> list[dict]:
+        return self._run(self._async_tools.get_authors(author_ids, paper_limit))
+
+    def analyze_author_network(self, paper_id: str, limit: int = 20) -> dict:
+        return self._run(self._async_tools.analyze_author_network(paper_id, limit))
+
     def search_papers(self, query: str, limit: int = 10) -> list[dict]:
         return self._run(self._async_tools.search_papers(query, limit))
 
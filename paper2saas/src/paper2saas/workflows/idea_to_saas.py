@@ -8,8 +8,9 @@ from dataclasses import dataclass, field
 from datetime import datetime
 import asyncio
 import logging
+import uuid
 
-from ..tools import SemanticScholarTools
+from ..tools import SemanticScholarTools, RequestPriority, s2_priority
 from ..analysis import CitationGraphAnalyzer, MarketValidator
 from ..models import Paper, MarketValidation
 
@@ -73,6 +74,13 @@ class IdeaToSaaSWorkflow:
         Returns:
             IdeaToSaaSResult with all discovered concepts
         """
+        # Workflow fan-out yields to interactive tool calls, fairly per run
+        session = f"{self.name}:{uuid.uuid4().hex[:8]}"
+        with s2_priority(RequestPriority.WORKFLOW, session=session):
+            return await self._run(seed_paper_id, max_concepts, validate)
+
+    async def _run(self, seed_paper_id: str, max_concepts: int, validate: bool) -> IdeaToSaaSResult:
+        """Workflow steps (see run)."""
         try:
             # Step 1: Get seed paper and build research lineage
             logger.info(f"Step 1: Building research lineage for {seed_paper_id}")
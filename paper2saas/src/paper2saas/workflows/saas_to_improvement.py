@@ -4,11 +4,14 @@ Find new research that could improve an existing SaaS product
 """
 
 from typing import List, Dict, Optional
+from contextlib import aclosing
 from dataclasses import dataclass, field
 from datetime import datetime
+import heapq
 import logging
+import uuid
 
-from ..tools import SemanticScholarTools
+from ..tools import SemanticScholarTools, RequestPriority, s2_priority
 from ..models import Paper
 
 logger = logging.getLogger(__name__)
@@ -72,6 +75,21 @@ class SaaSToImprovementWorkflow:
         Returns:
             SaaSImprovementResult with improvement recommendations
         """
+        # Workflow fan-out yields to interactive tool calls, fairly per run
+        session = f"{self.name}:{uuid.uuid4().hex[:8]}"
+        with s2_priority(RequestPriority.WORKFLOW, session=session):
+            return await self._run(
+                product_description, seed_paper_ids, search_query, max_recommendations
+            )
+
+    async def _run(
+        self,
+        product_description: str,
+        seed_paper_ids: list[str] | None,
+        search_query: str | None,
+        max_recommendations: int,
+    ) -> SaaSImprovementResult:
+        """Workflow steps (see run)."""
         try:
             # Step 1: Find seed papers if not provided
             logger.info("Step 1: Finding foundational research")
@@ -134,6 +152,65 @@ class SaaSToImprovementWorkflow:
         finally:
             await self.s2_tools.close()
 
+    async def sweep(
+        self,
+        query: str,
+        top_k: int = 50,
+        max_results: int | None = None,
+        year_range: tuple | None = None,
+        fields_of_study: list[str] | None = None,
+        open_access_only: bool = False,
+        checkpoint_path: str | None = None,
+    ) -> list[dict]:
+        """
+        Sweep every paper matching a product-domain query via bulk search
+
+        Matches are streamed, so memory holds one page plus the top_k most
+        cited papers however many thousands match. With checkpoint_path an
+        interrupted sweep resumes where it stopped, including the ranking
+        built so far. run() closes the toolkit, so sweep first.
+
+        Args:
+            query: Product-domain search query
+            top_k: Most cited matches to keep
+            max_results: Optional cap on papers scanned
+            year_range: Optional (start_year, end_year) tuple
+            fields_of_study: Optional fields of study filter
+            open_access_only: Only scan open access papers
+            checkpoint_path: JSON file recording the sweep position and ranking
+
+        Returns:
+            Top matches by citation count
+        """
+        session = f"{self.name}:sweep:{uuid.uuid4().hex[:8]}"
+        # Min-heap of [citation_count, scan_index, paper], checkpointed with the position
+        state: dict = {}
+
+        with s2_priority(RequestPriority.WORKFLOW, session=session):
+            papers = self.s2_tools.iter_bulk_search(
+                query,
+                year_range=year_range,
+                fields_of_study=fields_of_study,
+                open_access_only=open_access_only,
+                max_results=max_results,
+                checkpoint_path=checkpoint_path,
+                checkpoint_state=state,
+            )
+            async with aclosing(papers):
+                async for paper in papers:
+                    top = state.setdefault("top", [])
+                    scanned = state.get("scanned", 0)
+                    item = [paper.get("citation_count") or 0, scanned, paper]
+                    if len(top) < top_k:
+                        heapq.heappush(top, item)
+                    else:
+                        heapq.heappushpop(top, item)
+                    state["scanned"] = scanned + 1
+
+        logger.info(f"Swept {state.get('scanned', 0)} papers for '{query}'")
+        top = sorted(state.get("top", []), key=lambda item: item[:2], reverse=True)
+        return [paper for _, _, paper in top]
+
     def _generate_recommendations(
         self, frontier_papers: List[Dict], application_papers: List[Dict], max_count: int
     ) -> List[ResearchRecommendation]:
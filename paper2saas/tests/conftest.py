@@ -1,7 +1,24 @@
 """Shared pytest fixtures for Paper2SaaS tests."""
 
+from unittest.mock import AsyncMock, patch
+
+import httpx
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+
+from paper2saas.tools import SemanticScholarTools
+from paper2saas.tools.http_client import S2AsyncClient
+from paper2saas.tools.s2_replay import ReplayTransport
+from paper2saas.tools.s2_synthetic import SyntheticS2Backend
+
+
+@pytest.fixture(autouse=True)
+def reset_s2_client_registry():
+    """Give every test a fresh process-wide S2 client registry."""
+    from paper2saas.tools.client_registry import get_client_registry
+
+    get_client_registry().clear()
+    yield
+    get_client_registry().clear()
 
 
 @pytest.fixture
@@ -18,6 +35,40 @@ def mock_s2_config():
     )
 
 
+@pytest.fixture
+def mock_s2_client(mock_s2_config):
+    """Build S2AsyncClients whose requests are answered by an httpx handler."""
+
+    def make(handler, config=None):
+        return S2AsyncClient(config or mock_s2_config, transport=httpx.MockTransport(handler))
+
+    return make
+
+
+@pytest.fixture
+def mock_s2_tools(mock_s2_client):
+    """Build SemanticScholarTools on top of a mock_s2_client."""
+
+    def make(handler, config=None):
+        return SemanticScholarTools(client=mock_s2_client(handler, config))
+
+    return make
+
+
+@pytest.fixture
+def synthetic_s2(mock_s2_config):
+    """Build (backend, tools) pairs served by an in-process SyntheticS2Backend."""
+
+    def make(**backend_options):
+        backend = SyntheticS2Backend(**backend_options)
+        mock_s2_config.base_url = "http://synthetic/graph/v1"
+        mock_s2_config.recommendations_url = "http://synthetic/recommendations/v1"
+        client = S2AsyncClient(mock_s2_config, transport=ReplayTransport(backend))
+        return backend, SemanticScholarTools(client=client)
+
+    return make
+
+
 @pytest.fixture
 def mock_http_response():
     """Create a mock HTTP response."""
@@ -1,7 +1,16 @@
 """Tests for Semantic Scholar tools and HTTP client"""
 
+import asyncio
+import json
+from contextlib import aclosing
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+
+from paper2saas.tools import BulkSearchCheckpoint
+from paper2saas.tools.http_client import is_retryable
+from paper2saas.tools.paper_store import normalize_paper_id
 
 
 class TestS2Config:
@@ -120,3 +129,1896 @@ class TestS2AsyncClient:
         
         assert key1 == key2  # Same inputs = same key
         assert key1 != key3  # Different inputs = different key
+
+
+class TestCacheBackends:
+    """Tests for S2 response cache backends"""
+
+    def test_memory_cache_expiry(self):
+        """Entries should expire after their TTL."""
+        from paper2saas.tools.s2_cache import MemoryCache
+
+        cache = MemoryCache(maxsize=10, ttl=60)
+        cache.set("fresh", {"a": 1})
+        cache.set("expired", {"b": 2}, ttl=-1)
+
+        assert cache.get("fresh") == {"a": 1}
+        assert cache.get("expired") is None
+
+    def test_memory_cache_lru_eviction(self):
+        """Least recently used entries should be evicted first."""
+        from paper2saas.tools.s2_cache import MemoryCache
+
+        cache = MemoryCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+    def test_sqlite_cache_shared_across_instances(self, tmp_path):
+        """SQLite entries should be visible to other instances on the same file."""
+        from paper2saas.tools.s2_cache import SQLiteCache
+
+        path = str(tmp_path / "cache.db")
+        writer = SQLiteCache(path, ttl=60)
+        writer.set("paper", {"paperId": "p1", "title": "Test"})
+
+        reader = SQLiteCache(path, ttl=60)
+        assert reader.get("paper") == {"paperId": "p1", "title": "Test"}
+
+        writer.set("stale", {"x": 1}, ttl=-1)
+        assert reader.get("stale") is None
+
+    def test_sqlite_cache_size_eviction(self, tmp_path):
+        """SQLite cache should evict old entries when over its byte budget."""
+        import os
+
+        from paper2saas.tools.s2_cache import SQLiteCache
+
+        cache = SQLiteCache(str(tmp_path / "cache.db"), ttl=60, max_bytes=3000)
+        for i in range(5):
+            cache.set(f"k{i}", {"blob": os.urandom(600).hex()})
+
+        assert cache.get("k4") is not None
+        assert cache.get("k0") is None
+
+    def test_sqlite_reads_buffer_access_times(self, tmp_path):
+        """Reads should not write; buffered access times still steer LRU eviction."""
+        import os
+
+        from paper2saas.tools.s2_cache import SQLiteCache
+
+        cache = SQLiteCache(str(tmp_path / "cache.db"), ttl=60, max_bytes=3000)
+        for i in range(4):
+            cache.set(f"k{i}", {"blob": os.urandom(600).hex()})
+
+        writes = cache._conn.total_changes
+        assert cache.get("k0") is not None
+        assert cache._conn.total_changes == writes
+
+        cache.set("k4", {"blob": os.urandom(600).hex()})
+        assert cache.get("k0") is not None
+        assert cache.get("k1") is None
+
+    def test_client_uses_configured_backend(self, mock_s2_config, tmp_path):
+        """S2AsyncClient should build the backend selected in S2Config."""
+        from paper2saas.tools.http_client import S2AsyncClient
+        from paper2saas.tools.s2_cache import SQLiteCache
+
+        mock_s2_config.cache_backend = "sqlite"
+        mock_s2_config.cache_path = str(tmp_path / "s2.db")
+
+        client = S2AsyncClient(config=mock_s2_config)
+
+        assert isinstance(client._cache, SQLiteCache)
+
+    def test_backend_interface_is_abstract(self):
+        """Backends missing required methods should not be instantiable."""
+        from paper2saas.tools.s2_cache import CacheBackend
+
+        class Partial(CacheBackend):
+            def get(self, key):
+                return None
+
+        with pytest.raises(TypeError):
+            Partial()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_cache_used_off_event_loop(self, mock_s2_config, tmp_path):
+        """The client should read and write a SQLite cache from a worker thread."""
+        import asyncio
+
+        import httpx
+
+        from paper2saas.tools.http_client import S2AsyncClient
+
+        mock_s2_config.cache_backend = "sqlite"
+        mock_s2_config.cache_path = str(tmp_path / "s2.db")
+        client = S2AsyncClient(config=mock_s2_config)
+        client._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda r: httpx.Response(200, json={"paperId": "p1"}))
+        )
+        on_loop = []
+        for name in ("get_stale", "set"):
+            method = getattr(client._cache, name)
+
+            def record(*args, _method=method, **kwargs):
+                try:
+                    on_loop.append(asyncio.get_running_loop() is not None)
+                except RuntimeError:
+                    on_loop.append(False)
+                return _method(*args, **kwargs)
+
+            setattr(client._cache, name, record)
+
+        await client.get("paper/p1", fields="paperId")
+        assert await client.get("paper/p1", fields="paperId") == {"paperId": "p1"}
+
+        assert on_loop == [False, False, False]
+        await client.close()
+
+
+class TestRequestCoalescing:
+    """Tests for single-flight coalescing in S2AsyncClient"""
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_requests_hit_network_once(self, mock_s2_client):
+        """Concurrent identical GETs should share one network request."""
+        calls = []
+
+        async def handler(request):
+            calls.append(str(request.url))
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"data": [{"paperId": "p1"}]})
+
+        client = mock_s2_client(handler)
+
+        results = await asyncio.gather(
+            *[client.get("paper/abc/citations", fields="paperId", limit=500) for _ in range(4)]
+        )
+
+        assert len(calls) == 1
+        assert all(r == {"data": [{"paperId": "p1"}]} for r in results)
+
+        stats = client.get_stats()
+        assert stats["requests"] == 4
+        assert stats["coalesced"] == 3
+        assert stats["network_requests"] == 1
+        assert stats["inflight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_different_params_are_not_coalesced(self, mock_s2_client):
+        """Requests with different parameters should each go to the network."""
+        calls = []
+
+        async def handler(request):
+            calls.append(str(request.url))
+            return httpx.Response(200, json={"data": []})
+
+        client = mock_s2_client(handler)
+
+        await asyncio.gather(
+            client.get("paper/abc/citations", limit=10),
+            client.get("paper/abc/citations", limit=20),
+        )
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_request(self, mock_s2_client):
+        """Cancelling one waiter should leave the shared request running for others."""
+
+        async def handler(request):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"ok": True})
+
+        client = mock_s2_client(handler)
+
+        first = asyncio.create_task(client.get("paper/abc"))
+        second = asyncio.create_task(client.get("paper/abc"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == {"ok": True}
+
+
+class TestCitationSnapshot:
+    """Tests for snapshot-based lineage views"""
+
+    @staticmethod
+    def _citation_edges(count, start_year=2015):
+        return [
+            {
+                "citingPaper": {
+                    "paperId": f"c{i}",
+                    "title": "A practical framework" if i % 3 == 0 else f"Theory {i}",
+                    "year": start_year + i % 12,
+                    "authors": [{"name": "Author"}],
+                    "citationCount": i,
+                },
+                "isInfluential": i % 4 == 0,
+                "contexts": [],
+                "intents": ["methodology"] if i % 5 == 0 else [],
+            }
+            for i in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_snapshot_paginates(self, mock_s2_tools, mock_s2_config):
+        """Snapshot should follow `next` offsets until the list is exhausted."""
+        edges = self._citation_edges(25)
+        mock_s2_config.page_size = 10
+
+        def handler(request):
+            offset = int(request.url.params["offset"])
+            limit = int(request.url.params["limit"])
+            body = {"offset": offset, "data": edges[offset : offset + limit]}
+            if offset + limit < len(edges):
+                body["next"] = offset + limit
+            return httpx.Response(200, json=body)
+
+        tools = mock_s2_tools(handler)
+        snapshot = await tools.get_citation_snapshot("seed")
+
+        assert len(snapshot) == 25
+        assert snapshot.complete
+        assert tools.client.get_stats()["network_requests"] == 3
+
+    @pytest.mark.asyncio
+    async def test_snapshot_respects_limit(self, mock_s2_tools, mock_s2_config):
+        """Snapshot should stop at citation_snapshot_limit and mark itself incomplete."""
+        edges = self._citation_edges(50)
+        mock_s2_config.page_size = 10
+        mock_s2_config.citation_snapshot_limit = 20
+
+        def handler(request):
+            offset = int(request.url.params["offset"])
+            limit = int(request.url.params["limit"])
+            return httpx.Response(
+                200, json={"data": edges[offset : offset + limit], "next": offset + limit}
+            )
+
+        tools = mock_s2_tools(handler)
+        snapshot = await tools.get_citation_snapshot("seed")
+
+        assert len(snapshot) == 20
+        assert not snapshot.complete
+
+    @pytest.mark.asyncio
+    async def test_lineage_fetches_citations_once(self, mock_s2_tools):
+        """build_research_lineage should derive all citation views from one fetch."""
+        edges = self._citation_edges(40)
+        paths = []
+
+        def handler(request):
+            path = request.url.path
+            paths.append(path)
+            if path.endswith("/citations"):
+                return httpx.Response(200, json={"data": edges})
+            if path.endswith("/references"):
+                return httpx.Response(200, json={"data": []})
+            if "recommendations" in str(request.url):
+                return httpx.Response(200, json={"recommendedPapers": []})
+            if path.endswith("/paper/batch"):
+                return httpx.Response(200, json=[{"paperId": "seed", "title": "Seed"}])
+            return httpx.Response(200, json={"paperId": "seed", "title": "Seed"})
+
+        tools = mock_s2_tools(handler)
+        lineage = await tools.build_research_lineage("seed")
+
+        assert sum(p.endswith("/citations") for p in paths) == 1
+        assert len(paths) == 4
+        assert lineage["target_paper"]["id"] == "seed"
+        assert len(lineage["derivatives"]) == 10
+        assert lineage["applications"]
+        assert all(p["is_influential"] for p in lineage["highly_influential"])
+        assert len(lineage["highly_influential"]) == 5
+
+    @staticmethod
+    def _paged_handler(edges, requests):
+        def handler(request):
+            offset = int(request.url.params["offset"])
+            limit = int(request.url.params["limit"])
+            requests.append((offset, limit))
+            body = {"offset": offset, "data": edges[offset : offset + limit]}
+            if offset + limit < len(edges):
+                body["next"] = offset + limit
+            return httpx.Response(200, json=body)
+
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_refresh_pages_only_until_known_citations(self, mock_s2_tools, mock_s2_config):
+        """A stale snapshot should fetch only the newest page and merge the new edges in front."""
+        edges = self._citation_edges(250)
+        requests = []
+        mock_s2_config.snapshot_refresh_page_size = 10
+        tools = mock_s2_tools(self._paged_handler(edges, requests))
+
+        await tools.get_citation_snapshot("seed")
+        assert await tools.get_citation_snapshot("seed") is not None
+        assert len(requests) == 1  # The second call used the fresh stored snapshot
+
+        # Three new citing papers appear at the top of S2's newest-first list
+        edges[:0] = [
+            {"citingPaper": {"paperId": f"new{i}", "title": "New", "year": 2025}} for i in range(3)
+        ]
+        snapshot = await tools.get_citation_snapshot("seed", refresh=True)
+
+        assert requests[1:] == [(0, 10)]
+        assert len(snapshot) == 253
+        assert [e["citingPaper"]["paperId"] for e in snapshot.edges[:4]] == [
+            "new0",
+            "new1",
+            "new2",
+            "c0",
+        ]
+        stats = tools.client.get_stats()["snapshots"]
+        assert stats["refreshed"] == 1 and stats["new_edges"] == 3
+
+    @pytest.mark.asyncio
+    async def test_refresh_refetches_when_order_changes(self, mock_s2_tools, mock_s2_config):
+        """A known paper other than the newest showing up first should force a full refetch."""
+        edges = self._citation_edges(25)
+        requests = []
+        mock_s2_config.page_size = 10
+        mock_s2_config.snapshot_refresh_page_size = 10
+        tools = mock_s2_tools(self._paged_handler(edges, requests))
+        await tools.get_citation_snapshot("seed")
+
+        # Not newest first: a new citing paper is listed behind an older known one
+        edges.insert(0, edges.pop(5))
+        edges.insert(1, {"citingPaper": {"paperId": "new0", "title": "New", "year": 2025}})
+        snapshot = await tools.get_citation_snapshot("seed", refresh=True)
+
+        assert len(snapshot) == 26
+        assert "new0" in snapshot.citing_ids()
+        stats = tools.client.get_stats()["snapshots"]
+        assert stats["fetched"] == 2 and stats["refreshed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_sqlite_snapshot_store_used_off_event_loop(
+        self, mock_s2_tools, mock_s2_config, tmp_path
+    ):
+        """A SQLite snapshot store should be read and written from a worker thread."""
+        mock_s2_config.snapshot_backend = "sqlite"
+        mock_s2_config.snapshot_path = str(tmp_path / "snapshots.db")
+        tools = mock_s2_tools(self._paged_handler(self._citation_edges(5), []))
+        backend = tools.client.snapshots.backend
+        on_loop = []
+        for name in ("get", "set"):
+            method = getattr(backend, name)
+
+            def record(*args, _method=method, **kwargs):
+                try:
+                    on_loop.append(asyncio.get_running_loop() is not None)
+                except RuntimeError:
+                    on_loop.append(False)
+                return _method(*args, **kwargs)
+
+            setattr(backend, name, record)
+
+        await tools.get_citation_snapshot("seed")
+        await tools.get_citation_snapshot("seed")
+
+        assert on_loop == [False, False, False]
+        await tools.close()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_snapshots_survive_restarts(self, mock_s2_tools, mock_s2_config, tmp_path):
+        """Snapshots stored in SQLite should be reused by a new client without requests."""
+        edges = self._citation_edges(30)
+        requests = []
+        mock_s2_config.share_client = False
+        mock_s2_config.snapshot_backend = "sqlite"
+        mock_s2_config.snapshot_path = str(tmp_path / "snapshots.db")
+
+        first = mock_s2_tools(self._paged_handler(edges, requests))
+        await first.get_citation_snapshot("seed")
+        await first.close()
+
+        second = mock_s2_tools(self._paged_handler(edges, requests))
+        snapshot = await second.get_citation_snapshot("seed")
+
+        assert len(requests) == 1
+        assert len(snapshot) == 30 and snapshot.complete
+        await second.close()
+
+
+class TestPaperBatchLoader:
+    """Tests for auto-batching of get_paper calls"""
+
+    @staticmethod
+    def _batch_handler(requests):
+        import json
+
+        import httpx
+
+        def handler(request):
+            ids = json.loads(request.content)["ids"]
+            requests.append(ids)
+            return httpx.Response(
+                200,
+                json=[None if i == "missing" else {"paperId": i, "title": i} for i in ids],
+            )
+
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_concurrent_get_paper_calls_share_one_batch(self, mock_s2_tools):
+        """get_paper calls within the batch window should become one paper/batch POST."""
+        requests = []
+        tools = mock_s2_tools(self._batch_handler(requests))
+
+        papers = await asyncio.gather(*(tools.get_paper(f"p{i}") for i in range(8)))
+
+        assert len(requests) == 1
+        assert sorted(requests[0]) == [f"p{i}" for i in range(8)]
+        assert [p["id"] for p in papers] == [f"p{i}" for i in range(8)]
+
+    @pytest.mark.asyncio
+    async def test_batch_results_prime_paper_cache(self, mock_s2_tools):
+        """Papers fetched in a batch should be served from cache afterwards."""
+        requests = []
+        tools = mock_s2_tools(self._batch_handler(requests))
+
+        await tools.batch_get_papers(["a", "b"])
+        paper = await tools.get_paper("a")
+
+        assert len(requests) == 1
+        assert paper["id"] == "a"
+        assert tools.paper_loader.stats["cache_hits"] == 1
+        # Loader hits count towards the client's hit rate too
+        assert tools.client.get_stats()["cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_sqlite_cache_used_off_event_loop(self, mock_s2_tools, mock_s2_config, tmp_path):
+        """Loader cache peeks and primes should not touch SQLite on the event loop."""
+        mock_s2_config.cache_backend = "sqlite"
+        mock_s2_config.cache_path = str(tmp_path / "s2.db")
+        tools = mock_s2_tools(self._batch_handler([]))
+        on_loop = []
+        for name in ("get_stale", "set"):
+            method = getattr(tools.client._cache, name)
+
+            def record(*args, _method=method, **kwargs):
+                try:
+                    on_loop.append(asyncio.get_running_loop() is not None)
+                except RuntimeError:
+                    on_loop.append(False)
+                return _method(*args, **kwargs)
+
+            setattr(tools.client._cache, name, record)
+
+        await tools.batch_get_papers(["a", "b"])
+        await tools.get_paper("a")
+
+        assert on_loop and not any(on_loop)
+        await tools.close()
+
+    @pytest.mark.asyncio
+    async def test_batch_size_cap_and_missing_ids(self, mock_s2_tools, mock_s2_config):
+        """Loads beyond batch_size should split, and unknown ids should be dropped."""
+        requests = []
+        mock_s2_config.batch_size = 3
+        tools = mock_s2_tools(self._batch_handler(requests))
+
+        papers = await tools.batch_get_papers(["a", "b", "missing", "c", "d"])
+
+        assert [len(r) for r in requests] == [3, 2]
+        assert [p["id"] for p in papers] == ["a", "b", "c", "d"]
+        assert await tools.get_paper("missing") == {}
+
+    @pytest.mark.asyncio
+    async def test_loads_on_separate_loops_batch_separately(self, mock_s2_tools):
+        """Loads from another event loop should get their own batch and flush timer."""
+        requests = []
+        tools = mock_s2_tools(self._batch_handler(requests))
+        loader = tools.paper_loader
+
+        def load_on_new_loop():
+            return asyncio.run(asyncio.wait_for(loader.load("b"), timeout=5))
+
+        here, other = await asyncio.wait_for(
+            asyncio.gather(loader.load("a"), asyncio.to_thread(load_on_new_loop)), timeout=5
+        )
+
+        assert (here["paperId"], other["paperId"]) == ("a", "b")
+        assert sorted(requests) == [["a"], ["b"]]
+
+
+class TestPaginatedIterators:
+    """Tests for iter_citations / iter_references"""
+
+    @staticmethod
+    def _paged_handler(total, requested):
+        import httpx
+
+        def handler(request):
+            offset = int(request.url.params["offset"])
+            limit = int(request.url.params["limit"])
+            requested.append(offset)
+            key = "citingPaper" if request.url.path.endswith("/citations") else "citedPaper"
+            end = min(offset + limit, total)
+            body = {
+                "offset": offset,
+                "data": [{key: {"paperId": f"p{i}", "year": 2024}} for i in range(offset, end)],
+            }
+            if end < total:
+                body["next"] = end
+            return httpx.Response(200, json=body)
+
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_iter_citations_yields_all_pages(self, mock_s2_tools, mock_s2_config):
+        """Iteration should follow `next` until the last page."""
+        requested = []
+        mock_s2_config.page_size = 10
+        tools = mock_s2_tools(self._paged_handler(35, requested))
+
+        ids = [p["id"] async for p in tools.iter_citations("seed")]
+
+        assert ids == [f"p{i}" for i in range(35)]
+        assert requested == [0, 10, 20, 30]
+
+    @pytest.mark.asyncio
+    async def test_early_stop_fetches_at_most_one_extra_page(self, mock_s2_tools, mock_s2_config):
+        """Stopping early should not walk the remaining pages."""
+        requested = []
+        mock_s2_config.page_size = 10
+        tools = mock_s2_tools(self._paged_handler(10_000, requested))
+
+        top = []
+        async with aclosing(tools.iter_references("seed")) as papers:
+            async for paper in papers:
+                top.append(paper)
+                if len(top) == 5:
+                    break
+
+        assert len(top) == 5
+        assert len(requested) <= 2
+
+    @pytest.mark.asyncio
+    async def test_max_results_caps_requests(self, mock_s2_tools, mock_s2_config):
+        """max_results should bound both yielded items and page requests."""
+        requested = []
+        mock_s2_config.page_size = 10
+        tools = mock_s2_tools(self._paged_handler(100, requested))
+
+        papers = [p async for p in tools.iter_citations("seed", max_results=25)]
+
+        assert len(papers) == 25
+        assert requested == [0, 10, 20]
+
+
+class TestAdaptiveRateLimiter:
+    """Tests for the server-feedback-driven rate limiter"""
+
+    def test_throttle_decreases_rate_and_honours_retry_after(self):
+        """A 429 should halve the rate and pause callers for Retry-After."""
+        import time
+
+        import httpx
+
+        from paper2saas.tools.rate_limit import AdaptiveRateLimiter
+
+        limiter = AdaptiveRateLimiter(rate=10.0, max_rate=20.0, min_rate=1.0)
+        limiter.observe(httpx.Response(429, headers={"Retry-After": "2"}))
+
+        assert limiter.current_rate == 5.0
+        assert limiter.blocked_until >= time.time() + 1.5
+        assert limiter.stats["throttled"] == 1
+
+    def test_success_increases_rate_up_to_ceiling(self):
+        """Successful responses should additively raise the rate, capped at max_rate."""
+        import httpx
+
+        from paper2saas.tools.rate_limit import AdaptiveRateLimiter
+
+        limiter = AdaptiveRateLimiter(rate=1.0, max_rate=2.0, increase_step=0.5)
+        for _ in range(5):
+            limiter.observe(httpx.Response(200))
+
+        assert limiter.current_rate == 2.0
+
+    def test_rate_never_drops_below_floor(self):
+        """Repeated 429s should stop at min_rate."""
+        import httpx
+
+        from paper2saas.tools.rate_limit import AdaptiveRateLimiter
+
+        limiter = AdaptiveRateLimiter(rate=1.0, min_rate=0.25)
+        for _ in range(10):
+            limiter.observe(httpx.Response(429, headers={"Retry-After": "0"}))
+
+        assert limiter.current_rate == 0.25
+
+    def test_exhausted_quota_header_pauses(self):
+        """X-RateLimit-Remaining: 0 should pause until the reset time."""
+        import time
+
+        import httpx
+
+        from paper2saas.tools.rate_limit import AdaptiveRateLimiter
+
+        limiter = AdaptiveRateLimiter(rate=5.0)
+        limiter.observe(
+            httpx.Response(200, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "3"})
+        )
+
+        assert limiter.blocked_until >= time.time() + 2.5
+
+    @pytest.mark.asyncio
+    async def test_client_reports_limiter_state(self, mock_s2_config):
+        """Client stats should expose current rate and queue depth."""
+        import httpx
+
+        from paper2saas.tools.http_client import S2AsyncClient
+
+        def handler(request):
+            return httpx.Response(429, headers={"Retry-After": "0"})
+
+        mock_s2_config.max_requests_per_second = 100.0
+        client = S2AsyncClient(config=mock_s2_config)
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await client._send("GET", "https://example.test/paper/x", False)
+
+        stats = client.get_stats()["rate_limiter"]
+        assert stats["current_rate"] < 100.0
+        assert stats["queue_depth"] == 0
+
+    def test_api_key_configures_limiter_before_client(self):
+        """Keyed toolkits should build their client with the raised limits."""
+        from paper2saas.tools import SemanticScholarTools
+        from paper2saas.tools.s2_config import S2Config
+
+        tools = SemanticScholarTools(config=S2Config(api_key="key"))
+
+        assert tools.client.rate_limiter.current_rate == 1.0
+        assert tools.client.rate_limiter.max_rate == 100.0
+
+
+class TestSharedRateLimiter:
+    """Tests for the SQLite-backed cross-process rate limiter"""
+
+    @pytest.mark.asyncio
+    async def test_limiters_on_same_bucket_share_budget(self, tmp_path):
+        """Two limiters on one bucket should pace requests as a single budget."""
+        import time
+
+        from paper2saas.tools.rate_limit import SharedRateLimiter
+
+        path = str(tmp_path / "limits.db")
+        first = SharedRateLimiter(path, "s2", rate=20.0)
+        second = SharedRateLimiter(path, "s2", rate=20.0)
+
+        start = time.time()
+        for _ in range(5):
+            await first.acquire()
+            await second.acquire()
+        elapsed = time.time() - start
+
+        # 10 tokens at 20/s from a bucket starting with 1 token
+        assert elapsed >= 0.4
+
+    @pytest.mark.asyncio
+    async def test_throttle_is_shared(self, tmp_path):
+        """A 429 seen by one limiter should lower the rate for every limiter."""
+        import httpx
+
+        from paper2saas.tools.rate_limit import SharedRateLimiter
+
+        path = str(tmp_path / "limits.db")
+        first = SharedRateLimiter(path, "s2", rate=10.0, min_rate=1.0)
+        second = SharedRateLimiter(path, "s2", rate=10.0, min_rate=1.0)
+
+        first.observe(httpx.Response(429, headers={"Retry-After": "0.05"}))
+        await second.acquire()
+
+        assert second.current_rate == 5.0
+
+    @pytest.mark.asyncio
+    async def test_feedback_keeps_refill(self, tmp_path):
+        """Success feedback should not discard tokens refilled since the last write."""
+        import time
+
+        import httpx
+
+        from paper2saas.tools.rate_limit import SharedRateLimiter
+
+        limiter = SharedRateLimiter(str(tmp_path / "limits.db"), "s2", rate=10.0)
+        assert limiter._reserve() == 0.0
+
+        time.sleep(0.2)  # Two tokens refill
+        await limiter.observe_async(httpx.Response(200))
+
+        assert limiter._reserve() == 0.0
+
+    def test_success_at_max_rate_skips_write(self, tmp_path):
+        """Success feedback should only write while the shared rate can still grow."""
+        from paper2saas.tools.rate_limit import SharedRateLimiter
+
+        limiter = SharedRateLimiter(
+            str(tmp_path / "limits.db"), "s2", rate=5.0, max_rate=5.5, increase_step=1.0
+        )
+
+        writes = limiter._conn.total_changes
+        limiter.on_success()
+        assert limiter._conn.total_changes == writes + 1
+        assert limiter.current_rate == 5.5
+
+        limiter.on_success()
+        assert limiter._conn.total_changes == writes + 1
+
+    def test_separate_buckets_are_independent(self, tmp_path):
+        """Different bucket names should not share state."""
+        from paper2saas.tools.rate_limit import SharedRateLimiter
+
+        path = str(tmp_path / "limits.db")
+        first = SharedRateLimiter(path, "a", rate=10.0, min_rate=1.0)
+        second = SharedRateLimiter(path, "b", rate=10.0, min_rate=1.0)
+
+        first.on_throttle(0)
+        second._reserve()
+
+        assert second.current_rate == 10.0
+
+    def test_client_selects_shared_backend(self, mock_s2_config, tmp_path):
+        """S2AsyncClient should build shared limiters when configured."""
+        from paper2saas.tools.http_client import S2AsyncClient
+        from paper2saas.tools.rate_limit import SharedRateLimiter
+
+        mock_s2_config.rate_limit_backend = "sqlite"
+        mock_s2_config.rate_limit_path = str(tmp_path / "limits.db")
+
+        client = S2AsyncClient(config=mock_s2_config)
+
+        assert isinstance(client.rate_limiter, SharedRateLimiter)
+        assert client.rate_limiter.name != client.search_limiter.name
+
+
+class TestClientRegistry:
+    """Tests for the process-wide shared S2 client registry"""
+
+    def test_toolkits_share_one_client(self, mock_s2_config):
+        """Toolkits with the same base_url/api_key should share a client."""
+        from paper2saas.tools import SemanticScholarTools
+        from paper2saas.tools.s2_config import S2Config
+
+        first = SemanticScholarTools(config=mock_s2_config)
+        second = SemanticScholarTools(config=S2Config(api_key=None))
+        keyed = SemanticScholarTools(config=S2Config(api_key="other"))
+
+        assert first.client is second.client
+        assert keyed.client is not first.client
+
+    @pytest.mark.asyncio
+    async def test_release_keeps_client_warm(self, mock_s2_config):
+        """Releasing the last reference closes connections but keeps the cache."""
+        from paper2saas.tools import SemanticScholarTools
+        from paper2saas.tools.client_registry import get_client_registry
+
+        idle = []
+        get_client_registry().add_hook("idle", idle.append)
+
+        first = SemanticScholarTools(config=mock_s2_config)
+        second = SemanticScholarTools(config=mock_s2_config)
+        await first.client.prime("paper/p1", {"paperId": "p1"}, fields="paperId")
+
+        await first.close()
+        await first.close()  # idempotent
+        assert idle == []
+
+        await second.close()
+        assert idle == [second.client]
+
+        third = SemanticScholarTools(config=mock_s2_config)
+        assert third.client is first.client
+        assert await third.client.peek("paper/p1", fields="paperId") == {"paperId": "p1"}
+        assert get_client_registry().stats()[0]["refs"] == 1
+
+    @pytest.mark.asyncio
+    async def test_acquire_during_release_gets_fresh_pool(self, mock_s2_config):
+        """A client acquired while the last release closes its pool should stay usable."""
+        import asyncio
+
+        from paper2saas.tools import SemanticScholarTools
+        from paper2saas.tools.client_registry import get_client_registry
+
+        tools = SemanticScholarTools(config=mock_s2_config)
+        old_pool = await tools.client._get_client()
+
+        release = asyncio.ensure_future(tools.close())
+        await asyncio.sleep(0)
+        reused = get_client_registry().acquire(mock_s2_config)
+        await release
+
+        assert reused is tools.client
+        assert old_pool.is_closed
+        assert not (await reused._get_client()).is_closed
+        await get_client_registry().release(reused)
+
+    def test_sync_wrapper_close_releases_client(self, mock_s2_config):
+        """Closing the sync wrapper should drop its registry reference."""
+        from paper2saas.tools import SemanticScholarToolsSync
+        from paper2saas.tools.client_registry import get_client_registry
+
+        with SemanticScholarToolsSync(config=mock_s2_config):
+            assert get_client_registry().stats()[0]["refs"] == 1
+
+        assert get_client_registry().stats()[0]["refs"] == 0
+
+    def test_unshared_client_opt_out(self, mock_s2_config):
+        """share_client=False should give the toolkit a private client."""
+        from paper2saas.tools import SemanticScholarTools
+
+        mock_s2_config.share_client = False
+        first = SemanticScholarTools(config=mock_s2_config)
+        second = SemanticScholarTools(config=mock_s2_config)
+
+        assert first.client is not second.client
+
+
+class TestBackgroundLoop:
+    """Tests for the persistent background event loop"""
+
+    def test_run_reuses_one_loop(self):
+        """Successive sync calls should run on the same long-lived loop."""
+        import asyncio
+
+        from paper2saas.tools.background_loop import BackgroundLoop
+
+        runner = BackgroundLoop(name="test-loop")
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        try:
+            assert runner.run(current_loop()) is runner.run(current_loop())
+        finally:
+            runner.stop()
+
+    def test_run_from_loop_thread_raises(self):
+        """Blocking on the loop from its own thread should fail instead of deadlocking."""
+        from paper2saas.tools.background_loop import BackgroundLoop
+
+        runner = BackgroundLoop(name="test-loop")
+
+        async def nested():
+            async def noop():
+                return 1
+
+            return runner.run(noop())
+
+        try:
+            with pytest.raises(RuntimeError):
+                runner.run(nested())
+        finally:
+            runner.stop()
+
+    def test_sync_wrappers_keep_connection_pool_warm(self, mock_s2_config):
+        """Sync tool calls should reuse one httpx client across calls."""
+        import httpx
+
+        from paper2saas.tools import SemanticScholarTools
+
+        def handler(request):
+            return httpx.Response(200, json=[{"paperId": "p1", "title": "One"}])
+
+        mock_s2_config.auto_batch = True
+        tools = SemanticScholarTools(config=mock_s2_config)
+        tools.client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        pool = tools.client._client
+
+        tools.get_paper_sync("p1")
+        tools.client._cache.clear()
+        tools.get_paper_sync("p1")
+
+        assert tools.client._client is pool
+        assert tools.client.get_stats()["network_requests"] == 2
+
+    @pytest.mark.asyncio
+    async def test_sync_wrapper_inside_running_loop(self, mock_s2_config):
+        """Sync wrappers should also work when called from inside an event loop."""
+        import httpx
+
+        from paper2saas.tools import SemanticScholarToolsSync
+
+        def handler(request):
+            return httpx.Response(200, json=[{"paperId": "p1", "title": "One"}])
+
+        sync_tools = SemanticScholarToolsSync(config=mock_s2_config)
+        sync_tools._async_tools.client._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+
+        assert sync_tools.get_paper("p1")["id"] == "p1"
+
+
+class TestPaperEntityCache:
+    """Tests for the per-paperId entity cache"""
+
+    def test_ingest_merges_field_sets(self):
+        """Records from different endpoints should merge into one entity."""
+        from paper2saas.tools.paper_store import PaperEntityCache
+
+        cache = PaperEntityCache()
+        cache.ingest({"data": [{"citingPaper": {"paperId": "p1", "title": "T", "year": 2024}}]})
+        cache.ingest({"recommendedPapers": [{"paperId": "p1", "abstract": "A"}]})
+
+        assert cache.lookup("p1", "paperId,title,year,abstract") == {
+            "paperId": "p1",
+            "title": "T",
+            "year": 2024,
+            "abstract": "A",
+        }
+        assert cache.lookup("p1", "paperId,venue") is None
+
+    def test_external_id_aliases(self):
+        """Papers should be reachable by their prefixed external IDs."""
+        from paper2saas.tools.paper_store import PaperEntityCache
+
+        cache = PaperEntityCache()
+        cache.ingest([{"paperId": "p1", "title": "T", "externalIds": {"ArXiv": "1706.03762"}}])
+
+        assert cache.lookup("arXiv:1706.03762", "title")["paperId"] == "p1"
+        assert cache.lookup("ARXIV:1706.03762", "title")["paperId"] == "p1"
+
+    @pytest.mark.asyncio
+    async def test_get_paper_served_from_search_results(self, mock_s2_config):
+        """get_paper should not hit the network for a paper already seen in a search."""
+        import httpx
+
+        from paper2saas.tools import SemanticScholarTools
+        from paper2saas.tools.paper_store import parse_fields
+
+        paths = []
+        full_paper = dict.fromkeys(parse_fields(mock_s2_config.paper_fields))
+        full_paper.update(paperId="p1", title="Found by search")
+
+        def handler(request):
+            paths.append(request.url.path)
+            return httpx.Response(200, json={"data": [full_paper]})
+
+        tools = SemanticScholarTools(config=mock_s2_config)
+        tools.client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        await tools.search_papers("query")
+        papers = await tools.batch_get_papers(["p1"])
+        paper = await tools.get_paper("p1")
+
+        assert paths == ["/graph/v1/paper/search"]
+        assert papers[0]["title"] == "Found by search"
+        assert paper["title"] == "Found by search"
+        assert tools.client.get_stats()["entity_cache"]["hits"] == 2
+
+
+class TestFieldProjectionCache:
+    """Tests for field-projection-aware response caching"""
+
+    @pytest.mark.asyncio
+    async def test_subset_request_served_from_superset(self, mock_s2_client):
+        """A cached superset of fields should answer a later subset request."""
+        requested = []
+
+        def handler(request):
+            requested.append(request.url.params["fields"])
+            return httpx.Response(200, json={"data": []})
+
+        client = mock_s2_client(handler)
+
+        await client.get("paper/p1/citations", fields="paperId,title,year,contexts", limit=500)
+        await client.get("paper/p1/citations", fields="paperId,year", limit=500)
+
+        assert requested == ["paperId,title,year,contexts"]
+        assert client.get_stats()["cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_incompatible_projection_widens_entry(self, mock_s2_client):
+        """A request outside the cached projection should fetch the union of fields."""
+        requested = []
+
+        def handler(request):
+            requested.append(request.url.params["fields"])
+            return httpx.Response(200, json={"data": []})
+
+        client = mock_s2_client(handler)
+
+        await client.get("paper/p1/references", fields="paperId,title", limit=10)
+        await client.get("paper/p1/references", fields="paperId,venue", limit=10)
+        await client.get("paper/p1/references", fields="title,venue", limit=10)
+
+        assert requested == ["paperId,title", "paperId,title,venue"]
+
+    @pytest.mark.asyncio
+    async def test_peek_respects_projection(self, mock_s2_client):
+        """peek should only return entries covering the requested fields."""
+        client = mock_s2_client(None)
+        await client.prime("paper/p1", {"paperId": "p1", "title": "T"}, fields="paperId,title")
+
+        assert await client.peek("paper/p1", fields="title") == {"paperId": "p1", "title": "T"}
+        assert await client.peek("paper/p1", fields="title,abstract") is None
+
+
+class TestPostCache:
+    """Tests for content-addressed caching of idempotent POST requests"""
+
+    @pytest.mark.asyncio
+    async def test_batch_cached_across_id_order(self, mock_s2_client):
+        """The same ids in any order should hit one entry and come back in request order."""
+        calls = []
+
+        def handler(request):
+            ids = json.loads(request.content)["ids"]
+            calls.append(ids)
+            return httpx.Response(200, json=[{"paperId": i, "title": f"T{i}"} for i in ids])
+
+        client = mock_s2_client(handler)
+
+        first = await client.post("paper/batch", data={"ids": ["b", "a", "c"]}, fields="title")
+        second = await client.post("paper/batch", data={"ids": ["c", "b", "a"]}, fields="title")
+
+        assert calls == [["a", "b", "c"]]
+        assert [p["paperId"] for p in first] == ["b", "a", "c"]
+        assert [p["paperId"] for p in second] == ["c", "b", "a"]
+        assert client.get_stats()["post_cache"]["paper/batch"] == {
+            "hits": 1,
+            "misses": 1,
+            "hit_ratio": 0.5,
+        }
+
+    @pytest.mark.asyncio
+    async def test_misaligned_batch_result_raises(self, mock_s2_client):
+        """A batch result shorter than the reordered ids should not be realigned silently."""
+
+        def handler(request):
+            return httpx.Response(200, json=[{"paperId": "a"}])
+
+        client = mock_s2_client(handler)
+
+        with pytest.raises(ValueError):
+            await client.post("paper/batch", data={"ids": ["b", "a"]}, fields="title")
+
+    @pytest.mark.asyncio
+    async def test_recommendations_cached(self, mock_s2_client, mock_s2_config):
+        """Repeated recommendation requests for the same seeds should not refetch."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            return httpx.Response(200, json={"recommendedPapers": [{"paperId": "r1"}]})
+
+        client = mock_s2_client(handler)
+        body = {"positivePaperIds": ["p2", "p1"], "negativePaperIds": []}
+
+        await client.post("papers/", data=body, base_url=mock_s2_config.recommendations_url)
+        await client.post(
+            "papers/",
+            data={"positivePaperIds": ["p1", "p2"], "negativePaperIds": []},
+            base_url=mock_s2_config.recommendations_url,
+        )
+
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_unlisted_endpoint_not_cached(self, mock_s2_client):
+        """POST endpoints without a TTL policy should always hit the network."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            return httpx.Response(200, json={"ok": True})
+
+        client = mock_s2_client(handler)
+
+        await client.post("paper/other", data={"ids": ["a"]})
+        await client.post("paper/other", data={"ids": ["a"]})
+
+        assert len(calls) == 2
+        assert client.get_stats()["post_cache"] == {}
+
+
+class TestStaleWhileRevalidate:
+    """Tests for serving expired cache entries while refreshing them"""
+
+    def test_memory_cache_keeps_stale_entries(self):
+        """Expired entries should be returned by get_stale until max_stale passes."""
+        from paper2saas.tools.s2_cache import MemoryCache
+
+        cache = MemoryCache(ttl=-1, max_stale=60)
+        cache.set("k", "v")
+
+        assert cache.get("k") is None
+        assert cache.get_stale("k") == ("v", True)
+
+        cache.set("gone", "v", ttl=-120)
+        assert cache.get_stale("gone") is None
+
+    def test_sqlite_cache_keeps_stale_entries(self, tmp_path):
+        """SQLite cache should honour the stale window too."""
+        from paper2saas.tools.s2_cache import SQLiteCache
+
+        cache = SQLiteCache(path=str(tmp_path / "cache.db"), ttl=-1, max_stale=60)
+        cache.set("k", {"a": 1})
+
+        assert cache.get("k") is None
+        assert cache.get_stale("k") == ({"a": 1}, True)
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_and_refreshed(self, mock_s2_config):
+        """A stale hit should return immediately and refresh the entry in the background."""
+        import asyncio
+
+        import httpx
+
+        from paper2saas.tools.http_client import S2AsyncClient
+
+        mock_s2_config.stale_while_revalidate = True
+        mock_s2_config.cache_ttl = -1
+        counts = iter(range(10, 100))
+
+        def handler(request):
+            return httpx.Response(200, json={"paperId": "p1", "citationCount": next(counts)})
+
+        client = S2AsyncClient(config=mock_s2_config)
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        first = await client.get("paper/p1", fields="citationCount")
+        second = await client.get("paper/p1", fields="citationCount")
+        # The refresh runs on the background I/O loop
+        for _ in range(100):
+            if not client._refreshing:
+                break
+            await asyncio.sleep(0.01)
+        third = await client.get("paper/p1", fields="citationCount")
+
+        assert first["citationCount"] == 10
+        assert second["citationCount"] == 10
+        assert third["citationCount"] == 11
+        stats = client.get_stats()
+        assert stats["stale_hits"] == 2
+        assert stats["refreshes"] == 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_budget_skips_refresh(self, mock_s2_config):
+        """No refresh should start when the refresh budget is exhausted."""
+        import httpx
+
+        from paper2saas.tools.http_client import S2AsyncClient
+
+        mock_s2_config.stale_while_revalidate = True
+        mock_s2_config.cache_ttl = -1
+        mock_s2_config.stale_refresh_budget = 0
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            return httpx.Response(200, json={"paperId": "p1"})
+
+        client = S2AsyncClient(config=mock_s2_config)
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        await client.get("paper/p1", fields="paperId")
+        await client.get("paper/p1", fields="paperId")
+
+        assert len(calls) == 1
+        assert client.get_stats()["refreshes_skipped"] == 1
+
+
+class TestPriorityScheduler:
+    """Tests for priority and per-session fair scheduling of limiter tokens"""
+
+    def _slow_limiter(self):
+        import asyncio
+
+        from paper2saas.tools.rate_limit import RateLimiter
+
+        class SlowLimiter(RateLimiter):
+            async def acquire(self):
+                await asyncio.sleep(0.01)
+
+        return SlowLimiter()
+
+    @pytest.mark.asyncio
+    async def test_interactive_served_before_background(self):
+        """Queued interactive callers should be admitted ahead of earlier background ones."""
+        import asyncio
+
+        from paper2saas.tools.scheduler import PriorityScheduler, RequestPriority
+
+        scheduler = PriorityScheduler(self._slow_limiter())
+        order = []
+
+        async def call(name, priority):
+            await scheduler.acquire(priority)
+            order.append(name)
+
+        tasks = [asyncio.create_task(call(f"bg{i}", RequestPriority.BACKGROUND)) for i in range(3)]
+        tasks.append(asyncio.create_task(call("user", RequestPriority.INTERACTIVE)))
+        await asyncio.gather(*tasks)
+
+        # bg0 takes the idle scheduler; the user jumps the remaining background queue
+        assert order == ["bg0", "user", "bg1", "bg2"]
+        assert scheduler.stats == {"interactive": 1, "workflow": 0, "background": 3}
+
+    @pytest.mark.asyncio
+    async def test_sessions_round_robin(self):
+        """Sessions in the same class should alternate rather than drain in FIFO order."""
+        import asyncio
+
+        from paper2saas.tools.scheduler import PriorityScheduler, RequestPriority
+
+        scheduler = PriorityScheduler(self._slow_limiter())
+        order = []
+
+        async def call(session):
+            await scheduler.acquire(RequestPriority.WORKFLOW, session)
+            order.append(session)
+
+        sessions = ["a", "a", "a", "a", "b", "b"]
+        await asyncio.gather(*(asyncio.create_task(call(s)) for s in sessions))
+
+        assert order == ["a", "a", "b", "a", "b", "a"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_skipped(self):
+        """A caller cancelled while queued should not block the queue."""
+        import asyncio
+
+        from paper2saas.tools.rate_limit import RateLimiter
+        from paper2saas.tools.scheduler import PriorityScheduler
+
+        scheduler = PriorityScheduler(RateLimiter(rate=1000.0))
+        scheduler._busy = True
+
+        waiter = asyncio.create_task(scheduler.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+
+        scheduler._next()
+        assert scheduler._busy is False
+        await asyncio.wait_for(scheduler.acquire(), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_client_reads_priority_context(self, mock_s2_config):
+        """Requests should be admitted under the priority set by s2_priority()."""
+        import httpx
+
+        from paper2saas.tools.http_client import S2AsyncClient
+        from paper2saas.tools.scheduler import RequestPriority, s2_priority
+
+        def handler(request):
+            return httpx.Response(200, json={"paperId": "p1"})
+
+        client = S2AsyncClient(config=mock_s2_config)
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        with s2_priority(RequestPriority.WORKFLOW, session="run-1"):
+            await client.get("paper/p1")
+        await client.get("paper/p2")
+
+        assert client.rate_scheduler.stats == {"interactive": 1, "workflow": 1, "background": 0}
+
+
+class TestRetryPolicy:
+    """Tests for error classification and negative caching"""
+
+    def test_is_retryable(self):
+        """429, 5xx and network errors are retryable; other 4xx are not."""
+        request = httpx.Request("GET", "https://example.org")
+
+        def status_error(code):
+            response = httpx.Response(code, request=request)
+            return httpx.HTTPStatusError("error", request=request, response=response)
+
+        assert is_retryable(status_error(429))
+        assert is_retryable(status_error(503))
+        assert is_retryable(httpx.ConnectError("boom", request=request))
+        assert not is_retryable(status_error(404))
+        assert not is_retryable(status_error(400))
+
+    @pytest.mark.asyncio
+    async def test_not_found_is_not_retried_and_negatively_cached(self, mock_s2_client):
+        """A 404 should cost one request, and repeats should fail without I/O."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            return httpx.Response(404, json={"error": "Paper not found"})
+
+        client = mock_s2_client(handler)
+
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get("paper/ARXIV:0000.00000", fields="title")
+
+        assert len(calls) == 1
+        assert client.get_stats()["negative_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_server_error_is_retried(self, mock_s2_client):
+        """A transient 503 should be retried and the retry's result returned."""
+        responses = iter([httpx.Response(503), httpx.Response(200, json={"paperId": "p1"})])
+
+        client = mock_s2_client(lambda request: next(responses))
+
+        result = await client.get("paper/p1", fields="paperId")
+
+        assert result == {"paperId": "p1"}
+        assert client.get_stats()["network_requests"] == 2
+
+    def test_normalize_paper_id(self):
+        """Prefixes and arXiv / DOI URLs should be canonicalized."""
+        assert normalize_paper_id(" arxiv: 1706.03762 ") == "ARXIV:1706.03762"
+        assert normalize_paper_id("https://arxiv.org/abs/1706.03762v5") == "ARXIV:1706.03762v5"
+        assert normalize_paper_id("arxiv.org/pdf/1706.03762.pdf") == "ARXIV:1706.03762"
+        assert normalize_paper_id("https://doi.org/10.1145/3292500.3330701") == (
+            "DOI:10.1145/3292500.3330701"
+        )
+        assert normalize_paper_id("corpusid:123") == "CorpusId:123"
+        assert normalize_paper_id("649def34f8be52c8b66281af98ae884c09aef38b") == (
+            "649def34f8be52c8b66281af98ae884c09aef38b"
+        )
+
+
+class TestCircuitBreaker:
+    """Tests for the S2 circuit breaker and degraded-mode serving"""
+
+    def test_opens_on_error_rate_and_recovers(self):
+        """The circuit should open on failures, probe when half-open and close on success."""
+        from paper2saas.tools.circuit_breaker import CircuitBreaker
+
+        breaker = CircuitBreaker(error_threshold=0.5, min_requests=4, open_duration=60)
+        breaker.record_success()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+        breaker.record_failure()
+        assert breaker.stats["opened"] == 1
+
+        assert breaker.state == "open"
+
+        # After the cooldown the circuit turns half-open and admits one probe
+        breaker._opened_at -= 60
+        assert breaker.state == "half_open"
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_open_circuit_rejects(self):
+        """An open circuit should reject requests until its cooldown ends."""
+        from paper2saas.tools.circuit_breaker import CircuitBreaker
+
+        breaker = CircuitBreaker(min_requests=1, open_duration=60)
+        breaker.record_failure()
+
+        assert breaker.allow() is False
+        assert breaker.snapshot()["state"] == "open"
+        assert breaker.snapshot()["rejected"] == 1
+        assert breaker.retry_after > 0
+
+    @pytest.mark.asyncio
+    async def test_client_fails_fast_when_open(self, mock_s2_config):
+        """Once open, requests should raise CircuitOpenError without network I/O."""
+        import httpx
+
+        from paper2saas.tools.circuit_breaker import CircuitOpenError
+        from paper2saas.tools.http_client import S2AsyncClient
+
+        mock_s2_config.circuit_min_requests = 1
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            raise httpx.ConnectError("down", request=request)
+
+        client = S2AsyncClient(config=mock_s2_config)
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        with pytest.raises(CircuitOpenError):
+            await client.get("paper/p1", fields="title")
+        with pytest.raises(CircuitOpenError):
+            await client.get("paper/p2", fields="title")
+
+        # The first failure opened the circuit, so its retries were rejected too
+        assert len(calls) == 1
+        assert client.get_stats()["circuit"]["state"] == "open"
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_when_open(self, mock_s2_config):
+        """With the circuit open, expired entries should be served even without SWR."""
+        import httpx
+
+        from paper2saas.tools.http_client import S2AsyncClient
+
+        mock_s2_config.stale_while_revalidate = False
+        mock_s2_config.cache_ttl = -1
+
+        def handler(request):
+            return httpx.Response(200, json={"paperId": "p1", "title": "T"})
+
+        client = S2AsyncClient(config=mock_s2_config)
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await client.get("paper/p1", fields="title")
+
+        client.breaker._open()
+        result = await client.get("paper/p1", fields="title")
+
+        assert result["title"] == "T"
+        assert client.get_stats()["degraded_hits"] == 1
+
+
+class TestRecordReplay:
+    """Tests for the recording transport and replay backends"""
+
+    @pytest.mark.asyncio
+    async def test_record_then_replay(self, mock_s2_config, tmp_path):
+        """Responses recorded once should be replayed offline for the same requests."""
+        import httpx
+
+        from paper2saas.tools.http_client import S2AsyncClient
+        from paper2saas.tools.s2_replay import RecordingTransport, ReplayBackend, ReplayTransport
+
+        def live(request):
+            return httpx.Response(200, json={"paperId": "p1", "title": "Recorded"})
+
+        recorder = RecordingTransport(str(tmp_path), transport=httpx.MockTransport(live))
+        client = S2AsyncClient(mock_s2_config, transport=recorder)
+        await client.get("paper/p1", fields="paperId,title")
+        await client.close()
+        assert recorder.recorded == 1
+
+        backend = ReplayBackend(str(tmp_path))
+        replay = S2AsyncClient(mock_s2_config, transport=ReplayTransport(backend))
+        result = await replay.get("paper/p1", fields="paperId,title")
+
+        assert result["title"] == "Recorded"
+        assert backend.stats["served"] == 1
+        await replay.close()
+
+    @pytest.mark.asyncio
+    async def test_replay_throttles_with_retry_after(self, tmp_path):
+        """The replay backend's token bucket should answer 429 with Retry-After."""
+        from paper2saas.tools.s2_replay import ReplayBackend
+
+        backend = ReplayBackend(str(tmp_path), rate_limit=1.0)
+
+        first, _, _ = await backend.handle("GET", "/graph/v1/paper/p1", [], b"")
+        second, headers, _ = await backend.handle("GET", "/graph/v1/paper/p1", [], b"")
+
+        assert first == 404  # No fixture recorded
+        assert second == 429
+        assert int(headers["retry-after"]) >= 1
+
+    @pytest.mark.asyncio
+    async def test_toolkit_on_replay_server(self, mock_s2_config, tmp_path):
+        """The toolkit should run against the replay app through an injected client."""
+        import json
+
+        import httpx
+
+        from paper2saas.tools.http_client import S2AsyncClient
+        from paper2saas.tools.s2_replay import ReplayBackend, create_replay_app, fixture_key
+        from paper2saas.tools.semantic_scholar import SemanticScholarTools
+
+        query = [("fields", "paperId,title"), ("limit", "5"), ("query", "transformers")]
+        fixture = {
+            "request": {
+                "method": "GET",
+                "path": "/graph/v1/paper/search",
+                "query": query,
+                "body": None,
+            },
+            "response": {"status_code": 200, "body": {"data": [{"paperId": "p1", "title": "T"}]}},
+        }
+        key = fixture_key("GET", "/graph/v1/paper/search", query, None)
+        (tmp_path / f"{key}.json").write_text(json.dumps(fixture))
+
+        mock_s2_config.base_url = "http://replay/graph/v1"
+        mock_s2_config.paper_fields = "paperId,title"
+        app = create_replay_app(ReplayBackend(str(tmp_path)))
+        client = S2AsyncClient(mock_s2_config, transport=httpx.ASGITransport(app=app))
+        tools = SemanticScholarTools(client=client)
+
+        papers = await tools.search_papers("transformers", limit=5)
+
+        assert [p["id"] for p in papers] == ["p1"]
+        await tools.close()
+        assert client._client is not None  # Caller-owned client is left open
+        await client.close()
+
+
+class TestBenchmarkHarness:
+    """Smoke test for the offline benchmark harness"""
+
+    @pytest.mark.asyncio
+    async def test_synthetic_run_reports_metrics(self):
+        """A tiny synthetic run should produce one result per scenario and concurrency."""
+        from benchmarks.bench_s2 import compare, parse_args, run
+
+        args = parse_args(
+            ["--papers", "200", "--operations", "4", "--concurrency", "1", "2", "--latency", "0"]
+        )
+        report = await run(args)
+
+        assert len(report["results"]) == 10
+        lineage = report["results"][0]
+        assert lineage["scenario"] == "build_research_lineage"
+        assert lineage["backend_requests"] > 0
+        assert {"latency_p50_ms", "latency_p95_ms", "latency_p99_ms"} <= lineage.keys()
+        assert compare(report["results"], report, tolerance=0.2) == []
+
+
+class TestPaperRecord:
+    """Tests for compact paper records"""
+
+    RAW = {
+        "paperId": "p1",
+        "title": "Attention",
+        "year": 2017,
+        "authors": [{"authorId": "a1", "name": "Ashish Vaswani"}],
+        "citationCount": 100,
+        "externalIds": {"ArXiv": "1706.03762", "DOI": "10.1/x"},
+    }
+
+    def test_to_dict_matches_tool_output(self):
+        """to_dict() should produce the normalized keys, plus edge metadata when present."""
+        from paper2saas.tools import PaperRecord
+
+        edge = {"isInfluential": True, "contexts": ["ctx"], "intents": ["methodology"]}
+        paper = PaperRecord(self.RAW, edge, score=3).to_dict()
+
+        assert paper["id"] == "p1"
+        assert paper["authors"] == ["Ashish Vaswani"]
+        assert paper["arxiv_id"] == "1706.03762"
+        assert paper["url"] == "https://www.semanticscholar.org/paper/p1"
+        assert paper["is_influential"] is True
+        assert paper["contexts"] == ["ctx"]
+        assert paper["score"] == 3
+        assert len(PaperRecord(self.RAW).to_dict()) == 16
+
+    def test_record_is_slotted_and_interns_authors(self):
+        """Records should carry no __dict__ and share author name strings."""
+        from paper2saas.tools import PaperRecord
+
+        record = PaperRecord(self.RAW)
+        assert not hasattr(record, "__dict__")
+
+        other = dict(self.RAW, authors=[{"name": "".join(["Ashish ", "Vaswani"])}])
+        assert record.authors[0] is PaperRecord(other).authors[0]
+
+    @pytest.mark.asyncio
+    async def test_lineage_views_materialize_only_returned_papers(
+        self, mock_s2_config, monkeypatch
+    ):
+        """Views should rank records and build dicts only for the papers they return."""
+        from paper2saas.tools import SemanticScholarTools
+        from paper2saas.tools.citation_snapshot import CitationSnapshot
+        from paper2saas.tools.paper_record import PaperRecord
+
+        edges = [
+            {"citingPaper": {"paperId": f"c{i}", "title": "a system", "year": 2000 + i}}
+            for i in range(20)
+        ]
+        tools = SemanticScholarTools(config=mock_s2_config)
+        calls = []
+        original = PaperRecord.to_dict
+
+        def counting(record):
+            calls.append(record.paper_id)
+            return original(record)
+
+        monkeypatch.setattr(PaperRecord, "to_dict", counting)
+        papers = tools._derivatives_from(CitationSnapshot("p", edges), limit=3)
+
+        assert [p["id"] for p in papers] == ["c19", "c18", "c17"]
+        assert calls == ["c19", "c18", "c17"]
+        await tools.close()
+
+
+class TestJsonDecoder:
+    """Tests for optional fast JSON decoding"""
+
+    def test_missing_decoder_falls_back_to_json(self, monkeypatch):
+        """A named decoder that is not installed should fall back to the standard library."""
+        import json
+        import sys
+
+        from paper2saas.tools.s2_json import get_decoder
+
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        assert get_decoder("orjson") == ("json", json.loads)
+        assert get_decoder("auto")[0] in ("msgspec", "json")
+        with pytest.raises(ValueError):
+            get_decoder("yaml")
+
+    @pytest.mark.asyncio
+    async def test_client_uses_configured_decoder(self, mock_s2_config):
+        """Responses should be decoded by the configured decoder."""
+        import httpx
+
+        from paper2saas.tools import S2AsyncClient
+
+        decoded = []
+
+        def decode(content):
+            decoded.append(content)
+            return {"paperId": "p1"}
+
+        client = S2AsyncClient(mock_s2_config)
+        client._decode = decode
+        client._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda r: httpx.Response(200, content=b"{}"))
+        )
+
+        assert await client.get("paper/p1") == {"paperId": "p1"}
+        assert decoded == [b"{}"]
+        assert client.get_stats()["json_decoder"] == client.json_decoder
+        await client.close()
+
+    def test_json_benchmark_runs(self):
+        """The decode micro-benchmark should time every installed decoder."""
+        from benchmarks.bench_json import run, synthetic_pages
+
+        pages = synthetic_pages(num_papers=300, pages=2, page_size=50)
+        results = run(pages, repeat=1)
+
+        assert len(pages) == 2
+        assert {r["decoder"] for r in results} >= {"json"}
+        assert all(r["edges"] == 100 for r in results)
+
+
+class TestLineageExpansion:
+    """Tests for multi-hop lineage expansion"""
+
+    @staticmethod
+    def _most_cited(backend):
+        return max(backend.papers, key=lambda p: backend.papers[p]["citationCount"])
+
+    @pytest.mark.asyncio
+    async def test_each_hop_is_one_batch_request(self, synthetic_s2):
+        """A depth-2 crawl should cost one paper/batch request per hop and prune to top_k."""
+        backend, tools = synthetic_s2(num_papers=300, seed=1)
+        seed = self._most_cited(backend)
+
+        lineage = await tools.expand_lineage([seed], depth=2, top_k=10)
+
+        assert backend.stats["requests"] == 3
+        assert lineage["stats"]["requests"] == 3
+        assert lineage["seeds"] == [seed]
+        depths = [n["depth"] for n in lineage["nodes"]]
+        assert depths.count(1) == 10 and depths.count(2) <= 10
+        ids = {n["id"] for n in lineage["nodes"]}
+        assert all(e["citing"] in ids and e["cited"] in ids for e in lineage["edges"])
+        assert any(e["cited"] == seed for e in lineage["edges"])
+        await tools.client.close()
+
+    @pytest.mark.asyncio
+    async def test_zero_top_k_expands_nothing(self, synthetic_s2):
+        """top_k=0 should be honoured rather than replaced by the config default."""
+        backend, tools = synthetic_s2(num_papers=300, seed=1)
+        seed = self._most_cited(backend)
+
+        lineage = await tools.expand_lineage([seed], depth=2, top_k=0)
+
+        assert [n["id"] for n in lineage["nodes"]] == [seed]
+        assert backend.stats["requests"] == 1
+        await tools.client.close()
+
+    @pytest.mark.asyncio
+    async def test_budget_and_reuse(self, synthetic_s2):
+        """The request budget should stop the crawl, and crawled papers are not refetched."""
+        backend, tools = synthetic_s2(num_papers=300, seed=1)
+        seed = self._most_cited(backend)
+
+        first = await tools.expand_lineage([seed], depth=2, budget=1, top_k=10)
+        assert first["stats"]["truncated"] is True
+        assert [n["id"] for n in first["nodes"]] == [seed]
+
+        await tools.expand_lineage([seed], depth=1, top_k=10)
+        # The seed came from the entity cache; only its neighbours were fetched
+        assert backend.stats["requests"] == 2
+        await tools.client.close()
+
+
+class TestBridgePapers:
+    """Tests for N-seed bridge detection"""
+
+    NEIGHBOURS = {
+        "s1": ["a", "b", "c", "x"],
+        "s2": ["a", "b", "y", "s1"],
+        "s3": ["a", "c", "s1"],
+    }
+    # External IDs the batch endpoint resolves to seed paperIds
+    ALIASES = {"ARXIV:2101.00001": "s1"}
+
+    def _handler(self, batches):
+        def handler(request):
+            path = request.url.path
+            if path.endswith("/paper/batch"):
+                ids = json.loads(request.content)["ids"]
+                batches.append(ids)
+                papers = [self.ALIASES.get(p, p) for p in ids]
+                return httpx.Response(
+                    200, json=[{"paperId": p, "title": p.upper()} for p in papers]
+                )
+            seed, relation = path.split("/")[-2:]
+            seed = self.ALIASES.get(seed, seed)
+            key = "citingPaper" if relation == "citations" else "citedPaper"
+            # Citations carry each seed's neighbours; references are empty
+            neighbours = self.NEIGHBOURS[seed] if relation == "citations" else []
+            data = [{key: {"paperId": p, "citationCount": ord(p[0])}} for p in neighbours]
+            return httpx.Response(200, json={"data": data})
+
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_ranks_by_domains_and_fetches_only_top_k(self, mock_s2_tools):
+        """Bridges in more seed neighbourhoods should rank first; only the top k are fetched."""
+        batches = []
+        tools = mock_s2_tools(self._handler(batches))
+
+        bridges = await tools.find_bridge_papers(["s1", "s2", "s3"], limit=2)
+
+        assert [p["id"] for p in bridges] == ["a", "c"]
+        assert bridges[0]["domains_connected"] == 3
+        assert bridges[1]["connected_seeds"] == ["s1", "s3"]
+        assert batches == [["a", "c"]]  # b (2 domains, lower citations) and seeds excluded
+
+    @pytest.mark.asyncio
+    async def test_external_seed_ids_are_excluded(self, mock_s2_tools):
+        """A seed given as an ARXIV: ID should be excluded by its resolved paperId."""
+        batches = []
+        tools = mock_s2_tools(self._handler(batches))
+
+        seeds = ["ARXIV:2101.00001", "s2", "s3"]
+        bridges = await tools.find_bridge_papers(seeds, limit=5)
+
+        # s1 is in two seed neighbourhoods but is itself a seed
+        assert [p["id"] for p in bridges] == ["a", "c", "b"]
+        assert bridges[0]["connected_seeds"] == seeds
+        assert batches[0] == ["ARXIV:2101.00001"]
+        assert sorted(batches[1]) == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_cross_domain_delegates_and_reuses_neighbourhoods(self, mock_s2_tools):
+        """find_cross_domain_papers should use the N-seed finder and the cached neighbourhoods."""
+        batches = []
+        tools = mock_s2_tools(self._handler(batches))
+
+        await tools.find_bridge_papers(["s1", "s2", "s3"], limit=2)
+        before = tools.client.get_stats()["network_requests"]
+        bridges = await tools.find_cross_domain_papers("s1", "s2")
+
+        assert sorted(p["id"] for p in bridges) == ["a", "b"]
+        # Only the new bridge b needed metadata; neighbourhoods came from cache
+        assert tools.client.get_stats()["network_requests"] == before + 1
+
+
+class TestAuthorBatch:
+    """Tests for bulk author resolution"""
+
+    @pytest.mark.asyncio
+    async def test_author_network_uses_one_batch_request(self, synthetic_s2):
+        """Authors behind a lineage should be resolved with a single author/batch request."""
+        backend, tools = synthetic_s2(num_papers=300, seed=2)
+        seed = max(backend.papers, key=lambda p: backend.papers[p]["citationCount"])
+
+        lineage = await tools.build_research_lineage(seed)
+        before = backend.stats["requests"]
+        network = await tools.analyze_author_network(seed, limit=10, paper_limit=3)
+
+        assert backend.stats["requests"] == before + 1
+        assert len(network["authors"]) == 10
+        top = network["authors"][0]
+        assert top["lineage_papers"] >= network["authors"][-1]["lineage_papers"]
+        assert len(top["top_papers"]) <= 3
+        assert network["authors_found"] >= 10
+        assert network["papers_scanned"] > len(lineage["derivatives"])
+
+        # Profiles are cached per author: a subset needs no request
+        ids = [a["id"] for a in network["authors"][:3]]
+        assert [a["id"] for a in await tools.get_authors(ids)] == ids
+        assert backend.stats["requests"] == before + 1
+        await tools.client.close()
+
+
+class TestBulkSearch:
+    """Tests for streaming bulk search"""
+
+    @pytest.mark.asyncio
+    async def test_streams_every_page_with_filters(self, synthetic_s2):
+        """Every filtered match should be streamed, one request per page."""
+        backend, tools = synthetic_s2(num_papers=2000, seed=3, bulk_page_size=100)
+
+        papers = [
+            p
+            async for p in tools.iter_bulk_search(
+                "transformer", year_range=(2005, 2020), open_access_only=True
+            )
+        ]
+
+        expected = [
+            p["paperId"]
+            for p in backend.papers.values()
+            if "transformer" in p["title"] and 2005 <= p["year"] <= 2020 and p["isOpenAccess"]
+        ]
+        assert [p["id"] for p in papers] == expected
+        assert backend.stats["requests"] == -(-len(expected) // 100)
+        await tools.client.close()
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_resumes_without_duplicates(self, synthetic_s2, tmp_path):
+        """An interrupted sweep should resume mid-page from its checkpoint."""
+        backend, tools = synthetic_s2(num_papers=2000, seed=3, bulk_page_size=100)
+        path = str(tmp_path / "sweep.json")
+
+        first = []
+        papers = tools.iter_bulk_search("retrieval", checkpoint_path=path)
+        async with aclosing(papers):
+            async for paper in papers:
+                first.append(paper["id"])
+                if len(first) == 150:
+                    break
+
+        params = {"query": "retrieval", "fields": tools.config.bulk_search_fields}
+        checkpoint = BulkSearchCheckpoint.load(path, params)
+        assert (checkpoint.token, checkpoint.skip, checkpoint.yielded) == ("t100", 50, 150)
+
+        rest = [p["id"] async for p in tools.iter_bulk_search("retrieval", checkpoint_path=path)]
+        everything = [p["id"] async for p in tools.iter_bulk_search("retrieval")]
+
+        assert first + rest == everything
+        # A finished sweep starts over
+        again = [p["id"] async for p in tools.iter_bulk_search("retrieval", checkpoint_path=path)]
+        assert again == everything
+        await tools.client.close()
+
+    @pytest.mark.asyncio
+    async def test_workflow_sweep_keeps_top_cited(self, synthetic_s2):
+        """SaaSToImprovementWorkflow.sweep should return the most cited matches."""
+        from paper2saas.workflows import SaaSToImprovementWorkflow
+
+        backend, tools = synthetic_s2(num_papers=2000, seed=3, bulk_page_size=100)
+        workflow = SaaSToImprovementWorkflow()
+        await workflow.s2_tools.close()
+        workflow.s2_tools = tools
+
+        top = await workflow.sweep("diffusion", top_k=5)
+
+        counts = sorted(
+            (p["citationCount"] for p in backend.papers.values() if "diffusion" in p["title"]),
+            reverse=True,
+        )
+        assert [p["citation_count"] for p in top] == counts[:5]
+        await tools.client.close()
+
+    @pytest.mark.asyncio
+    async def test_resumed_sweep_keeps_earlier_ranking(self, synthetic_s2, tmp_path):
+        """A resumed sweep should rank papers seen before the interruption too."""
+        from paper2saas.workflows import SaaSToImprovementWorkflow
+
+        backend, tools = synthetic_s2(num_papers=2000, seed=3, bulk_page_size=100)
+        workflow = SaaSToImprovementWorkflow()
+        await workflow.s2_tools.close()
+        workflow.s2_tools = tools
+        path = str(tmp_path / "sweep.json")
+
+        full = await workflow.sweep("diffusion", top_k=5)
+        await workflow.sweep("diffusion", top_k=5, max_results=150, checkpoint_path=path)
+        resumed = await workflow.sweep("diffusion", top_k=5, checkpoint_path=path)
+
+        assert [p["id"] for p in resumed] == [p["id"] for p in full]
+        await tools.client.close()